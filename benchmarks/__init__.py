@@ -0,0 +1,3 @@
+"""
+Package benchmarks containing performance measurements of the simulator.
+"""
@@ -0,0 +1,13 @@
+"""
+Entry point of the benchmark suite.
+
+Usage:
+    python -m benchmarks run --out results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.1
+"""
+
+import sys
+
+from benchmarks.suite import main
+
+sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark comparing Game.do_actions with calling Game.do_action in a loop.
+
+Every round lets 30 minutes of game time pass, then sends a batch of
+actions spread over the creatures of the game.
+
+Usage:
+    python -m benchmarks.bench_actions --creatures 1000 --batch 10000 --rounds 5
+"""
+
+import argparse
+import time
+
+from game.game_manager import Game
+from utils.clock import ManualClock
+from utils.rng import RngStream
+
+# Actions of the batches (without the interactive mini-games)
+ACTIONS = [
+    {"action": "feed", "food": "premium"},
+    {"action": "play", "duration": 1},
+    {"action": "sleep", "duration": 1},
+    {"action": "heal"},
+    {"action": "explore"},
+    {"action": "meet"},
+    {"action": "shop"},
+]
+
+
+def _game(creatures, seed):
+    """
+    Creates a game hosting several creatures.
+
+    Args:
+        creatures (int): Number of creatures
+        seed (int): Root seed
+
+    Returns:
+        Game: The game
+    """
+    game = Game(seed, ManualClock())
+    for i in range(creatures):
+        game.create_creature(f"Pixel-{i}", "dragon")
+    return game
+
+
+def _batch(game, size, seed):
+    """
+    Builds a batch of actions on random creatures of a game.
+
+    Args:
+        game (Game): The game
+        size (int): Number of actions
+        seed (int): Seed of the batch
+
+    Returns:
+        list: Actions with their creature_id
+    """
+    rng = RngStream(seed, "batch")
+    ids = [record.creature_id for record in game.registry]
+    return [dict(rng.choice(ACTIONS), creature_id=rng.choice(ids)) for _ in range(size)]
+
+
+def main():
+    """
+    Runs both strategies on identical games and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def loop(game, batch):
+        for item in batch:
+            params = dict(item)
+            game.do_action(params.pop("action"), **params)
+
+    results = {}
+    for label, run in (("do_action loop", loop), ("do_actions(batch)", Game.do_actions)):
+        game = _game(args.creatures, args.seed)
+        batch = _batch(game, args.batch, args.seed)
+        best = float("inf")
+        for _ in range(args.rounds):
+            game.clock.advance(1800)
+            start = time.perf_counter()
+            run(game, batch)
+            best = min(best, time.perf_counter() - start)
+        results[label] = best
+        print(f"{label:<18}: {args.batch / best:>10,.0f} actions/s, {len(game.registry)} creatures alive")
+
+    print(f"Speed-up: {results['do_action loop'] / results['do_actions(batch)']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
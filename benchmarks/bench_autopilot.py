@@ -0,0 +1,121 @@
+"""
+Benchmark of the autopilot: cost of its decisions and care it gives.
+
+Times the computation of a value table (once per creature type) and a
+decision, then lets a population of creatures live for some game days in
+one game, with one action per creature and per game hour chosen by:
+nothing (wait), a hand-written rule (feed when hungry, heal when sick,
+sleep when tired, play when sad) or the autopilot. The care is compared
+on the survival and on the mean happiness and health of the living
+creatures, the cost on the actions per second of the whole loop.
+
+Usage:
+    python -m benchmarks.bench_autopilot --creatures 500 --days 14
+"""
+
+import argparse
+import time
+
+from game.autopilot import get_value_table
+from game.game_manager import Game
+from models.rules import CREATURE_TYPES
+from utils.clock import ManualClock
+
+
+def _wait(creature):
+    """Chooses no care at all."""
+    return {"action": "wait"}
+
+
+def _rule(creature):
+    """Chooses the care a careful owner would give, one rule after the other."""
+    if creature.is_sick:
+        return {"action": "heal"}
+    if creature.hunger < 30:
+        return {"action": "feed", "food": "standard"}
+    if creature.energy < 20:
+        return {"action": "sleep", "duration": 8}
+    if creature.happiness < 40:
+        return {"action": "play", "duration": 1}
+    return {"action": "wait"}
+
+
+def _autopilot(creature):
+    """Lets the autopilot choose."""
+    return {"action": "autopilot"}
+
+
+def _live(choose, creatures, days, seed):
+    """
+    Lets a population live for some days, one chosen action per creature and per game hour.
+
+    Args:
+        choose (callable): Returns the action (dict for Game.do_actions) of a creature
+        creatures (int): Number of creatures
+        days (int): Number of game days
+        seed (int): Root seed
+
+    Returns:
+        dict: Survivors, mean happiness and health of the living creatures, actions per second
+    """
+    game = Game(seed, ManualClock())
+    for index in range(creatures):
+        game.create_creature(f"Pixel-{index}", CREATURE_TYPES[index % len(CREATURE_TYPES)])
+    happiness = health = samples = actions = 0
+    elapsed = 0.0
+    for _ in range(days * 24):
+        game.clock.advance_hours(1)
+        batch = [dict(choose(record.creature), creature_id=record.creature_id) for record in game.registry]
+        start = time.perf_counter()
+        game.do_actions(batch)
+        elapsed += time.perf_counter() - start
+        actions += len(batch)
+        for record in game.registry:
+            happiness += min(100, record.creature.happiness)
+            health += record.creature.health
+            samples += 1
+    return {
+        "survivors": len(game.registry) / creatures,
+        "happiness": happiness / samples if samples else 0.0,
+        "health": health / samples if samples else 0.0,
+        "actions_per_second": actions / elapsed
+    }
+
+
+def main():
+    """
+    Times the autopilot, compares the care of every policy and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=500)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--decisions", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for creature_type in CREATURE_TYPES:
+        start = time.perf_counter()
+        table = get_value_table(creature_type)
+        print(f"value table {creature_type:<8}: {time.perf_counter() - start:6.2f} s "
+              f"({table.values.size:,} states, {table.sweeps} sweeps)")
+
+    game = Game(args.seed, ManualClock())
+    game.create_creature("Pixel", "dragon")
+    creature = game.creature
+    creature.inventory = ["Friandise", "Jouet"]
+    table = get_value_table(creature.creature_type)
+    start = time.perf_counter()
+    for _ in range(args.decisions):
+        table.decide(creature)
+    print(f"decision: {(time.perf_counter() - start) / args.decisions * 1e6:.2f} us")
+
+    print(f"{args.creatures} creatures, {args.days} game days, one action per creature and per game hour")
+    print(f"{'care':<10} {'survivors':>10} {'happiness':>10} {'health':>8} {'actions/s':>12}")
+    for label, choose in (("none", _wait), ("rule", _rule), ("autopilot", _autopilot)):
+        result = _live(choose, args.creatures, args.days, args.seed)
+        print(f"{label:<10} {result['survivors']:>10.1%} {result['happiness']:>10.1f} {result['health']:>8.1f} "
+              f"{result['actions_per_second']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark comparing Creature.catch_up with pass_time chopped into hourly steps.
+
+Usage:
+    python -m benchmarks.bench_catch_up --creatures 2000 --hours 48
+"""
+
+import argparse
+import time
+
+from game.game_manager import Game
+from models.creature import Creature
+from models.result import Status
+
+
+def _hourly(creature, hours):
+    """
+    Advances a creature hour by hour with pass_time.
+
+    Args:
+        creature (Creature): The creature to advance
+        hours (int): Number of hours
+    """
+    for _ in range(hours):
+        if creature.pass_time(1).status == Status.DEATH:
+            return
+
+
+def main():
+    """
+    Runs both strategies on the same creatures and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=2000)
+    parser.add_argument("--hours", type=int, default=48, help="length of the absence (keep below 720 to avoid evolutions)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    for label, advance in (("pass_time(1) x hours", _hourly),
+                           ("catch_up(hours)", lambda creature, hours: creature.catch_up(hours))):
+        game = Game(args.seed)
+        creatures = [Creature(f"Lapin-{i}", "lapin", creature_id=i, rng=game.creature_stream(i))
+                     for i in range(1, args.creatures + 1)]
+
+        start = time.perf_counter()
+        for creature in creatures:
+            advance(creature, args.hours)
+        elapsed = time.perf_counter() - start
+
+        deaths = sum(1 for creature in creatures if creature.health <= 0)
+        results[label] = elapsed
+        print(f"{label:<22}: {args.creatures / elapsed:>10,.0f} creatures/s, {deaths / args.creatures:.1%} dead")
+
+    print(f"Speed-up: {results['pass_time(1) x hours'] / results['catch_up(hours)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
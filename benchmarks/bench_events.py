@@ -0,0 +1,117 @@
+"""
+Benchmark of the event bus: cost of publishing and of the terminal screens in batch runs.
+
+The same batch simulation (creatures living their whole life, hour by
+hour, with Game.simulate) runs without any subscriber, as headless and
+server runs do, with a subscriber counting the events, and with the
+terminal UI subscribed (its output going to a buffer and its pauses
+answered at once), which is what every run paid before the bus.
+
+Usage:
+    python -m benchmarks.bench_events --creatures 200 --days 20
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import time
+from collections import Counter
+
+from game.game_manager import Game
+from ui.display import subscribe_terminal
+from utils.clock import FixedStepClock
+from utils.event_bus import EVENTS, EVOLVED, EventBus, bus
+
+
+def _simulate(creatures, days, seed):
+    """
+    Lets several creatures live, hour by hour, feeding them every 4 hours.
+
+    Args:
+        creatures (int): Number of creatures
+        days (int): Game days per creature
+        seed (int): Root seed
+
+    Returns:
+        float: Wall time in seconds
+    """
+    start = time.perf_counter()
+    for i in range(creatures):
+        game = Game((seed, i), FixedStepClock())
+        game.create_creature(f"Pixel-{i}", "lapin")
+        for _ in range(days * 6):
+            if not game.creature:
+                break
+            game.simulate(4)
+            if game.creature:
+                game.do_action("feed", food="premium")
+    return time.perf_counter() - start
+
+
+def _publish_cost(count):
+    """
+    Measures the cost of a publication without and with a subscriber.
+
+    Args:
+        count (int): Number of publications
+
+    Returns:
+        tuple: Nanoseconds per publication without and with a subscriber
+    """
+    local_bus = EventBus()
+    costs = []
+    for subscribed in (False, True):
+        if subscribed:
+            local_bus.subscribe(EVOLVED, lambda **payload: None)
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            local_bus.publish(EVOLVED, creature=None, stage="jeune", message="")
+        costs.append((time.perf_counter_ns() - start) / count)
+    return costs
+
+
+def main():
+    """
+    Runs the simulation with every kind of subscriber and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=200)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    none, subscribed = _publish_cost(1_000_000)
+    print(f"publish: {none:.0f} ns without subscriber, {subscribed:.0f} ns with one subscriber")
+
+    counts = Counter()
+
+    def count(event):
+        def subscriber(**payload):
+            counts[event] += 1
+        return subscriber
+
+    results = {}
+    original_input = builtins.input
+    try:
+        builtins.input = lambda prompt="": ""
+        for label in ("no subscriber", "counting", "terminal UI"):
+            bus.clear()
+            if label == "counting":
+                for event in EVENTS:
+                    bus.subscribe(event, count(event))
+            elif label == "terminal UI":
+                subscribe_terminal(bus)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[label] = _simulate(args.creatures, args.days, args.seed)
+            print(f"{label:<14}: {results[label]:.3f} s")
+    finally:
+        builtins.input = original_input
+        bus.clear()
+
+    print(f"events: {dict(counts)}")
+    print(f"Terminal UI overhead: {(results['terminal UI'] / results['no subscriber'] - 1) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of the Monte Carlo survival forecaster.
+
+Times game.forecast.forecast on one creature, without care and with a
+care policy, in the current process and across worker processes. The
+rollouts are cut into the same chunks whatever the number of workers, so
+every run must give exactly the same forecast: the benchmark checks it.
+
+Usage:
+    python -m benchmarks.bench_forecast --rollouts 100000 --hours 24 --workers 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from game.forecast import CarePolicy, forecast
+from models.creature import Creature
+from utils.rng import RngStream
+
+
+def _time_forecast(creature, args, policy, workers):
+    """
+    Runs one forecast and times it.
+
+    Args:
+        creature (Creature): The creature
+        args (Namespace): Options of the benchmark
+        policy (CarePolicy): Care given during the forecast
+        workers (int): Number of worker processes
+
+    Returns:
+        tuple: The ForecastResult and the elapsed seconds
+    """
+    start = time.perf_counter()
+    result = forecast(creature, args.hours, args.rollouts, policy, workers=workers, chunk_size=args.chunk_size)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """
+    Times the forecasts and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rollouts", type=int, default=100_000)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=25_000)
+    parser.add_argument("--type", default="lapin")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    creature = Creature("Pixel", args.type, rng=RngStream(args.seed, "creature", 1))
+    policies = {"no care": None, "feed=30:premium,heal": CarePolicy.parse("feed=30:premium,heal")}
+
+    print(f"{args.rollouts:,} rollouts of a {args.type} over {args.hours:g} hours, chunks of {args.chunk_size:,}")
+    for label, policy in policies.items():
+        results = {}
+        for workers in (0, args.workers):
+            result, elapsed = _time_forecast(creature, args, policy, workers)
+            results[workers] = result
+            print(f"{label:<22} workers={workers:<3}: {elapsed:7.3f} s  ({args.rollouts / elapsed:>12,.0f} rollouts/s)")
+        serial, parallel = results[0], results[args.workers]
+        assert np.array_equal(serial.deaths, parallel.deaths) and np.array_equal(serial.sums, parallel.sums)
+        summary = serial.summary()
+        death, low, high = summary["death"]
+        print(f"{'':<22} death {death:.2%} [{low:.2%}, {high:.2%}], health {summary['health'][0]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
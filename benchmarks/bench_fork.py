@@ -0,0 +1,122 @@
+"""
+Benchmark of copy-on-write snapshots and forks against copy.deepcopy.
+
+A what-if preview ("what happens if I sleep 8 hours now?") runs an action
+on a copy of the creature. The copies are made with copy.deepcopy, which
+copies the friends and inventory lists and the random streams, and with
+Creature.fork / Creature.snapshot, which share everything immutable and
+the lists until they are written to. The same comparison is made for
+whole branches of a game: a deep copy of the creature put in a new game
+around it, or Game.fork, each followed by the previewed action.
+
+Usage:
+    python -m benchmarks.bench_fork --friends 50 --items 20 --branches 20000
+"""
+
+import argparse
+import copy
+import time
+
+from game.game_manager import Game
+from utils.clock import ManualClock
+
+
+def _rate(function, count):
+    """
+    Calls a function repeatedly and returns the number of calls per second.
+
+    Args:
+        function (callable): Function to call
+        count (int): Number of calls
+
+    Returns:
+        float: Calls per second
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return count / (time.perf_counter() - start)
+
+
+def _game(seed, friends, items):
+    """
+    Creates a game with one creature that has friends and items.
+
+    Args:
+        seed (int): Root seed
+        friends (int): Number of friends of the creature
+        items (int): Number of items in its inventory
+
+    Returns:
+        Game: The game, half a game day after the creation of the creature
+    """
+    game = Game(seed, ManualClock())
+    game.create_creature("Pixel", "dragon")
+    game.creature.friends = [f"Ami-{i}" for i in range(friends)]
+    game.creature.inventory = ["Friandise"] * items
+    game.clock.advance_hours(12)
+    game.do_action("feed", food="premium")
+    return game
+
+
+def _deepcopy_branch(game):
+    """
+    Builds a branch of a game from a deep copy of its creature, as previews did before Game.fork.
+
+    Args:
+        game (Game): The game to branch
+
+    Returns:
+        Game: The branch
+    """
+    branch = Game(game.seed, ManualClock(game.clock()), calendar=game.calendar)
+    branch.add_creature(copy.deepcopy(game.creature))
+    branch.last_action = game.last_action
+    branch.current_weather = game.current_weather
+    branch.last_weather_update = game.last_weather_update
+    return branch
+
+
+def main():
+    """
+    Times every way of copying a creature and of previewing an action, and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--friends", type=int, default=50)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--branches", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = _game(args.seed, args.friends, args.items)
+    creature = game.creature
+    snapshot = creature.snapshot()
+    count = args.branches
+
+    rates = {
+        "deepcopy(creature)": _rate(lambda: copy.deepcopy(creature), count),
+        "creature.fork()": _rate(creature.fork, count),
+        "creature.snapshot()": _rate(creature.snapshot, count),
+        "creature.restore()": _rate(lambda: creature.restore(snapshot), count),
+    }
+    print(f"creature with {args.friends} friends and {args.items} items")
+    for label, rate in rates.items():
+        print(f"{label:<24}: {rate:>12,.0f} copies/s")
+    print(f"fork speed-up: {rates['creature.fork()'] / rates['deepcopy(creature)']:.1f}x")
+
+    # Both kinds of branches must preview the same future
+    previews = [branch(game).do_action("sleep", duration=8) for branch in (_deepcopy_branch, Game.fork)]
+    assert previews[0].message == previews[1].message and previews[0].deltas == previews[1].deltas
+    print(f"preview of sleep(8): {previews[1].deltas}")
+
+    branch_rates = {
+        "deepcopy branch + sleep": _rate(lambda: _deepcopy_branch(game).do_action("sleep", duration=8), count),
+        "Game.fork() + sleep": _rate(lambda: game.fork().do_action("sleep", duration=8), count),
+    }
+    for label, rate in branch_rates.items():
+        print(f"{label:<24}: {rate:>12,.0f} branches/s")
+    print(f"branch speed-up: {branch_rates['Game.fork() + sleep'] / branch_rates['deepcopy branch + sleep']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark comparing the vectorized population engine with the scalar Creature loop.
+
+Usage:
+    python -m benchmarks.bench_population --size 100000 --ticks 5
+"""
+
+import argparse
+import time
+
+from game.game_manager import Game
+from models.creature import Creature
+from models.population import CreaturePopulation
+
+
+def bench_scalar(size, ticks, seed):
+    """
+    Ticks a list of Creature objects one by one.
+
+    Args:
+        size (int): Number of creatures
+        ticks (int): Number of one-hour ticks
+        seed (int): Root seed of the creatures' random streams
+
+    Returns:
+        float: Creatures ticked per second
+    """
+    game = Game(seed)
+    creatures = [Creature(f"Chaton-{i}", "chaton", creature_id=i, rng=game.creature_stream(i))
+                 for i in range(1, size + 1)]
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for creature in creatures:
+            if creature.health > 0:
+                creature.pass_time(1)
+    elapsed = time.perf_counter() - start
+
+    return size * ticks / elapsed
+
+
+def bench_population(size, ticks, seed):
+    """
+    Ticks the same number of creatures with CreaturePopulation.
+
+    Args:
+        size (int): Number of creatures
+        ticks (int): Number of one-hour ticks
+        seed (int): Root seed of the creatures' random streams
+
+    Returns:
+        float: Creatures ticked per second
+    """
+    population = CreaturePopulation.spawn(size, "chaton", seed=seed)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        population.pass_time(1)
+    elapsed = time.perf_counter() - start
+
+    return size * ticks / elapsed
+
+
+def main():
+    """
+    Runs both benchmarks and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000, help="number of creatures")
+    parser.add_argument("--ticks", type=int, default=5, help="number of one-hour ticks (keep below 720 to avoid evolutions)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scalar = bench_scalar(args.size, args.ticks, args.seed)
+    vectorized = bench_population(args.size, args.ticks, args.seed)
+
+    print(f"Creature.pass_time loop      : {scalar:>14,.0f} creatures/s")
+    print(f"CreaturePopulation.pass_time : {vectorized:>14,.0f} creatures/s")
+    print(f"Speed-up                     : {vectorized / scalar:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
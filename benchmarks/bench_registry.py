@@ -0,0 +1,98 @@
+"""
+Benchmark of a game hosting a very large number of creatures.
+
+Measures the memory used per resident creature, then the throughput of
+the registry lookups and of do_action targeting random creature ids.
+
+Usage:
+    python -m benchmarks.bench_registry --creatures 1000000 --owners 250000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from game.game_manager import Game
+from utils.clock import ManualClock
+from utils.rng import RngStream
+
+# Creatures used to measure the memory budget precisely (tracemalloc is slow)
+SAMPLE = 10000
+
+
+def _populate(game, count, owners, first=0):
+    """
+    Creates creatures spread over owners and types.
+
+    Args:
+        game (Game): Game receiving the creatures
+        count (int): Number of creatures
+        owners (int): Number of distinct owners
+        first (int): Index of the first creature, used to name it
+    """
+    types = game.available_types
+    for i in range(first, first + count):
+        game.create_creature(f"Pixel-{i}", types[i % len(types)], owner=f"joueur-{i % owners}")
+
+
+def _rate(function, repeat):
+    """
+    Calls a function repeatedly and returns its throughput.
+
+    Args:
+        function (callable): Function without arguments to call
+        repeat (int): Number of calls
+
+    Returns:
+        float: Calls per second
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return repeat / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=1000000)
+    parser.add_argument("--owners", type=int, default=250000)
+    parser.add_argument("--repeat", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Memory budget, measured on a sample of creatures
+    game = Game(args.seed, ManualClock())
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    _populate(game, SAMPLE, args.owners)
+    per_creature = (tracemalloc.get_traced_memory()[0] - before) / SAMPLE
+    tracemalloc.stop()
+    print(f"Memory per creature: {per_creature:,.0f} bytes "
+          f"({per_creature * args.creatures / 2 ** 20:,.0f} MiB for {args.creatures:,} creatures)")
+
+    start = time.perf_counter()
+    _populate(game, args.creatures - SAMPLE, args.owners, first=SAMPLE)
+    elapsed = time.perf_counter() - start
+    print(f"Creation: {(args.creatures - SAMPLE) / elapsed:,.0f} creatures/s, {len(game.registry):,} resident")
+
+    rng = RngStream(args.seed, "bench")
+    ids = [rng.randint(1, args.creatures) for _ in range(args.repeat)]
+    owners = [f"joueur-{i % args.owners}" for i in ids]
+    names = [f"Pixel-{i - 1}" for i in ids]
+    registry = game.registry
+
+    results = {
+        "registry.get": _rate(lambda it=iter(ids): registry.get(next(it)), args.repeat),
+        "registry.by_owner": _rate(lambda it=iter(owners): registry.by_owner(next(it)), args.repeat),
+        "registry.by_name": _rate(lambda it=iter(names): registry.by_name(next(it)), args.repeat),
+        "do_action(feed, id)": _rate(lambda it=iter(ids): game.do_action("feed", creature_id=next(it)), args.repeat),
+    }
+    for name, rate in results.items():
+        print(f"{name:<22}: {rate:>12,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of the call sites that read the balance tables.
+
+Usage:
+    python -m benchmarks.bench_rules --repeat 50000
+"""
+
+import argparse
+import time
+
+from game.game_manager import Game
+from models.creature import Creature
+
+
+def _rate(function, repeat, rounds=5):
+    """
+    Calls a function repeatedly and returns its best throughput over several rounds.
+
+    Args:
+        function (callable): Function without arguments to call
+        repeat (int): Number of calls per round
+        rounds (int): Number of rounds
+
+    Returns:
+        float: Calls per second
+    """
+    best = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = max(best, repeat / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    """
+    Runs the micro-benchmarks and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50000)
+    args = parser.parse_args()
+
+    creature = Creature("Robot", "robot", "argent", "intelligent")
+    creature.inventory = ["Livre magique"]  # permanent item, never consumed
+
+    game = Game()
+    game.create_creature("Chiot", "chiot")
+    game.creature.game_points = float("inf")
+
+    def buy():
+        game.do_action("shop", buy="Friandise")
+        game.creature.inventory.clear()
+
+    results = {
+        "Creature.__init__": _rate(lambda: Creature("Dragon", "dragon", "rouge", "sportif"), args.repeat),
+        "Creature.use_object": _rate(lambda: creature.use_object("Livre magique"), args.repeat),
+        "Creature.feed": _rate(lambda: creature.feed("premium"), args.repeat),
+        "Game.do_action(shop)": _rate(buy, args.repeat),
+    }
+
+    for name, rate in results.items():
+        print(f"{name:<22}: {rate:>12,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the incremental saves of a large population of creatures.
+
+Saves a population of creatures with Creature.save_many (one atomic file
+per creature in a directory), then changes a fraction of the creatures
+between rounds and saves the whole population again: only the changed
+creatures are written. Reports the creatures saved per second of the
+first save (every creature written) and of the incremental rounds, and
+checks that the files read back match the creatures.
+
+Usage:
+    python -m benchmarks.bench_save --creatures 100000 --dirty 0.01 --rounds 5 [--extension .bin]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from models.creature import Creature
+from models.rules import CREATURE_TYPES
+from utils.rng import RngStream
+
+
+def main():
+    """
+    Times the saves and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=100_000)
+    parser.add_argument("--dirty", type=float, default=0.01, help="fraction of the creatures changed between rounds")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--extension", default=".json", help="extension of the files: .json or .bin (binary format)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    creatures = [Creature(f"Pixel-{index}", CREATURE_TYPES[index % len(CREATURE_TYPES)], creature_id=index,
+                          rng=RngStream(args.seed, "creature", index))
+                 for index in range(args.creatures)]
+    rng = RngStream(args.seed, "benchmark")
+    directory = tempfile.mkdtemp(prefix="saves-")
+    try:
+        start = time.perf_counter()
+        written = Creature.save_many(creatures, directory, args.extension)
+        elapsed = time.perf_counter() - start
+        print(f"first save: {written:,} files in {elapsed:.2f} s ({written / elapsed:,.0f} saves/s)")
+
+        changed = max(1, int(args.creatures * args.dirty))
+        order = list(creatures)
+        for round_index in range(args.rounds):
+            rng.shuffle(order)
+            for creature in order[:changed]:
+                creature.pass_time(1)
+            start = time.perf_counter()
+            written = Creature.save_many(creatures, directory, args.extension)
+            elapsed = time.perf_counter() - start
+            print(f"round {round_index + 1}: {changed:,} changed, {written:,} files written in {elapsed:.3f} s "
+                  f"({args.creatures / elapsed:,.0f} creatures saved/s, {written / elapsed:,.0f} files/s)")
+
+        start = time.perf_counter()
+        written = Creature.save_many(creatures, directory, args.extension)
+        elapsed = time.perf_counter() - start
+        print(f"unchanged population: {written} files written in {elapsed:.3f} s "
+              f"({args.creatures / elapsed:,.0f} creatures saved/s)")
+
+        sample = creatures[::max(1, args.creatures // 1000)]
+        matches = all(Creature.load(os.path.join(directory, f"{creature.creature_id}{args.extension}")).to_dict()
+                      == creature.to_dict() for creature in sample)
+        print(f"files read back identical to the creatures: {matches}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark comparing the threshold scheduler with polling every creature.
+
+Polling brings every creature up to date and checks its state every game
+hour; the scheduler only wakes the creatures whose predicted crossing is
+due.
+
+Usage:
+    python -m benchmarks.bench_scheduler --creatures 20000 --hours 72
+"""
+
+import argparse
+import time
+
+from game.game_manager import Game
+from game.scheduler import ThresholdScheduler
+from models.result import Status
+from utils.clock import ManualClock
+
+
+def _game(creatures, seed):
+    """
+    Creates a game hosting several newborn creatures.
+
+    Args:
+        creatures (int): Number of creatures
+        seed (int): Root seed
+
+    Returns:
+        Game: The game
+    """
+    game = Game(seed, ManualClock())
+    for i in range(creatures):
+        game.create_creature(f"Pixel-{i}", "lapin")
+    return game
+
+
+def _poll(game, hours):
+    """
+    Advances the game hour by hour, checking every creature each hour.
+
+    Args:
+        game (Game): The game
+        hours (int): Number of game hours
+
+    Returns:
+        int: Number of deaths and of creatures becoming critical
+    """
+    found = 0
+    critical = set()
+    for _ in range(hours):
+        game.clock.advance_hours(1)
+        ids = [record.creature_id for record in game.registry]
+        for result in game.do_actions([{"action": "wait", "creature_id": creature_id} for creature_id in ids]):
+            creature_id = result["creature_id"]
+            if result["status"] == Status.DEATH:
+                found += 1
+            elif game.registry.get(creature_id).creature._check_critical_state():
+                found += creature_id not in critical
+                critical.add(creature_id)
+            else:
+                critical.discard(creature_id)
+    return found
+
+
+def _schedule(game, hours):
+    """
+    Advances the game hour by hour, only waking the creatures that are due.
+
+    Args:
+        game (Game): The game
+        hours (int): Number of game hours
+
+    Returns:
+        int: Number of notifications
+    """
+    scheduler = ThresholdScheduler(game)
+    found = 0
+    for _ in range(hours):
+        game.clock.advance_hours(1)
+        found += len(scheduler.run_until())
+    return found
+
+
+def main():
+    """
+    Runs both strategies and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=20000)
+    parser.add_argument("--hours", type=int, default=72)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    for label, run in (("polling", _poll), ("scheduler", _schedule)):
+        game = _game(args.creatures, args.seed)
+        start = time.perf_counter()
+        found = run(game, args.hours)
+        results[label] = time.perf_counter() - start
+        print(f"{label:<10}: {results[label]:>8.3f} s, {found} notifications, "
+              f"{len(game.registry)} creatures alive")
+
+    print(f"Speed-up: {results['polling'] / results['scheduler']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Load test of the JSON action server with thousands of concurrent connections.
+
+The server runs in a child process on the loopback interface. Every
+client opens its own connection, creates a creature, then sends random
+actions and state requests for the duration of the test, waiting for
+each response (and an optional think time) before the next request. The
+sustained throughput and the latency percentiles of the responses are
+printed.
+
+Usage:
+    python -m benchmarks.bench_server --connections 2000 --duration 10 --think 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+
+from game.game_manager import Game
+from game.metrics import Histogram
+from game.server import GameServer, serve
+from utils.clock import ScaledClock
+from utils.rng import RngStream
+
+# Requests sent once the creature exists
+REQUESTS = [
+    {"op": "action", "action": "feed", "params": {"food": "premium"}},
+    {"op": "action", "action": "play", "params": {"duration": 1}},
+    {"op": "action", "action": "heal"},
+    {"op": "action", "action": "explore"},
+    {"op": "action", "action": "meet"},
+    {"op": "action", "action": "wait"},
+    {"op": "state"},
+    {"op": "shop"},
+]
+
+
+def _run_server(connection, seed):
+    """
+    Runs a server in the child process and sends its address to the parent.
+
+    Args:
+        connection: End of the pipe connected to the parent
+        seed (int): Root seed of the game
+    """
+    server = GameServer(Game(seed, ScaledClock()))
+    try:
+        asyncio.run(serve(server, port=0, ready=connection.send))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _client(index, address, deadline, think, seed, histogram, counts):
+    """
+    Plays with one creature until the deadline.
+
+    Args:
+        index (int): Number of the client
+        address (tuple): Host and port of the server
+        deadline (float): perf_counter value at which the client stops
+        think (float): Seconds waited between a response and the next request
+        seed (int): Seed of the requests
+        histogram (Histogram): Latencies in nanoseconds
+        counts (dict): Number of responses and errors
+    """
+    rng = RngStream(seed, "client", index)
+    reader, writer = await asyncio.open_connection(*address)
+    request = {"op": "create", "name": f"Pixel-{index}", "type": "lapin"}
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            response = json.loads(await reader.readline())
+            histogram.record(time.perf_counter_ns() - start)
+            counts["responses"] += 1
+            if not response["ok"]:
+                counts["errors"] += 1
+            if response.get("status") == "death" or not response["ok"]:
+                request = {"op": "create", "name": f"Pixel-{index}", "type": "lapin"}
+            else:
+                request = rng.choice(REQUESTS)
+            if think:
+                await asyncio.sleep(think * 2 * rng.random())
+    finally:
+        writer.close()
+
+
+async def _load(address, connections, duration, think, seed):
+    """
+    Runs every client at once.
+
+    Returns:
+        tuple: Latency histogram, counts and measured wall time
+    """
+    histogram = Histogram()
+    counts = {"responses": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(i, address, start + duration, think, seed, histogram, counts)
+                           for i in range(connections)))
+    return histogram, counts, time.perf_counter() - start
+
+
+def main():
+    """
+    Starts the server, runs the clients and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--think", type=float, default=0.2, help="mean think time of a client, in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_run_server, args=(child, args.seed), daemon=True)
+    process.start()
+    try:
+        address = parent.recv()
+        histogram, counts, wall_time = asyncio.run(_load(address, args.connections, args.duration, args.think,
+                                                         args.seed))
+    finally:
+        process.terminate()
+        process.join()
+
+    print(f"{args.connections} connections, {counts['responses']} responses in {wall_time:.1f} s "
+          f"({counts['responses'] / wall_time:,.0f} requests/s), {counts['errors']} errors")
+    print(f"latency: p50 {histogram.percentile(50) / 1e6:.2f} ms, p99 {histogram.percentile(99) / 1e6:.2f} ms, "
+          f"max {histogram.maximum / 1e6:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
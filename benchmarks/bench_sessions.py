@@ -0,0 +1,89 @@
+"""
+Benchmark of the session manager: latency of a resident session and of a rehydration.
+
+Every session of the game is evicted to disk, then the sessions are used
+again after some game time: each request loads the creature back and
+applies the elapsed time. The latency of these misses is compared with
+the lookup of a resident session.
+
+Usage:
+    python -m benchmarks.bench_sessions --sessions 5000 --idle-hours 8
+"""
+
+import argparse
+import tempfile
+import time
+
+from game.game_manager import Game
+from game.metrics import Histogram
+from game.sessions import SessionManager
+from utils.clock import ManualClock
+
+
+def _sessions(count, seed, spill_dir):
+    """
+    Creates a game with one session per creature.
+
+    Args:
+        count (int): Number of sessions
+        seed (int): Root seed
+        spill_dir (str): Directory of the evicted sessions
+
+    Returns:
+        SessionManager: The sessions, all resident
+    """
+    game = Game(seed, ManualClock())
+    sessions = SessionManager(game, spill_dir)
+    for i in range(count):
+        game.create_creature(f"Pixel-{i}", "lapin", owner=f"session-{i}")
+        sessions.attach(f"session-{i}", game.active_id)
+    return sessions
+
+
+def _use_all(sessions, count):
+    """
+    Uses every session once, recording the latency of each.
+
+    Returns:
+        Histogram: Latencies in nanoseconds
+    """
+    histogram = Histogram()
+    for i in range(count):
+        start = time.perf_counter_ns()
+        sessions.creature_id(f"session-{i}")
+        histogram.record(time.perf_counter_ns() - start)
+    return histogram
+
+
+def main():
+    """
+    Measures the hits and the rehydrations and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--idle-hours", type=float, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        sessions = _sessions(args.sessions, args.seed, spill_dir)
+        sessions.game.clock.advance_hours(args.idle_hours)
+        hits = _use_all(sessions, args.sessions)
+
+        start = time.perf_counter()
+        for i in range(args.sessions):
+            sessions.evict(f"session-{i}")
+        evict_time = time.perf_counter() - start
+
+        sessions.game.clock.advance_hours(args.idle_hours)
+        misses = _use_all(sessions, args.sessions)
+
+    for label, histogram in (("resident", hits), ("rehydrated", misses)):
+        print(f"{label:<10}: mean {histogram.total / histogram.count / 1e3:>8.1f} us, "
+              f"p50 {histogram.percentile(50) / 1e3:>8.1f} us, p99 {histogram.percentile(99) / 1e3:>8.1f} us")
+    print(f"eviction  : mean {evict_time / args.sessions * 1e6:>8.1f} us")
+    print(sessions.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark of the SQLite creature store against one JSON file per creature.
+
+For every population size, saves the creatures (states in the save
+format, built from creatures in varied states) in a CreatureStore and
+as JSON files in a directory, both with atomic and durable writes, then
+loads them all back. Reports the creatures saved and loaded per second,
+the update of already stored creatures, and the time of the prepared
+queries of the store, which read only the rows they return. The JSON
+files are skipped above --json-limit creatures (one file each).
+
+Usage:
+    python -m benchmarks.bench_store --sizes 10000,100000,1000000 --json-limit 100000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_save_format import _creatures
+from utils.file_manager import load_data, save_many
+from utils.store import CreatureStore
+
+# Distinct creatures the populations are built from (their ids and owners differ)
+TEMPLATES = 1000
+
+# Number of owners of the population
+OWNERS = 1000
+
+
+def _states(count, templates):
+    """
+    Yields the states of a population, without keeping it in memory.
+
+    Args:
+        count (int): Number of creatures
+        templates (list): States in the save format to copy
+
+    Yields:
+        tuple: The state of a creature and its owner
+    """
+    for creature_id in range(count):
+        state = dict(templates[creature_id % len(templates)])
+        state["id"] = creature_id
+        yield state, f"joueur-{creature_id % OWNERS}"
+
+
+def _rate(count, seconds):
+    """Formats a throughput."""
+    return f"{count / seconds:>10,.0f}/s"
+
+
+def _bench_store(count, templates, directory):
+    """
+    Saves, updates, queries and loads a population in a store.
+
+    Args:
+        count (int): Number of creatures
+        templates (list): States in the save format to copy
+        directory (str): Temporary directory
+    """
+    store = CreatureStore(os.path.join(directory, "creatures.db"))
+    try:
+        start = time.perf_counter()
+        store.upsert(_states(count, templates))
+        save = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.upsert(_states(count, templates))
+        update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = sum(1 for _ in store.find())
+        load = time.perf_counter() - start
+        assert loaded == count
+        print(f"  sqlite: save {_rate(count, save)}  update {_rate(count, update)}  load {_rate(count, load)}  "
+              f"({os.path.getsize(store.filename) / count:.0f} bytes/creature)")
+
+        for query, params in (("sick", ()), ("owner", ("joueur-7",)), ("type", ("dragon",)), ("id", (count // 2,))):
+            start = time.perf_counter()
+            found = sum(1 for _ in store.find(query, *params))
+            print(f"          find({query!r}{''.join(f', {param!r}' for param in params)}): "
+                  f"{found:,} creatures in {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        store.close()
+
+
+def _bench_files(count, templates, directory):
+    """
+    Saves and loads a population as one JSON file per creature.
+
+    Args:
+        count (int): Number of creatures
+        templates (list): States in the save format to copy
+        directory (str): Temporary directory
+    """
+    folder = os.path.join(directory, "creatures")
+    os.makedirs(folder)
+    start = time.perf_counter()
+    saved = save_many((state, os.path.join(folder, f"{state['id']}.json")) for state, _ in _states(count, templates))
+    save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = sum(1 for filename in saved if load_data(filename) is not None)
+    load = time.perf_counter() - start
+    assert loaded == count
+    print(f"  json:   save {_rate(count, save)}  {'':>18}  load {_rate(count, load)}")
+
+
+def main():
+    """
+    Times both backends for every population size and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="population sizes, comma-separated")
+    parser.add_argument("--json-limit", type=int, default=100_000,
+                        help="largest population also saved as JSON files")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    templates = [creature.to_dict() for creature in _creatures(TEMPLATES, args.seed)]
+    for count in (int(size) for size in args.sizes.split(",")):
+        print(f"{count:,} creatures")
+        directory = tempfile.mkdtemp(prefix="store-")
+        try:
+            _bench_store(count, templates, directory)
+            if count <= args.json_limit:
+                _bench_files(count, templates, directory)
+            else:
+                print(f"  json:   skipped (more than {args.json_limit:,} files)")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark comparing the shared weather calendar with a draw per creature.
+
+Without the calendar every creature draws its own weather for every new
+day; with it, the weather of a day is drawn once and looked up by every
+creature, or applied to a whole population at once.
+
+Usage:
+    python -m benchmarks.bench_weather --creatures 10000 --days 30
+"""
+
+import argparse
+import time
+
+from game.events import generate_random_weather
+from game.weather import WeatherCalendar
+from models.population import CreaturePopulation
+from utils.rng import RngStream
+
+
+def _per_creature(population, days, seed):
+    """
+    Draws the weather of every day for every creature and applies it one by one.
+
+    Args:
+        population (CreaturePopulation): The creatures
+        days (int): Number of game days
+        seed (int): Root seed
+    """
+    streams = [RngStream(seed, "weather", creature_id) for creature_id in population.ids]
+    happiness = population.happiness
+    for _ in range(days):
+        for i, stream in enumerate(streams):
+            weather = generate_random_weather(stream)
+            happiness[i] = max(0, min(100, happiness[i] + weather["happiness_effect"]))
+
+
+def _lookups(population, days, seed):
+    """
+    Looks the weather of every day up in a shared calendar for every creature.
+
+    Args:
+        population (CreaturePopulation): The creatures
+        days (int): Number of game days
+        seed (int): Root seed
+    """
+    calendar = WeatherCalendar(seed)
+    happiness = population.happiness
+    for day in range(days):
+        for i in range(len(happiness)):
+            weather = calendar.weather_for_day(day)
+            happiness[i] = max(0, min(100, happiness[i] + weather["happiness_effect"]))
+
+
+def _batched(population, days, seed):
+    """
+    Applies the weather of every day to the whole population at once.
+
+    Args:
+        population (CreaturePopulation): The creatures
+        days (int): Number of game days
+        seed (int): Root seed
+    """
+    calendar = WeatherCalendar(seed)
+    calendar.precompute(0, days - 1)
+    for day in range(days):
+        calendar.apply(population, day)
+
+
+def main():
+    """
+    Runs the three strategies on identical populations and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    for label, run in (("draw per creature", _per_creature), ("calendar lookups", _lookups),
+                       ("calendar.apply", _batched)):
+        population = CreaturePopulation.spawn(args.creatures, "lapin", seed=args.seed)
+        start = time.perf_counter()
+        run(population, args.days, args.seed)
+        results[label] = time.perf_counter() - start
+        updates = args.creatures * args.days
+        print(f"{label:<18}: {updates / results[label]:>14,.0f} creature-days/s")
+
+    print(f"Speed-up of calendar.apply: {results['draw per creature'] / results['calendar.apply']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
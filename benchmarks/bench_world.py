@@ -0,0 +1,46 @@
+"""
+Scaling benchmark of the sharded world simulator: ticks per second against worker count.
+
+Usage:
+    python -m benchmarks.bench_world --creatures 400000 --ticks 20 --max-workers 8
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from game.world import WorldSimulator
+
+
+def main():
+    """
+    Runs the same world with 1 to N workers and prints the throughput of each run.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creatures", type=int, default=400000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--hours", type=float, default=1)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    types = ["chaton", "chiot", "dragon", "robot", "lapin"]
+    baseline = None
+    print(f"{'workers':>7} {'ticks/s':>10} {'creatures/s':>14} {'speed-up':>9}  deaths")
+    for workers in range(1, args.max_workers + 1):
+        with WorldSimulator(args.seed, workers) as world:
+            for creature_type in types:
+                world.add_creatures(args.creatures // len(types), creature_type)
+
+            start = time.perf_counter()
+            results = world.run(args.ticks, args.hours)
+            elapsed = time.perf_counter() - start
+
+        deaths = sum(len(result["deaths"]) for result in results)
+        rate = args.ticks / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>7} {rate:>10.2f} {rate * args.creatures:>14,.0f} {rate / baseline:>8.2f}x  {deaths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+"""
+Seeded benchmark suite of the hot paths of models, game and utils.
+
+Every benchmark is registered with @benchmark and built by a factory
+receiving the seed, which returns the function to time. The runner
+calibrates the number of calls per round, keeps the best and the median
+round, and writes the results as JSON so two commits can be compared.
+
+The functions timed on a creature reset its stats first (a handful of
+attribute assignments, identical from one commit to the other) so that
+millions of calls never drift into a different code path, such as a dead
+or evolving creature.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from game.events import generate_encounter, generate_random_event, generate_random_weather
+from game.game_manager import Game
+from game.headless import run_trace, synthetic_trace
+from game.journal import Journal
+from game.metrics import Metrics
+from models.creature import Creature
+from models.save_format import decode, encode
+from ui import display
+from utils.clock import FixedStepClock, ManualClock
+from utils.rng import RngStream
+from utils.store import CreatureStore
+
+# Registered benchmarks: name -> factory(seed) returning the function to time
+BENCHMARKS = {}
+
+# Minimal duration of a round, used to calibrate the number of calls
+MIN_ROUND_TIME = 0.05
+
+# Resources of the benchmark being run (temporary directories, open stores and journals), released after it
+_resources = contextlib.ExitStack()
+
+
+def benchmark(name):
+    """
+    Decorator registering a benchmark factory.
+
+    Args:
+        name (str): Name of the benchmark in the results
+
+    Returns:
+        callable: The decorator
+    """
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def _temporary_path(name):
+    """
+    Returns a path in a temporary directory deleted once the benchmark has run.
+
+    Args:
+        name (str): Name of the file
+
+    Returns:
+        str: Path of the file
+    """
+    return os.path.join(_resources.enter_context(tempfile.TemporaryDirectory(prefix="bench-")), name)
+
+
+def _creature(seed):
+    """
+    Creates the seeded creature used by the micro-benchmarks.
+
+    Args:
+        seed (int): Root seed
+
+    Returns:
+        Creature: A healthy newborn creature
+    """
+    return Creature("Pixel", "chaton", "bleu", "sportif", creature_id=1, rng=RngStream(seed, "creature", 1))
+
+
+def _refill(creature):
+    """
+    Puts a creature back in a healthy state without allocating anything.
+
+    Args:
+        creature (Creature): The creature to reset
+    """
+    creature.hunger = creature.energy = creature.happiness = creature.health = 100
+    creature.is_sick = False
+    creature.age = 0
+    creature.friends.clear()
+
+
+def _game(seed):
+    """
+    Creates a game on a frozen virtual clock, so that do_action only times the action itself.
+
+    Args:
+        seed (int): Root seed
+
+    Returns:
+        Game: Game with a creature
+    """
+    game = Game(seed, ManualClock())
+    game.create_creature("Pixel", "chaton", "bleu", "sportif")
+    return game
+
+
+def _action(seed, action, inventory=(), **params):
+    """
+    Builds a benchmark of one branch of Game.do_action.
+
+    Args:
+        seed (int): Root seed
+        action (str): Action to perform
+        inventory (tuple): Items the creature holds before every call
+        **params: Parameters of the action
+
+    Returns:
+        callable: Function performing the action once
+    """
+    game = _game(seed)
+
+    def run():
+        if game.creature is None:
+            game.create_creature("Pixel", "chaton", "bleu", "sportif")
+        _refill(game.creature)
+        game.creature.game_points = 1000
+        game.creature.inventory[:] = inventory
+        game.do_action(action, **params)
+    return run
+
+
+@benchmark("Creature.pass_time")
+def _pass_time(seed):
+    creature = _creature(seed)
+
+    def run():
+        _refill(creature)
+        creature.pass_time(1)
+    return run
+
+
+@benchmark("Creature.catch_up(30 days)")
+def _catch_up(seed):
+    creature = _creature(seed)
+
+    def run():
+        _refill(creature)
+        creature.catch_up(24 * 30)
+    return run
+
+
+@benchmark("Creature.feed")
+def _feed(seed):
+    creature = _creature(seed)
+
+    def run():
+        _refill(creature)
+        creature.feed("premium")
+    return run
+
+
+@benchmark("Creature.play")
+def _play(seed):
+    creature = _creature(seed)
+
+    def run():
+        _refill(creature)
+        creature.play(1)
+    return run
+
+
+@benchmark("Creature.sleep")
+def _sleep(seed):
+    creature = _creature(seed)
+
+    def run():
+        _refill(creature)
+        creature.sleep(8)
+    return run
+
+
+@benchmark("Creature.get_state")
+def _get_state(seed):
+    return _creature(seed).get_state
+
+
+@benchmark("generate_random_event")
+def _random_event(seed):
+    creature = _creature(seed)
+    rng = RngStream(seed, "events")
+
+    def run():
+        _refill(creature)
+        generate_random_event(creature, rng)
+    return run
+
+
+@benchmark("generate_encounter")
+def _encounter(seed):
+    creature = _creature(seed)
+    rng = RngStream(seed, "encounters")
+    return lambda: generate_encounter(creature, rng=rng)
+
+
+@benchmark("Creature.save")
+def _save(seed):
+    creature = _creature(seed)
+    filename = _temporary_path("sauvegarde.json")
+    return lambda: creature.save(filename)
+
+
+@benchmark("Creature.save (changed)")
+def _save_changed(seed):
+    creature = _creature(seed)
+    filename = _temporary_path("sauvegarde.json")
+
+    def run():
+        # A new value every call: the file is written every time
+        creature.game_points += 1
+        creature.save(filename)
+    return run
+
+
+@benchmark("Creature.load")
+def _load(seed):
+    filename = _temporary_path("sauvegarde.json")
+    _creature(seed).save(filename)
+    return lambda: Creature.load(filename)
+
+
+@benchmark("save_format.encode")
+def _binary_encode(seed):
+    state = _creature(seed).to_dict()
+    return lambda: encode(state)
+
+
+@benchmark("save_format.decode")
+def _binary_decode(seed):
+    payload = encode(_creature(seed).to_dict())
+    return lambda: decode(payload)
+
+
+@benchmark("CreatureStore.load")
+def _store_load(seed):
+    store = CreatureStore(_temporary_path("creatures.db"))
+    _resources.callback(store.close)
+    store.upsert([(_creature(seed).to_dict(), "joueur")])
+    return lambda: store.load(1)
+
+
+@benchmark("Creature.fork")
+def _fork(seed):
+    return _creature(seed).fork
+
+
+@benchmark("Game.fork")
+def _game_fork(seed):
+    return _game(seed).fork
+
+
+@benchmark("forecast(10k rollouts, 24h)")
+def _forecast(seed):
+    from game.forecast import CarePolicy, forecast  # needs numpy
+
+    creature = _creature(seed)
+    policy = CarePolicy.parse("feed=30:premium,heal")
+    return lambda: forecast(creature, 24, 10_000, policy)
+
+
+@benchmark("autopilot decision")
+def _autopilot_decision(seed):
+    from game.autopilot import get_value_table  # needs numpy
+
+    creature = _creature(seed)
+    table = get_value_table(creature.creature_type)
+    return lambda: table.decide(creature)
+
+
+@benchmark("display_state")
+def _display_state(seed):
+    creature = _creature(seed)
+    state = creature.get_state()
+    weather = generate_random_weather(RngStream(seed, "weather"))
+    stream = io.StringIO()
+
+    def run():
+        stream.seek(0)
+        stream.truncate()
+        with contextlib.redirect_stdout(stream):
+            display.display_state(state, weather)
+    return run
+
+
+for _name, _params in (("feed", {"food": "standard"}),
+                       ("play", {"duration": 1}),
+                       ("sleep", {"duration": 8}),
+                       ("heal", {}),
+                       ("explore", {}),
+                       ("meet", {}),
+                       ("use_object", {}),
+                       ("shop", {}),
+                       ("shop", {"buy": "Friandise"}),
+                       ("play_mini_game", {}),
+                       ("unknown", {})):
+    _label = f"do_action({_name}{', ' + ', '.join(f'{k}={v}' for k, v in _params.items()) if _params else ''})"
+    BENCHMARKS[_label] = lambda seed, _name=_name, _params=_params: _action(seed, _name, **_params)
+
+
+@benchmark("do_action(use_object, item=Friandise)")
+def _use_object(seed):
+    return _action(seed, "use_object", inventory=("Friandise",), item="Friandise")
+
+
+@benchmark("do_action(save)")
+def _save_action(seed):
+    return _action(seed, "save", filename=_temporary_path("sauvegarde.json"))
+
+
+@benchmark("do_action(play_mini_game, game=Devinette)")
+def _mini_game(seed):
+    run = _action(seed, "play_mini_game", game="Devinette")
+    stream = io.StringIO()
+
+    def play():
+        stream.seek(0)
+        stream.truncate()
+        # The riddle reads the answers from the keyboard
+        with mock.patch("builtins.input", return_value="5"), contextlib.redirect_stdout(stream):
+            run()
+    return play
+
+
+@benchmark("do_action(heal) with metrics")
+def _metrics(seed):
+    game = _game(seed)
+    game.metrics = Metrics()
+
+    def run():
+        _refill(game.creature)
+        game.do_action("heal")
+    return run
+
+
+@benchmark("do_action(heal) with journal")
+def _journal(seed):
+    game = _game(seed)
+    journal = Journal(_temporary_path("journal"))
+    journal.attach(game)
+    _resources.callback(journal.detach)
+
+    def run():
+        _refill(game.creature)
+        game.do_action("heal")
+    return run
+
+
+@benchmark("do_action(feed) after 30 minutes")
+def _feed_after_pass_time(seed):
+    game = _game(seed)
+
+    def run():
+        _refill(game.creature)
+        game.clock.advance(1800)
+        game.do_action("feed")
+    return run
+
+
+@benchmark("do_action(feed) after 2 days")
+def _feed_after_catch_up(seed):
+    game = _game(seed)
+
+    def run():
+        if game.creature is None:
+            game.create_creature("Pixel", "chaton", "bleu", "sportif")
+        _refill(game.creature)
+        game.clock.advance(2 * 86400)
+        game.do_action("feed")
+    return run
+
+
+@benchmark("Game.simulate(1 year, hourly)")
+def _simulate_year(seed):
+    def run():
+        game = Game(seed, FixedStepClock())
+        for hour in range(365 * 24):
+            if game.creature is None:
+                game.create_creature("Pixel", "chaton", "bleu", "sportif")
+            game.simulate(1)
+            # Minimal care, so that the year is not mostly spent respawning
+            if game.creature is not None and hour % 4 == 0:
+                game.do_action("feed", food="premium")
+    return run
+
+
+@benchmark("headless trace (1000 actions)")
+def _trace(seed):
+    actions = list(synthetic_trace(1000, seed))
+    return lambda: run_trace(actions, seed)
+
+
+def _time_rounds(function, rounds):
+    """
+    Times a function over calibrated rounds.
+
+    Args:
+        function (callable): Function to time
+        rounds (int): Number of rounds
+
+    Returns:
+        tuple: Calls per round and time per call of every round, in seconds
+    """
+    repeat = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        if time.perf_counter() - start >= MIN_ROUND_TIME:
+            break
+        repeat *= 2
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        timings.append((time.perf_counter() - start) / repeat)
+    return repeat, timings
+
+
+def _commit():
+    """
+    Returns the current git commit, if any.
+
+    Returns:
+        str or None: Abbreviated commit hash
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(seed=0, rounds=5, selection=None, verbose=False):
+    """
+    Runs the benchmarks.
+
+    Args:
+        seed (int): Root seed given to every benchmark
+        rounds (int): Number of timed rounds per benchmark
+        selection (str): Only run the benchmarks whose name contains this text
+        verbose (bool): Print every result as soon as it is measured
+
+    Returns:
+        dict: Metadata and results (nanoseconds per call, best and median round)
+    """
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if selection and selection not in name:
+            continue
+        try:
+            repeat, timings = _time_rounds(factory(seed), rounds)
+        finally:
+            _resources.close()
+        best = min(timings)
+        results[name] = {
+            "best_ns": round(best * 1e9, 1),
+            "median_ns": round(statistics.median(timings) * 1e9, 1),
+            "ops_per_s": round(1 / best, 1),
+            "repeat": repeat,
+            "rounds": rounds
+        }
+        if verbose:
+            print(f"{name:<48} {best * 1e6:>12.2f} us/op")
+
+    return {
+        "meta": {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares two result files of run_suite.
+
+    Args:
+        baseline (dict): Reference results
+        current (dict): New results
+        threshold (float): Relative slowdown above which a benchmark is a regression
+
+    Returns:
+        list: (name, baseline ns, current ns, ratio, regression) tuples of the common benchmarks
+    """
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["best_ns"] / reference["best_ns"]
+        rows.append((name, reference["best_ns"], result["best_ns"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    """
+    Command line entry point: "run" writes results, "compare" flags regressions.
+
+    Args:
+        argv (list): Command line arguments (sys.argv by default)
+
+    Returns:
+        int: Exit status, 1 when compare finds a regression
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Suite de mesures de performance.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="exécute les mesures")
+    run_parser.add_argument("--out", help="fichier JSON des résultats")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--rounds", type=int, default=5)
+    run_parser.add_argument("--filter", help="n'exécute que les mesures dont le nom contient ce texte")
+
+    compare_parser = commands.add_parser("compare", help="compare deux fichiers de résultats")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="ralentissement relatif toléré (0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.seed, args.rounds, args.filter, verbose=True)
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=4)
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    with open(args.current, 'r', encoding='utf-8') as file:
+        current = json.load(file)
+
+    regressions = 0
+    for name, before, after, ratio, regression in compare(baseline, current, args.threshold):
+        regressions += regression
+        flag = "RÉGRESSION" if regression else ""
+        print(f"{name:<48} {before / 1000:>10.2f} -> {after / 1000:>10.2f} us  x{ratio:.2f} {flag}")
+    print(f"{regressions} régression(s) au-delà de {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Module registering the actions the player can perform on a creature.
+
+Each action is a handler function registered with @action, together with
+its declared time cost in game hours and the message shown if the
+creature dies during it. Game.do_action looks the handler up in ACTIONS
+and takes care of everything the actions have in common: applying the
+time elapsed since the previous action, announcing the time spent,
+refreshing the weather after a day change and handling the death.
+
+A handler receives the game, the creature and the parameters of the
+action, and returns the ActionResult of the action (the creature's own
+result most of the time), or a Reply for answers that are returned as
+they are (listings, shop).
+"""
+
+from models.result import ActionResult, Status
+from utils.event_bus import ITEM_GAINED, bus
+
+# Message returned when the creature dies, unless the action declares its own
+DEFAULT_DEATH_MESSAGE = "Votre créature est décédée. Retour au menu principal."
+
+# Registered actions: name -> ActionHandler
+ACTIONS = {}
+
+
+class Reply:
+    """Answer of an action returned as is, without the messages of the elapsed time."""
+
+    __slots__ = ("result",)
+
+    def __init__(self, result):
+        """
+        Wraps the answer.
+
+        Args:
+            result (ActionResult): Answer returned to the caller
+        """
+        self.result = result
+
+
+class ActionHandler:
+    """Registered action: its handler function and what it declares."""
+
+    __slots__ = ("name", "function", "hours", "announce_time", "death_message")
+
+    def __init__(self, name, function, hours=0, announce_time=False, death_message=DEFAULT_DEATH_MESSAGE):
+        """
+        Initializes the handler.
+
+        Args:
+            name (str): Name of the action
+            function (callable): Handler, called with (game, creature, params)
+            hours: Game hours taken by the action, either a number or a
+                   (parameter name, default value) tuple
+            announce_time (bool): Prefix the message with the time spent
+            death_message (str): Message returned if the creature dies
+        """
+        self.name = name
+        self.function = function
+        self.hours = hours
+        self.announce_time = announce_time
+        self.death_message = death_message
+
+    def time_cost(self, params):
+        """
+        Returns the game time taken by the action.
+
+        Args:
+            params (dict): Parameters of the action
+
+        Returns:
+            float: Number of game hours
+        """
+        if isinstance(self.hours, tuple):
+            name, default = self.hours
+            return params.get(name, default)
+        return self.hours
+
+
+def action(name, hours=0, announce_time=False, death_message=DEFAULT_DEATH_MESSAGE):
+    """
+    Decorator registering an action handler.
+
+    Args:
+        name (str): Name of the action, as passed to Game.do_action
+        hours: Game hours taken by the action (number or (parameter, default) tuple)
+        announce_time (bool): Prefix the message with the time spent
+        death_message (str): Message returned if the creature dies during the action
+
+    Returns:
+        callable: The decorator
+    """
+    def register(function):
+        ACTIONS[name] = ActionHandler(name, function, hours, announce_time, death_message)
+        return function
+    return register
+
+
+def time_cost(name, params=None):
+    """
+    Returns the game time taken by an action.
+
+    Args:
+        name (str): Name of the action
+        params (dict): Parameters of the action
+
+    Returns:
+        float: Number of game hours (0 for an unknown action)
+    """
+    handler = ACTIONS.get(name)
+    return handler.time_cost(params or {}) if handler else 0
+
+
+@action("feed")
+def feed(game, creature, params):
+    return creature.feed(params.get("food", "standard"))
+
+
+@action("play", hours=("duration", 1), announce_time=True,
+        death_message="Votre créature est décédée pendant le jeu. Retour au menu principal.")
+def play(game, creature, params):
+    return creature.play(params.get("duration", 1))
+
+
+@action("sleep", hours=("duration", 8), announce_time=True,
+        death_message="Votre créature est décédée pendant son sommeil. Retour au menu principal.")
+def sleep(game, creature, params):
+    return creature.sleep(params.get("duration", 8))
+
+
+@action("heal")
+def heal(game, creature, params):
+    return creature.heal()
+
+
+@action("wait")
+def wait(game, creature, params):
+    # Nothing to do: only the elapsed time is applied
+    return ActionResult()
+
+
+@action("save")
+def save(game, creature, params):
+    return creature.save(params.get("filename", "sauvegarde.json"))
+
+
+@action("explore", hours=0.5,
+        death_message="Votre créature est décédée pendant l'exploration. Retour au menu principal.")
+def explore(game, creature, params):
+    result = creature.pass_time(0.5)
+    if result.status == Status.DEATH:
+        return result
+
+    from game.events import draw_event
+    event = draw_event(creature, creature.rng.child("events"))
+    event.apply(creature)
+    return ActionResult(Status.OK, "Votre créature a exploré pendant 30 minutes.",
+                        parts=(ActionResult(Status.OK, event.template, {"name": creature.name}),))
+
+
+@action("meet", hours=0.5, announce_time=True,
+        death_message="Votre créature est décédée pendant la rencontre. Retour au menu principal.")
+def meet(game, creature, params):
+    # The creature meets a creature of another type
+    possible_types = game.available_types.copy()
+    if creature.creature_type.lower() in map(str.lower, possible_types):
+        possible_types.remove(creature.creature_type.lower())
+
+    encounters_rng = creature.rng.child("encounters")
+    other_type = params.get("type") or encounters_rng.choice(possible_types)
+    other_name = params.get("name") or f"{other_type.capitalize()}-{encounters_rng.randint(1, 100)}"
+    return creature.encounter_creature(other_name, other_type)
+
+
+@action("play_mini_game", hours=1.0, announce_time=True)
+def play_mini_game(game, creature, params):
+    chosen_game = params.get("game")
+    if not chosen_game:
+        # If no game is specified, list the available games
+        from game.mini_games import mini_game_list
+        game_names = [available["nom"] for available in mini_game_list()]
+        return Reply(ActionResult(Status.OK, f"Mini-jeux disponibles: {', '.join(game_names)}", value=game_names))
+
+    return creature.play_mini_game(chosen_game)
+
+
+@action("use_object", hours=0.25, announce_time=True)
+def use_object(game, creature, params):
+    item = params.get("item")
+    if not item:
+        # If no item is specified, list the inventory
+        if not creature.inventory:
+            return Reply(ActionResult(Status.OK, "L'inventaire est vide.", value=[]))
+        return Reply(ActionResult(Status.OK, "Objets disponibles: {items}",
+                                  {"items": ", ".join(creature.inventory)}, value=list(creature.inventory)))
+    return creature.use_object(item)
+
+
+@action("autopilot", death_message="Votre créature est décédée sous la garde du pilote automatique. "
+                                   "Retour au menu principal.")
+def autopilot(game, creature, params):
+    # The autopilot chooses one of the actions above for the caught up creature and performs it
+    from game.autopilot import decide
+    name, chosen_params = decide(creature)
+    result = ACTIONS[name].function(game, creature, chosen_params)
+    if result.status == Status.DEATH:
+        return result
+    return ActionResult(result.status, "Pilote automatique : {action}", {"action": name}, parts=(result,),
+                        value={"action": name, "params": dict(chosen_params)})
+
+
+@action("shop")
+def shop(game, creature, params):
+    points = creature.game_points
+    item = params.get("buy")
+    if not item:
+        # Only the points are returned, the catalog is displayed via shop_menu
+        return Reply(ActionResult(Status.OK, "{points} points", {"points": points}, value=points))
+
+    price = game._get_object_price(item)
+    fields = {"item": item, "price": price, "points": points}
+    if not price:
+        return Reply(ActionResult(Status.FAILED, "L'objet {item} n'est pas disponible dans la boutique.", fields))
+    if points < price:
+        return Reply(ActionResult(Status.FAILED, "Vous n'avez pas assez de points pour acheter {item}. "
+                                  "Prix: {price} points, points disponibles: {points}.", fields))
+
+    creature.game_points -= price
+    creature.add_item(item)
+    bus.publish(ITEM_GAINED, creature=creature, item=item)
+    return Reply(ActionResult(Status.OK, "Vous avez acheté {item} pour {price} points.", fields, (ITEM_GAINED,),
+                              value=item))
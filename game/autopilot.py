@@ -0,0 +1,409 @@
+"""
+Autopilot taking care of creatures while their owners are away.
+
+Requires NumPy. For the state of a creature, the autopilot picks the
+action of game.actions (one of AUTOPILOT_ACTIONS, or an item of its
+inventory) that maximizes its discounted happiness and health over the
+next hours. The choice comes from a value table computed once per
+creature type by value iteration over a grid of (hunger, energy,
+happiness, health, sick) states, then cached: a decision is a lookup in
+the table, which takes a few microseconds.
+
+The model of one step mirrors the game: the action chosen on the caught
+up state of the creature, as Game.do_action performs it (Creature.feed,
+play, sleep, heal, use_object), then an hour of Creature.pass_time with
+its sickness and random event rolls. Mini-games are left out, as they
+are played by the owner at the keyboard, and so are the weather of the
+day, the evolution and the game points.
+
+Usage:
+    game.do_action("autopilot", creature_id=creature_id)  # once per game hour
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+from game.events import EVENT_STATS, get_event_table
+from models import rules
+
+# Actions the autopilot chooses from, as (action, parameters) pairs of Game.do_action
+AUTOPILOT_ACTIONS = (
+    ("wait", MappingProxyType({})),
+    ("feed", MappingProxyType({"food": "standard"})),
+    ("feed", MappingProxyType({"food": "premium"})),
+    ("feed", MappingProxyType({"food": "malsaine"})),
+    ("play", MappingProxyType({"duration": 1})),
+    ("sleep", MappingProxyType({"duration": 1})),
+    ("sleep", MappingProxyType({"duration": 8})),
+    ("heal", MappingProxyType({})),
+)
+
+# Spacing of the grid of each stat, and number of values of each stat on the grid
+GRID_STEP = 10
+GRID_LEVELS = 100 // GRID_STEP + 1
+
+# Game hours between two decisions
+STEP_HOURS = 1
+
+# Weight of the next step compared with the current one (the horizon is about 1 / (1 - DISCOUNT) steps)
+DISCOUNT = 0.95
+
+# Largest change of a value between two sweeps at which the value iteration stops
+TOLERANCE = 1e-3
+
+# Order of the stats in the state arrays (the sick flag is stored as 0 or 1)
+STATE_STATS = EVENT_STATS + ("is_sick",)
+HUNGER, ENERGY, HAPPINESS, HEALTH, SICK = range(len(STATE_STATS))
+
+_value_tables = {}
+
+
+def _update_state(state):
+    """
+    Applies Creature._update_state to an array of states.
+
+    Args:
+        state (ndarray): States, one column each (modified in place)
+
+    Returns:
+        ndarray: True for the states in which the creature died
+    """
+    sick = state[SICK] > 0
+    state[HEALTH] = np.where(state[HUNGER] < 20, np.maximum(0, state[HEALTH] - 5), state[HEALTH])
+    state[HAPPINESS] = np.where(state[ENERGY] < 20, np.maximum(0, state[HAPPINESS] - 5), state[HAPPINESS])
+    state[ENERGY] = np.where(sick, np.maximum(0, state[ENERGY] - 2), state[ENERGY])
+    state[HAPPINESS] = np.where(sick, np.maximum(0, state[HAPPINESS] - 2), state[HAPPINESS])
+    dead = state[HEALTH] <= 0
+    state[HEALTH][dead] = 0
+    return dead
+
+
+def _perform(state, action, params, modifiers):
+    """
+    Applies an action, as the creature method it calls, to an array of states.
+
+    Args:
+        state (ndarray): States before the action, one column each
+        action (str): Name of the action (one of AUTOPILOT_ACTIONS or "use_object")
+        params (Mapping): Parameters of the action
+        modifiers (Mapping): Modifiers of the creature type
+
+    Returns:
+        tuple: States after the action and True for the states in which the creature died
+    """
+    state = state.copy()
+    dead = np.zeros(state.shape[1], dtype=bool)
+    if action == "feed":
+        food = params["food"]
+        if food == "standard":
+            gain = 20 * modifiers["hunger"]
+        elif food == "premium":
+            gain = 30 * modifiers["hunger"]
+            state[HAPPINESS] += 5
+        else:
+            gain = 15 * modifiers["hunger"]
+            state[HEALTH] -= 5
+        state[HUNGER] = np.minimum(100, state[HUNGER] + gain)
+        dead = _update_state(state)
+    elif action == "play":
+        # Too tired creatures do not play (the action fails and changes nothing)
+        duration = params["duration"]
+        played = state.copy()
+        played[HAPPINESS] = np.minimum(100, played[HAPPINESS] + 15 * duration * modifiers["happiness"])
+        played[ENERGY] = np.maximum(0, played[ENERGY] - 10 * duration)
+        played[HUNGER] = np.maximum(0, played[HUNGER] - 5 * duration)
+        played_dead = _update_state(played)
+        able = state[ENERGY] >= 20
+        state = np.where(able, played, state)
+        dead = able & played_dead
+    elif action == "sleep":
+        duration = params["duration"]
+        state[ENERGY] = np.minimum(100, state[ENERGY] + 10 * duration * modifiers["energy"])
+        state[HUNGER] = np.maximum(0, state[HUNGER] - 5 * duration)
+        dead = _update_state(state)
+    elif action == "heal":
+        # Only sick creatures are healed (the health gained keeps them alive)
+        healed = state.copy()
+        healed[SICK] = 0
+        healed[HEALTH] = np.minimum(100, healed[HEALTH] + 30)
+        _update_state(healed)
+        state = np.where(state[SICK] > 0, healed, state)
+    elif action == "use_object":
+        for stat, value in rules.ITEM_EFFECTS[params["item"]].items():
+            if stat == "is_sick":
+                state[SICK] = float(value)
+            elif stat in STATE_STATS:
+                index = STATE_STATS.index(stat)
+                state[index] = np.clip(state[index] + value, 0, 100)
+    return state, dead
+
+
+def _event_probabilities(table):
+    """
+    Returns the probability of every event of a table from its alias table.
+
+    Args:
+        table (EventTable): Compiled events of a creature type
+
+    Returns:
+        ndarray: Probability of each event, in the order of table.events
+    """
+    sampler = table.sampler
+    probabilities = np.array(sampler.probabilities)
+    np.add.at(probabilities, np.array(sampler.aliases), 1 - probabilities)
+    return probabilities / sampler.size
+
+
+def _pass_time(state, creature_type, hours):
+    """
+    Lists the outcomes of Creature.pass_time for an array of states.
+
+    Args:
+        state (ndarray): States before the time passes, one column each
+        creature_type (str): Type of the creatures (for the random events)
+        hours (float): Game hours elapsed
+
+    Returns:
+        list: (probabilities, states, dead) of every outcome, the probabilities
+              being arrays as falling sick depends on the state
+    """
+    decayed = state.copy()
+    decayed[HUNGER] = np.maximum(0, decayed[HUNGER] - 3 * hours)
+    decayed[ENERGY] = np.maximum(0, decayed[ENERGY] - 2 * hours)
+    decayed[HAPPINESS] = np.maximum(0, decayed[HAPPINESS] - 2 * hours)
+
+    # Falling sick replaces the random event roll
+    healthy = decayed[SICK] == 0
+    sickness = np.where(healthy, min(1.0, 0.05 * hours), 0.0)
+    sick = decayed.copy()
+    sick[SICK] = 1
+    sick[HEALTH] = np.where(healthy, np.maximum(0, sick[HEALTH] - 10), sick[HEALTH])
+    outcomes = [(sickness, sick, _update_state(sick))]
+
+    table = get_event_table(creature_type)
+    event_chance = (1 - sickness) * min(1.0, 0.1 * hours)
+    for event, probability in zip(table.events, _event_probabilities(table)):
+        after = decayed.copy()
+        for index, delta in enumerate(event.deltas):
+            if delta is not None:
+                after[index] = np.clip(after[index] + delta, 0, 100)
+        outcomes.append((event_chance * probability, after, _update_state(after)))
+
+    quiet = decayed.copy()
+    outcomes.append(((1 - sickness) * (1 - min(1.0, 0.1 * hours)), quiet, _update_state(quiet)))
+    return outcomes
+
+
+def _corners(state, dead):
+    """
+    Returns the grid states around every state and their multilinear interpolation weights.
+
+    Args:
+        state (ndarray): States, one column each (stats beyond 0-100 are clamped)
+        dead (ndarray): True for the dead states (all their weights are 0)
+
+    Returns:
+        tuple: Indices and weights of the 16 corners of each state, arrays of shape (16, states)
+    """
+    scaled = np.clip(state[:SICK], 0, 100) / GRID_STEP
+    low = np.minimum(scaled.astype(np.intp), GRID_LEVELS - 2)
+    fraction = scaled - low
+    indices = np.zeros((16, state.shape[1]), dtype=np.intp)
+    weights = np.ones((16, state.shape[1]))
+    for corner in range(16):
+        for stat in range(SICK):
+            upper = (corner >> (SICK - 1 - stat)) & 1
+            indices[corner] = indices[corner] * GRID_LEVELS + low[stat] + upper
+            weights[corner] *= fraction[stat] if upper else 1 - fraction[stat]
+    indices = indices * 2 + (state[SICK] > 0)
+    weights[:, dead] = 0
+    return indices, weights
+
+
+def _reward(state, dead):
+    """
+    Returns the reward of being in some states: the mean of the happiness and the health, from 0 to 1.
+
+    Args:
+        state (ndarray): States, one column each
+        dead (ndarray): True for the dead states (no reward)
+
+    Returns:
+        ndarray: Rewards
+    """
+    return np.where(dead, 0.0, (np.minimum(100, state[HAPPINESS]) + state[HEALTH]) / 200)
+
+
+class _Transitions:
+    """Sparse matrix of interpolation weights, applied to vectors of values."""
+
+    def __init__(self, indices, weights):
+        """
+        Builds the matrix from the columns of every row and their weights.
+
+        Args:
+            indices (ndarray): Columns, array of shape (entries per row, rows)
+            weights (ndarray): Weights of the same shape (the entries of weight 0 are dropped)
+        """
+        self.size = size = indices.shape[1]
+        kept = weights > 0
+        rows = np.broadcast_to(np.arange(size), indices.shape)[kept].astype(np.int64)
+        # Merge the entries of a row that fall on the same column
+        keys, positions = np.unique(rows * (indices.max() + 1) + indices[kept], return_inverse=True)
+        rows, self.columns = np.divmod(keys, indices.max() + 1)
+        self.weights = np.bincount(positions, weights[kept], minlength=len(keys))
+        # The entries are sorted by row: each row is summed from its first entry on
+        self.starts = np.flatnonzero(np.diff(rows, prepend=-1))
+        self.rows = rows[self.starts]
+
+    def apply(self, values):
+        """
+        Multiplies the matrix by a vector.
+
+        Args:
+            values (ndarray): Value of every column
+
+        Returns:
+            ndarray: Weighted sum of the values of every row
+        """
+        result = np.zeros(self.size)
+        result[self.rows] = np.add.reduceat(self.weights * values.take(self.columns), self.starts)
+        return result
+
+
+class ValueTable:
+    """Values and best actions of every state of the grid, for one creature type."""
+
+    def __init__(self, creature_type, step_hours=STEP_HOURS, discount=DISCOUNT, tolerance=TOLERANCE):
+        """
+        Computes the table by value iteration.
+
+        Args:
+            creature_type (str): Type of the creatures
+            step_hours (float): Game hours between two decisions
+            discount (float): Weight of the next step compared with the current one
+            tolerance (float): Largest change of a value at which the iteration stops
+        """
+        self.creature_type = creature_type
+        modifiers = rules.get_modifiers(creature_type)
+
+        # Every state of the grid, in the order of the flat indices (sick flag last)
+        grid = np.indices((GRID_LEVELS,) * SICK + (2,)).reshape(len(STATE_STATS), -1).astype(np.float64)
+        grid[:SICK] *= GRID_STEP
+        size = grid.shape[1]
+
+        # Expected value after an action: sum over the outcomes of the hour that follows
+        outcomes = [_corners(after, dead) + (probability,)
+                    for probability, after, dead in _pass_time(grid, creature_type, step_hours)]
+        expectation = _Transitions(np.concatenate([indices for indices, _, _ in outcomes]),
+                                   np.concatenate([weights * probability for _, weights, probability in outcomes]))
+
+        # Value of every action: reward of the state it leads to and discounted expected value after it
+        def prepare(action, params):
+            after, dead = _perform(grid, action, params, modifiers)
+            return _reward(after, dead), _corners(after, dead)
+
+        prepared = [prepare(action, params) for action, params in AUTOPILOT_ACTIONS]
+        rewards = np.array([reward for reward, _ in prepared])
+        choices = _Transitions(np.concatenate([indices for _, (indices, _) in prepared], axis=1),
+                               np.concatenate([weights for _, (_, weights) in prepared], axis=1))
+
+        values = np.zeros(size)
+        sweeps = 0
+        while True:
+            sweeps += 1
+            expected = expectation.apply(values)
+            q_values = rewards + discount * choices.apply(expected).reshape(rewards.shape)
+            new_values = q_values.max(axis=0)
+            change = np.abs(new_values - values).max()
+            values = new_values
+            if change < tolerance:
+                break
+
+        # Items are used when the creature owns them: they are not part of the values
+        items = {}
+        for item in rules.ITEMS:
+            reward, (indices, weights) = prepare("use_object", {"item": item})
+            items[item] = (reward + discount * (weights * expected[indices]).sum(axis=0)).tolist()
+
+        self.sweeps = sweeps
+        self.values = values
+        self.policy = q_values.argmax(axis=0)
+        # Plain lists: indexing them with an int is much faster than indexing arrays
+        self._best = [AUTOPILOT_ACTIONS[index] for index in self.policy.tolist()]
+        self._best_values = values.tolist()
+        self._item_values = items
+
+    def state_index(self, hunger, energy, happiness, health, is_sick):
+        """
+        Returns the index of the state of the grid closest to some stats.
+
+        Args:
+            hunger (float): Hunger of the creature
+            energy (float): Energy of the creature
+            happiness (float): Happiness of the creature
+            health (float): Health of the creature
+            is_sick (bool): Whether the creature is sick
+
+        Returns:
+            int: Index of the state in the table
+        """
+        # Stats are never negative, but happiness can go beyond 100 (premium food)
+        top = GRID_LEVELS - 1
+        index = min(top, int(hunger / GRID_STEP + 0.5))
+        index = index * GRID_LEVELS + min(top, int(energy / GRID_STEP + 0.5))
+        index = index * GRID_LEVELS + min(top, int(happiness / GRID_STEP + 0.5))
+        index = index * GRID_LEVELS + min(top, int(health / GRID_STEP + 0.5))
+        return index * 2 + (1 if is_sick else 0)
+
+    def decide(self, creature):
+        """
+        Chooses the action of a creature.
+
+        Args:
+            creature (Creature): The creature, caught up to the current time
+
+        Returns:
+            tuple: Name and parameters (read-only mapping) of the action for Game.do_action
+        """
+        index = self.state_index(creature.hunger, creature.energy, creature.happiness, creature.health,
+                                 creature.is_sick)
+        best = self._best[index]
+        if creature.inventory:
+            best_value = self._best_values[index]
+            for item in creature.inventory:
+                item_values = self._item_values.get(item)
+                if item_values is not None and item_values[index] > best_value:
+                    best, best_value = ("use_object", MappingProxyType({"item": item})), item_values[index]
+        return best
+
+
+def get_value_table(creature_type):
+    """
+    Returns the value table of a creature type (computed on first use).
+
+    Args:
+        creature_type (str): Type of creature (case insensitive)
+
+    Returns:
+        ValueTable: Values and best actions for this type of creature
+    """
+    key = creature_type.lower()
+    table = _value_tables.get(key)
+    if table is None:
+        table = _value_tables[key] = ValueTable(key)
+    return table
+
+
+def decide(creature):
+    """
+    Chooses the action the autopilot performs for a creature.
+
+    Args:
+        creature (Creature): The creature, caught up to the current time
+
+    Returns:
+        tuple: Name and parameters (read-only mapping) of the action for Game.do_action
+    """
+    return get_value_table(creature.creature_type).decide(creature)
@@ -1,220 +1,396 @@
 """
 Module managing random events that occur in the game.
+
+The event, encounter and weather tables are compiled once (per creature type
+for events and encounters) into alias tables, so a draw costs O(1) whatever
+the weights. Effects are stored as numeric deltas and messages are templates,
+rendered only when the text is actually needed. An optional "weight" key in
+a table entry makes it more or less likely than the others (default 1).
 """
 
 import random
+from types import MappingProxyType
+
+from utils.sampling import AliasTable
+
+# Stats affected by random events, in the order of CompiledEvent.deltas
+EVENT_STATS = ("hunger", "energy", "happiness", "health")
+
+# Events that can happen to any creature ("{name}" is replaced by the creature's name)
+RANDOM_EVENTS = [
+    {"message": "🧸 {name} a trouvé un jouet !", "effects": {"happiness": 10}},
+    {"message": "😠 {name} s'est disputé avec une autre créature.", "effects": {"happiness": -5}},
+    {"message": "🍽️ {name} a mangé un bon repas.", "effects": {"hunger": 10, "happiness": 5}},
+    {"message": "🎨 {name} a fait un dessin.", "effects": {"happiness": 8}},
+    {"message": "🌧️ Il pleut dehors, votre créature reste à l'intérieur.", "effects": {"energy": 5, "happiness": -3}},
+    {"message": "☀️ Le soleil brille, votre créature profite du beau temps.", "effects": {"happiness": 7, "energy": -3}},
+    {"message": "💤 {name} a fait une sieste imprévue.", "effects": {"energy": 15, "hunger": -5}},
+    {"message": "😱 {name} a eu peur d'un bruit fort.", "effects": {"happiness": -8, "energy": -5}},
+    {"message": "🍬 Un visiteur a donné une friandise à {name}.", "effects": {"hunger": 8, "happiness": 5}},
+    {"message": "😣 {name} a trébuché et s'est fait mal.", "effects": {"happiness": -5, "energy": -10}},
+    {"message": "🦠 {name} a attrapé le covid-19.", "effects": {"happiness": -10, "energy": -15, "health": -20}},
+    {"message": "💦 {name} a voulu apprendre à nager mais s'est noyé.", "effects": {"happiness": -15, "energy": -20, "health": -30}},
+    {"message": "🤢 {name} a mal digéré un aliment.", "effects": {"happiness": -5, "energy": -8, "health": -10}},
+    {"message": "🎁 {name} a reçu un cadeau inattendu.", "effects": {"happiness": 15}},
+]
+
+# Specific event for each type of creature
+TYPE_SPECIFIC_EVENTS = {
+    "chaton": [{"message": "🐭 {name} a chassé une souris imaginaire.", "effects": {"happiness": 10, "energy": -8}}],
+    "chiot": [{"message": "🦴 {name} a enterré un trésor dans le jardin.", "effects": {"happiness": 12, "energy": -10}}],
+    "dragon": [{"message": "🔥 {name} a craché une petite flamme.", "effects": {"happiness": 15, "energy": -12}}],
+    "robot": [{"message": "🔄 {name} a reçu une mise à jour.", "effects": {"energy": 20, "happiness": 8}}],
+    "lapin": [{"message": "🥕 {name} a grignoté une carotte.", "effects": {"hunger": 15, "happiness": 8}}],
+}
+
+# Weather of the day and its effect on happiness
+WEATHER_EVENTS = [
+    {"type": "soleil", "message": "Il fait beau aujourd'hui !", "happiness_effect": 5},
+    {"type": "pluie", "message": "Il pleut aujourd'hui.", "happiness_effect": -3},
+    {"type": "neige", "message": "Il neige aujourd'hui !", "happiness_effect": 2},
+    {"type": "orage", "message": "Il y a un orage aujourd'hui.", "happiness_effect": -8},
+    {"type": "brouillard", "message": "Il y a du brouillard aujourd'hui.", "happiness_effect": -2},
+    {"type": "vent", "message": "Il y a du vent aujourd'hui.", "happiness_effect": -1},
+    {"type": "canicule", "message": "Il fait très chaud aujourd'hui !", "happiness_effect": -10}
+]
+
+# Types of creatures that can be met, and their emojis
+ENCOUNTER_TYPES = ["chaton", "chiot", "dragon", "robot", "lapin", "hamster", "oiseau", "poisson"]
+TYPE_EMOJIS = {
+    "chaton": "🐱",
+    "chiot": "🐶",
+    "dragon": "🐉",
+    "robot": "🤖",
+    "lapin": "🐰",
+    "hamster": "🐹",
+    "oiseau": "🐦",
+    "poisson": "🐠"
+}
+
+# Encounter scenarios ({emoji}/{name} for the creature, {other_emoji}/{other_name} for the other one)
+ENCOUNTER_SCENARIOS = [
+    {
+        "message": "👫 {emoji} {name} a rencontré {other_emoji} {other_name} et ils sont devenus amis.",
+        "happiness_effect": 15,
+        "friendship": True
+    },
+    {
+        "message": "😠 {emoji} {name} a rencontré {other_emoji} {other_name} mais ils ne se sont pas entendus.",
+        "happiness_effect": -5
+    },
+    {
+        "message": "🍽️ {emoji} {name} a partagé sa nourriture avec {other_emoji} {other_name}.",
+        "happiness_effect": 8,
+        "hunger_effect": -10
+    },
+    {
+        "message": "🎮 {other_emoji} {other_name} a appris un nouveau jeu à {emoji} {name}.",
+        "happiness_effect": 12
+    },
+    {
+        "message": "👻 {other_emoji} {other_name} a effrayé {emoji} {name} avec une farce.",
+        "happiness_effect": -8
+    },
+    {
+        "message": "🧭 {emoji} {name} a aidé {other_emoji} {other_name} à retrouver son chemin.",
+        "happiness_effect": 10
+    },
+    {
+        "message": "😠 {other_emoji} {other_name} a volé un jouet à {emoji} {name}.",
+        "happiness_effect": -5
+    },
+    {
+        "message": "🎯 {emoji} {name} a rencontré {other_emoji} {other_name} et ils ont joué ensemble.",
+        "happiness_effect": 10
+    },
+    {
+        "message": "🍽️ {emoji} {name} a rencontré {other_emoji} {other_name} et ils ont partagé un repas.",
+        "happiness_effect": 12,
+        "hunger_effect": 10
+    },
+    {
+        "message": "💤 {emoji} {name} a rencontré {other_emoji} {other_name} et ils ont fait une sieste ensemble.",
+        "happiness_effect": 8,
+        "energy_effect": 10
+    },
+    {
+        "message": "🎨 {emoji} {name} a rencontré {other_emoji} {other_name} et ils ont dessiné ensemble.",
+        "happiness_effect": 10
+    }
+]
+
+
+class CompiledEvent:
+    """Random event with numeric deltas and a message template."""
+
+    __slots__ = ("template", "deltas")
+
+    def __init__(self, template, effects):
+        """
+        Compiles an entry of the event tables.
+
+        Args:
+            template (str): Message, with "{name}" for the creature's name
+            effects (dict): Change of each stat
+        """
+        self.template = template
+        self.deltas = tuple(effects.get(stat) for stat in EVENT_STATS)
+
+    def apply(self, creature):
+        """
+        Applies the effects of the event to a creature (each stat stays between 0 and 100).
+
+        Args:
+            creature: The creature affected by the event
+        """
+        hunger, energy, happiness, health = self.deltas
+        if hunger is not None:
+            creature.hunger = max(0, min(100, creature.hunger + hunger))
+        if energy is not None:
+            creature.energy = max(0, min(100, creature.energy + energy))
+        if happiness is not None:
+            creature.happiness = max(0, min(100, creature.happiness + happiness))
+        if health is not None:
+            creature.health = max(0, min(100, creature.health + health))
+
+    def render(self, name):
+        """
+        Renders the message of the event.
+
+        Args:
+            name (str): Name of the creature
+
+        Returns:
+            str: Description of the event
+        """
+        return self.template.format(name=name)
+
+
+class EventTable:
+    """Compiled events of one creature type with their alias table."""
+
+    __slots__ = ("events", "sampler")
+
+    def __init__(self, entries):
+        """
+        Compiles a list of event entries.
+
+        Args:
+            entries (list): Entries of RANDOM_EVENTS / TYPE_SPECIFIC_EVENTS
+        """
+        self.events = tuple(CompiledEvent(entry["message"], entry["effects"]) for entry in entries)
+        self.sampler = AliasTable([entry.get("weight", 1) for entry in entries])
+
+    def draw(self, rng=random):
+        """
+        Draws one event.
+
+        Args:
+            rng: Source of randomness (the random module by default)
+
+        Returns:
+            CompiledEvent: The drawn event
+        """
+        return self.events[self.sampler.sample(rng)]
+
+    def draw_many(self, count, rng=random):
+        """
+        Draws several independent events.
+
+        Args:
+            count (int): Number of events to draw
+            rng: Source of randomness
+
+        Returns:
+            list: The drawn events
+        """
+        events = self.events
+        return [events[index] for index in self.sampler.sample_many(count, rng)]
+
+
+class EncounterScenario:
+    """Compiled encounter scenario."""
+
+    __slots__ = ("template", "happiness_effect", "hunger_effect", "energy_effect", "friendship")
+
+    def __init__(self, entry):
+        """
+        Compiles an entry of ENCOUNTER_SCENARIOS.
+
+        Args:
+            entry (dict): The scenario entry
+        """
+        self.template = entry["message"]
+        self.happiness_effect = entry.get("happiness_effect")
+        self.hunger_effect = entry.get("hunger_effect")
+        self.energy_effect = entry.get("energy_effect")
+        self.friendship = entry.get("friendship", False)
+
+    def fields(self, name, creature_type, other_name, other_type):
+        """
+        Returns the values of the placeholders of the message.
+
+        Args:
+            name (str): Name of the creature
+            creature_type (str): Type of the creature
+            other_name (str): Name of the creature met
+            other_type (str): Type of the creature met
+
+        Returns:
+            dict: Fields of the template
+        """
+        return {"emoji": TYPE_EMOJIS.get(creature_type.lower(), "🐾"), "name": name,
+                "other_emoji": TYPE_EMOJIS.get(other_type.lower(), "🐾"), "other_name": other_name}
+
+    def render(self, name, creature_type, other_name, other_type):
+        """
+        Renders the message of the scenario.
+
+        Args:
+            name (str): Name of the creature
+            creature_type (str): Type of the creature
+            other_name (str): Name of the creature met
+            other_type (str): Type of the creature met
+
+        Returns:
+            str: Description of the encounter
+        """
+        return self.template.format_map(self.fields(name, creature_type, other_name, other_type))
+
+
+_event_tables = {}
+_encounter_types = {}
+_encounter_scenarios = tuple(EncounterScenario(entry) for entry in ENCOUNTER_SCENARIOS)
+_encounter_sampler = AliasTable([entry.get("weight", 1) for entry in ENCOUNTER_SCENARIOS])
+_weather_events = tuple(MappingProxyType(dict(entry)) for entry in WEATHER_EVENTS)
+_weather_sampler = AliasTable([entry.get("weight", 1) for entry in WEATHER_EVENTS])
 
-def generate_random_event(creature):
+
+def get_event_table(creature_type):
+    """
+    Returns the compiled event table of a creature type (compiled on first use).
+
+    Args:
+        creature_type (str): Type of creature (case insensitive)
+
+    Returns:
+        EventTable: Events that can happen to this type of creature
+    """
+    key = creature_type.lower()
+    table = _event_tables.get(key)
+    if table is None:
+        table = EventTable(RANDOM_EVENTS + TYPE_SPECIFIC_EVENTS.get(key, []))
+        _event_tables[key] = table
+    return table
+
+
+def draw_event(creature, rng=random):
+    """
+    Draws a random event for a creature without applying it.
+
+    Args:
+        creature: The creature concerned
+        rng: Source of randomness (the random module by default)
+
+    Returns:
+        CompiledEvent: The drawn event
+    """
+    return get_event_table(creature.creature_type).draw(rng)
+
+
+def draw_events(creatures, rng=random):
+    """
+    Draws one random event for each creature of a population, without applying them.
+
+    Args:
+        creatures (list): Creatures (or objects with a creature_type attribute)
+        rng: Source of randomness
+
+    Returns:
+        list: One CompiledEvent per creature, in the same order
+    """
+    tables = {}
+    events = []
+    for creature in creatures:
+        table = tables.get(creature.creature_type)
+        if table is None:
+            table = tables[creature.creature_type] = get_event_table(creature.creature_type)
+        events.append(table.draw(rng))
+    return events
+
+
+def generate_random_event(creature, rng=random):
     """
     Generates a random event that affects the creature's state.
     
     Args:
         creature: The creature affected by the event
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         str: Description of the event that occurred
     """
-    events = [
-        {
-            "message": f"🧸 {creature.name} a trouvé un jouet !",
-            "effects": {"happiness": 10}
-        },
-        {
-            "message": f"😠 {creature.name} s'est disputé avec une autre créature.",
-            "effects": {"happiness": -5}
-        },
-        {
-            "message": f"🍽️ {creature.name} a mangé un bon repas.",
-            "effects": {"hunger": 10, "happiness": 5}
-        },
-        {
-            "message": f"🎨 {creature.name} a fait un dessin.",
-            "effects": {"happiness": 8}
-        },
-        {
-            "message": f"🌧️ Il pleut dehors, votre créature reste à l'intérieur.",
-            "effects": {"energy": 5, "happiness": -3}
-        },
-        {
-            "message": f"☀️ Le soleil brille, votre créature profite du beau temps.",
-            "effects": {"happiness": 7, "energy": -3}
-        },
-        {
-            "message": f"💤 {creature.name} a fait une sieste imprévue.",
-            "effects": {"energy": 15, "hunger": -5}
-        },
-        {
-            "message": f"😱 {creature.name} a eu peur d'un bruit fort.",
-            "effects": {"happiness": -8, "energy": -5}
-        },
-        {
-            "message": f"🍬 Un visiteur a donné une friandise à {creature.name}.",
-            "effects": {"hunger": 8, "happiness": 5}
-        },
-        {
-            "message": f"😣 {creature.name} a trébuché et s'est fait mal.",
-            "effects": {"happiness": -5, "energy": -10}
-        },
-        {
-            "message": f"🦠 {creature.name} a attrapé le covid-19.",
-            "effects": {"happiness": -10, "energy": -15, "health": -20}
-        },
-        {
-            "message": f"💦 {creature.name} a voulu apprendre à nager mais s'est noyé.",
-            "effects": {"happiness": -15, "energy": -20, "health": -30}
-        },
-        {
-            "message": f"🤢 {creature.name} a mal digéré un aliment.",
-            "effects": {"happiness": -5, "energy": -8, "health": -10}
-        },
-        {
-            "message": f"🎁 {creature.name} a reçu un cadeau inattendu.",
-            "effects": {"happiness": 15}
-        },
-    ]
-
-    # Specific event for each type of creature
-    if creature.creature_type.lower() == "chaton":
-        events.append({
-            "message": f"🐭 {creature.name} a chassé une souris imaginaire.",
-            "effects": {"happiness": 10, "energy": -8}
-        })
-    elif creature.creature_type.lower() == "chiot":
-        events.append({
-            "message": f"🦴 {creature.name} a enterré un trésor dans le jardin.",
-            "effects": {"happiness": 12, "energy": -10}
-        })
-    elif creature.creature_type.lower() == "dragon":
-        events.append({
-            "message": f"🔥 {creature.name} a craché une petite flamme.",
-            "effects": {"happiness": 15, "energy": -12}
-        })
-    elif creature.creature_type.lower() == "robot":
-        events.append({
-            "message": f"🔄 {creature.name} a reçu une mise à jour.",
-            "effects": {"energy": 20, "happiness": 8}
-        })
-    elif creature.creature_type.lower() == "lapin":
-        events.append({
-            "message": f"🥕 {creature.name} a grignoté une carotte.",
-            "effects": {"hunger": 15, "happiness": 8}
-        })
-    
-    # Select a random event
-    event = random.choice(events)
-    
-    # Apply the event effects to the creature
-    for attribute, value in event["effects"].items():
-        if hasattr(creature, attribute):
-            current_value = getattr(creature, attribute)
-            
-            # Ensure the value stays between 0 and 100
-            new_value = max(0, min(100, current_value + value))
-            setattr(creature, attribute, new_value)
-    
-    return event["message"]
+    event = draw_event(creature, rng)
+    event.apply(creature)
+    return event.render(creature.name)
 
 
-def generate_random_weather():
+def generate_random_weather(rng=random):
     """
     Generates a weather event that can influence the creature's mood.
     
+    Args:
+        rng: Random stream to draw from (the random module by default)
+    
     Returns:
-        dict: Information about the weather event
+        MappingProxyType: Information about the weather event (shared, read-only)
     """
-    weather_events = [
-        {"type": "soleil", "message": "Il fait beau aujourd'hui !", "happiness_effect": 5},
-        {"type": "pluie", "message": "Il pleut aujourd'hui.", "happiness_effect": -3},
-        {"type": "neige", "message": "Il neige aujourd'hui !", "happiness_effect": 2},
-        {"type": "orage", "message": "Il y a un orage aujourd'hui.", "happiness_effect": -8},
-        {"type": "brouillard", "message": "Il y a du brouillard aujourd'hui.", "happiness_effect": -2},
-        {"type": "vent", "message": "Il y a du vent aujourd'hui.", "happiness_effect": -1},
-        {"type": "canicule", "message": "Il fait très chaud aujourd'hui !", "happiness_effect": -10}
-    ]
-    
-    return random.choice(weather_events)
+    return _weather_events[_weather_sampler.sample(rng)]
 
 
-def generate_encounter(creature):
+def draw_encounter(creature_type, rng=random):
+    """
+    Draws the type of the creature met and the scenario of an encounter.
+
+    Args:
+        creature_type (str): Type of the creature having the encounter
+        rng: Source of randomness
+
+    Returns:
+        tuple: Type of the other creature and EncounterScenario
+    """
+    key = creature_type.lower()
+    other_types = _encounter_types.get(key)
+    if other_types is None:
+        other_types = _encounter_types[key] = [other for other in ENCOUNTER_TYPES if other != key]
+    return rng.choice(other_types), _encounter_scenarios[_encounter_sampler.sample(rng)]
+
+
+def generate_encounter(creature, other_name=None, other_type=None, rng=random):
     """
     Generates an encounter with another creature.
     
     Args:
         creature: The creature having the encounter
+        other_name (str): Name of the creature met (random if not given)
+        other_type (str): Type of the creature met (random if not given)
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         dict: Information about the encounter
     """
-    creature_types = ["chaton", "chiot", "dragon", "robot", "lapin", "hamster", "oiseau", "poisson"]
-    creature_types.remove(creature.creature_type.lower()) if creature.creature_type.lower() in creature_types else None
-    
-    other_type = random.choice(creature_types)
-    other_name = f"{other_type.capitalize()}-{random.randint(1, 100)}"
+    random_type, scenario = draw_encounter(creature.creature_type, rng)
+    other_type = other_type or random_type
+    if not other_name:
+        other_name = f"{other_type.capitalize()}-{rng.randint(1, 100)}"
     
-    # Emoji mapping for creature types
-    type_emojis = {
-        "chaton": "🐱",
-        "chiot": "🐶",
-        "dragon": "🐉",
-        "robot": "🤖",
-        "lapin": "🐰",
-        "hamster": "🐹",
-        "oiseau": "🐦",
-        "poisson": "🐠"
+    result = {
+        "message": scenario.render(creature.name, creature.creature_type, other_name, other_type),
+        "happiness_effect": scenario.happiness_effect,
+        "friendship": scenario.friendship
     }
-    
-    creature_emoji = type_emojis.get(creature.creature_type.lower(), "🐾")
-    other_emoji = type_emojis.get(other_type.lower(), "🐾")
-    
-    scenarios = [
-        {
-            "message": f"👫 {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} et ils sont devenus amis.",
-            "happiness_effect": 15
-        },
-        {
-            "message": f"😠 {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} mais ils ne se sont pas entendus.",
-            "happiness_effect": -5
-        },
-        {
-            "message": f"🍽️ {creature_emoji} {creature.name} a partagé sa nourriture avec {other_emoji} {other_name}.",
-            "happiness_effect": 8,
-            "hunger_effect": -10
-        },
-        {
-            "message": f"🎮 {other_emoji} {other_name} a appris un nouveau jeu à {creature_emoji} {creature.name}.",
-            "happiness_effect": 12
-        },
-        {
-            "message": f"👻 {other_emoji} {other_name} a effrayé {creature_emoji} {creature.name} avec une farce.",
-            "happiness_effect": -8
-        },
-        {
-            "message": f"🧭 {creature_emoji} {creature.name} a aidé {other_emoji} {other_name} à retrouver son chemin.",
-            "happiness_effect": 10
-        },
-        {
-            "message": f"😠 {other_emoji} {other_name} a volé un jouet à {creature_emoji} {creature.name}.",
-            "happiness_effect": -5
-        },
-        {
-            "message": f"🎯 {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} et ils ont joué ensemble.",
-            "happiness_effect": 10
-        },
-        {
-            "message": f"🍽️ {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} et ils ont partagé un repas.",
-            "happiness_effect": 12,
-            "hunger_effect": 10
-        },
-        {
-            "message": f"💤 {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} et ils ont fait une sieste ensemble.",
-            "happiness_effect": 8,
-            "energy_effect": 10
-        },
-        {
-            "message": f"🎨 {creature_emoji} {creature.name} a rencontré {other_emoji} {other_name} et ils ont dessiné ensemble.",
-            "happiness_effect": 10
-        }
-    ]
-    
-    scenario = random.choice(scenarios)
-    return scenario
\ No newline at end of file
+    if scenario.hunger_effect is not None:
+        result["hunger_effect"] = scenario.hunger_effect
+    if scenario.energy_effect is not None:
+        result["energy_effect"] = scenario.energy_effect
+    return result
@@ -0,0 +1,369 @@
+"""
+Monte Carlo forecaster of the survival and wellbeing of a creature.
+
+A forecast rolls out many possible futures of one creature at once: the
+rollouts are the rows of a CreaturePopulation, so they follow the rules
+of models.population, which mirror Creature.pass_time, the sickness and
+random event rolls and Creature._update_state. Every step of the
+horizon is one batched pass_time, the weather of the game days that
+start (when a calendar is given) and the care given by a CarePolicy.
+
+Rollout i draws from its own streams, derived from the creature's
+streams and i, so a forecast is reproducible and its result is the same
+whatever the number of worker processes sharing the rollouts. Workers
+only send back sums per step, merged by ForecastResult.merge.
+
+Usage:
+    python -m game.forecast sauvegarde.json --hours 72 --rollouts 100000 --policy feed=30,heal
+"""
+
+import argparse
+import math
+import multiprocessing
+
+import numpy as np
+
+from game.world import CRITICAL_THRESHOLD
+from models.population import CreaturePopulation, stream_values
+from utils.clock import HOURS_PER_DAY, SECONDS_PER_HOUR
+from utils.rng import derive_key
+
+# Stats whose trajectories are forecast
+FORECAST_STATS = ("hunger", "energy", "happiness", "health")
+
+# Quantile of the normal distribution for 95% confidence intervals
+Z_95 = 1.959963984540054
+
+
+class CarePolicy:
+    """Care given to the creature during a forecast, like a player checking on it at every step."""
+
+    def __init__(self, feed_below=None, food="standard", heal=False):
+        """
+        Initializes the policy.
+
+        Args:
+            feed_below (float): Feed the creature when its hunger is below this value (never if None)
+            food (str): Food given ("standard", "premium" or "malsaine")
+            heal (bool): Heal the creature as soon as it is sick
+        """
+        self.feed_below = feed_below
+        self.food = food
+        self.heal = heal
+
+    def __repr__(self):
+        return f"CarePolicy(feed_below={self.feed_below!r}, food={self.food!r}, heal={self.heal!r})"
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Builds a policy from its command line form, e.g. "feed=30:premium,heal" or "none".
+
+        Args:
+            text (str): Comma-separated rules
+
+        Returns:
+            CarePolicy: The policy
+
+        Raises:
+            ValueError: If a rule is not understood
+        """
+        policy = cls()
+        for rule in filter(None, (part.strip() for part in text.split(","))):
+            name, _, value = rule.partition("=")
+            if name == "none":
+                continue
+            if name == "heal":
+                policy.heal = True
+            elif name == "feed" and value:
+                threshold, _, food = value.partition(":")
+                policy.feed_below = float(threshold)
+                policy.food = food or "standard"
+            else:
+                raise ValueError(f"Règle de soin inconnue : {rule}")
+        return policy
+
+    def apply(self, population):
+        """
+        Gives the care of one step to every living rollout.
+
+        Args:
+            population (CreaturePopulation): The rollouts
+        """
+        if self.heal:
+            population.heal(np.flatnonzero(population.alive & population.is_sick))
+        if self.feed_below is not None:
+            population.feed(np.flatnonzero(population.alive & (population.hunger < self.feed_below)), self.food)
+
+
+class ForecastResult:
+    """Sums per step of a set of rollouts, and the probabilities and trajectories derived from them."""
+
+    def __init__(self, hours, rollouts=0):
+        """
+        Initializes an empty result.
+
+        Args:
+            hours (ndarray): Game hours from now at the end of every step
+            rollouts (int): Number of rollouts summed
+        """
+        steps = len(hours)
+        self.hours = hours
+        self.rollouts = rollouts
+        self.deaths = np.zeros(steps, dtype=np.int64)  # Rollouts dead by the end of the step
+        self.critical = np.zeros(steps, dtype=np.int64)  # Rollouts that were critical at least once
+        self.alive = np.zeros(steps, dtype=np.int64)
+        self.sums = np.zeros((len(FORECAST_STATS), steps))  # Over the living rollouts
+        self.squares = np.zeros((len(FORECAST_STATS), steps))
+
+    def merge(self, other):
+        """
+        Adds the rollouts of another result over the same steps.
+
+        Args:
+            other (ForecastResult): Result of other rollouts
+
+        Returns:
+            ForecastResult: This result
+        """
+        self.rollouts += other.rollouts
+        self.deaths += other.deaths
+        self.critical += other.critical
+        self.alive += other.alive
+        self.sums += other.sums
+        self.squares += other.squares
+        return self
+
+    def death_probability(self):
+        """
+        Returns the probability that the creature is dead at the end of every step, with its 95% interval.
+
+        Returns:
+            tuple: Probabilities, lower bounds and upper bounds (ndarrays)
+        """
+        return _wilson(self.deaths, self.rollouts)
+
+    def critical_probability(self):
+        """
+        Returns the probability that the creature has been critical by the end of every step, with its 95% interval.
+
+        Returns:
+            tuple: Probabilities, lower bounds and upper bounds (ndarrays)
+        """
+        return _wilson(self.critical, self.rollouts)
+
+    def trajectory(self, stat):
+        """
+        Returns the expected value of a stat of the living creature at every step, with its 95% interval.
+
+        Args:
+            stat (str): One of FORECAST_STATS
+
+        Returns:
+            tuple: Means, lower bounds and upper bounds (ndarrays, NaN once every rollout died)
+        """
+        index = FORECAST_STATS.index(stat)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            count = self.alive.astype(np.float64)
+            mean = self.sums[index] / count
+            variance = np.maximum(0, self.squares[index] / count - mean ** 2)
+            margin = Z_95 * np.sqrt(variance / count)
+        return mean, mean - margin, mean + margin
+
+    def summary(self):
+        """
+        Summarizes the forecast at the end of the horizon.
+
+        Returns:
+            dict: Rollouts, horizon and, with their 95% intervals, the probabilities
+                  of death and of a critical state and the expected stats
+        """
+        last = len(self.hours) - 1
+        death, death_low, death_high = self.death_probability()
+        critical, critical_low, critical_high = self.critical_probability()
+        summary = {
+            "rollouts": self.rollouts,
+            "hours": float(self.hours[last]),
+            "death": (float(death[last]), float(death_low[last]), float(death_high[last])),
+            "critical": (float(critical[last]), float(critical_low[last]), float(critical_high[last])),
+        }
+        for stat in FORECAST_STATS:
+            mean, low, high = self.trajectory(stat)
+            summary[stat] = (float(mean[last]), float(low[last]), float(high[last]))
+        return summary
+
+
+def _wilson(successes, trials):
+    """
+    Returns proportions with their 95% Wilson score intervals.
+
+    Args:
+        successes (ndarray): Number of successes of every step
+        trials (int): Number of trials
+
+    Returns:
+        tuple: Proportions, lower bounds and upper bounds (ndarrays)
+    """
+    proportion = successes / trials
+    denominator = 1 + Z_95 ** 2 / trials
+    center = (proportion + Z_95 ** 2 / (2 * trials)) / denominator
+    margin = Z_95 * np.sqrt(proportion * (1 - proportion) / trials + Z_95 ** 2 / (4 * trials ** 2)) / denominator
+    return proportion, np.maximum(0, center - margin), np.minimum(1, center + margin)
+
+
+def _rollout_keys(stream, first, count):
+    """
+    Derives the keys of the streams of a range of rollouts from a creature's stream.
+
+    Args:
+        stream (RngStream): Sub-stream of the creature ("sickness" or "events")
+        first (int): Index of the first rollout
+        count (int): Number of rollouts
+
+    Returns:
+        ndarray: uint64 keys, one per rollout
+    """
+    # The position of the stream is part of the key: a later forecast draws other futures
+    base = np.full(count, derive_key(stream.key, "forecast", stream.counter), dtype=np.uint64)
+    return stream_values(base, np.arange(first, first + count, dtype=np.uint64))
+
+
+def _run(creature, first, count, steps, step_hours, policy, weather_effects, start_hour):
+    """
+    Rolls out a range of futures of a creature.
+
+    Args:
+        creature (Creature): The creature
+        first (int): Index of the first rollout
+        count (int): Number of rollouts
+        steps (int): Number of steps
+        step_hours (float): Game hours per step
+        policy (CarePolicy): Care given at every step (None for no care)
+        weather_effects (dict): Happiness effect of every game day starting during the forecast
+        start_hour (float): Game hour of the start of the forecast
+
+    Returns:
+        ForecastResult: Sums of the rollouts
+    """
+    population = CreaturePopulation.replicate(creature, count)
+    population.sickness_keys[:] = _rollout_keys(creature.rng.child("sickness"), first, count)
+    population.sickness_counters[:] = 0
+    population.event_keys[:] = _rollout_keys(creature.rng.child("events"), first, count)
+    population.event_counters[:] = 0
+
+    result = ForecastResult(np.arange(1, steps + 1) * step_hours, count)
+    ever_critical = np.zeros(count, dtype=bool)
+    columns = [getattr(population, stat) for stat in FORECAST_STATS]
+    day = int(start_hour // HOURS_PER_DAY)
+
+    for step in range(steps):
+        population.pass_time(step_hours)
+
+        # A new game day brings its weather, as at the first action of the day in Game
+        new_day = int((start_hour + (step + 1) * step_hours) // HOURS_PER_DAY)
+        if new_day != day:
+            day = new_day
+            alive = population.alive
+            population.happiness[alive] = np.clip(population.happiness[alive] + weather_effects[day], 0, 100)
+
+        alive = population.alive
+        ever_critical |= alive & ((population.hunger < CRITICAL_THRESHOLD)
+                                  | (population.energy < CRITICAL_THRESHOLD)
+                                  | (population.happiness < CRITICAL_THRESHOLD)
+                                  | (population.health < CRITICAL_THRESHOLD)
+                                  | population.is_sick)
+        if policy is not None:
+            policy.apply(population)
+
+        alive = population.alive
+        living = int(alive.sum())
+        result.alive[step] = living
+        result.deaths[step] = count - living
+        result.critical[step] = int((ever_critical | ~alive).sum())  # a dead creature went through a critical state
+        for index, column in enumerate(columns):
+            values = column[alive]
+            result.sums[index, step] = values.sum()
+            result.squares[index, step] = np.dot(values, values)
+
+    return result
+
+
+def forecast(creature, hours, rollouts=100_000, policy=None, step_hours=1, calendar=None, now=0.0,
+             workers=0, chunk_size=100_000):
+    """
+    Forecasts the survival and the stats of a creature over the next hours.
+
+    Args:
+        creature (Creature): The creature (left unchanged)
+        hours (float): Horizon in game hours
+        rollouts (int): Number of simulated futures
+        policy (CarePolicy): Care given at every step (no care by default)
+        step_hours (float): Game hours per step
+        calendar (WeatherCalendar): Weather of the world (no weather effect if None)
+        now (float): Game time of the start of the forecast in seconds (for the weather days)
+        workers (int): Number of worker processes (0 to roll out in the current process)
+        chunk_size (int): Maximal number of rollouts simulated at once (bounds the memory)
+
+    Returns:
+        ForecastResult: Probabilities and trajectories of the forecast
+    """
+    steps = max(1, math.ceil(hours / step_hours))
+    start_hour = now / SECONDS_PER_HOUR
+    first_day = int(start_hour // HOURS_PER_DAY)
+    last_day = int((start_hour + steps * step_hours) // HOURS_PER_DAY)
+    if calendar is not None:
+        weather_effects = dict(zip(range(first_day, last_day + 1), calendar.happiness_effects(first_day, last_day)))
+    else:
+        weather_effects = dict.fromkeys(range(first_day, last_day + 1), 0)
+
+    # The rollouts are cut into the same chunks whatever the number of workers
+    chunks = [(creature, first, min(chunk_size, rollouts - first), steps, step_hours, policy, weather_effects,
+               start_hour) for first in range(0, rollouts, chunk_size)]
+    if workers:
+        with multiprocessing.Pool(min(workers, len(chunks))) as pool:
+            results = pool.starmap(_run, chunks)
+    else:
+        results = [_run(*chunk) for chunk in chunks]
+
+    total = ForecastResult(results[0].hours)
+    for result in results:
+        total.merge(result)
+    return total
+
+
+def main():
+    """
+    Forecasts a saved creature and prints the probabilities and the expected stats.
+    """
+    from models.creature import Creature
+
+    parser = argparse.ArgumentParser(description="Prévision Monte-Carlo de la survie d'une créature sauvegardée")
+    parser.add_argument("filename", help="fichier de sauvegarde de la créature")
+    parser.add_argument("--hours", type=float, default=72, help="horizon de la prévision, en heures de jeu")
+    parser.add_argument("--rollouts", type=int, default=100_000, help="nombre de futurs simulés")
+    parser.add_argument("--policy", default="none",
+                        help='soins donnés à chaque heure, par exemple "feed=30:premium,heal" (aucun par défaut)')
+    parser.add_argument("--workers", type=int, default=0, help="nombre de processus (0 : processus courant)")
+    args = parser.parse_args()
+
+    creature = Creature.load(args.filename)
+    if creature is None:
+        parser.error(f"Impossible de charger la créature depuis {args.filename}.")
+    try:
+        policy = CarePolicy.parse(args.policy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    result = forecast(creature, args.hours, args.rollouts, policy, workers=args.workers)
+    summary = result.summary()
+    print(f"{creature.name} : {summary['rollouts']} futurs simulés sur {summary['hours']:g} heures")
+    for label, key in (("Décès", "death"), ("État critique", "critical")):
+        value, low, high = summary[key]
+        print(f"  {label:<14}: {value:7.2%}  (IC 95 % : {low:.2%} - {high:.2%})")
+    for label, key in (("Faim", "hunger"), ("Énergie", "energy"), ("Bonheur", "happiness"), ("Santé", "health")):
+        value, low, high = summary[key]
+        print(f"  {label:<14}: {value:7.2f}  (IC 95 % : {low:.2f} - {high:.2f})")
+
+
+if __name__ == "__main__":
+    main()
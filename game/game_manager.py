@@ -3,89 +3,590 @@ Game management module, containing the main class that orchestrates all function
 """
 
 import time
-import random
+from game.actions import ACTIONS, DEFAULT_DEATH_MESSAGE, Reply
+from game.metrics import Metrics, PhaseTimer
+from game.weather import WeatherCalendar
+from models import rules
 from models.creature import Creature
+from models.result import ActionResult, Status
+from utils.clock import SECONDS_PER_HOUR, ManualClock, RealClock
+from utils.event_bus import CRITICAL, DIED, WEATHER_CHANGED, bus
+from utils.rng import RngStream
+
+# Beyond this gap (in hours), elapsed time is simulated event by event
+CATCH_UP_THRESHOLD = 1
+
+
+class CreatureRecord:
+    """Game-side state of one creature: the creature itself and what the game tracks about it."""
+    
+    __slots__ = ("creature_id", "creature", "owner", "last_action", "current_weather", "last_weather_update",
+                 "alert")
+    
+    def __init__(self, creature, owner=None, last_action=0.0):
+        """
+        Initializes the record.
+        
+        Args:
+            creature (Creature): The creature (its creature_id must be set)
+            owner: Owner of the creature (None for a single-player game)
+            last_action (float): Game time of the last action in seconds
+        """
+        self.creature_id = creature.creature_id
+        self.creature = creature
+        self.owner = owner
+        self.last_action = last_action
+        self.current_weather = None
+        self.last_weather_update = None  # Game day of the current weather
+        self.alert = None  # Last critical alert published (only tracked while "critical" is listened to)
+
+
+class GameSnapshot:
+    """Frozen state of a game, returned by Game.snapshot."""
+    
+    __slots__ = ("now", "next_creature_id", "active_id", "records")
+    
+    def __init__(self, now, next_creature_id, active_id, records):
+        """
+        Initializes the snapshot.
+        
+        Args:
+            now (float): Game time of the snapshot in seconds
+            next_creature_id (int): Next id the game would assign
+            active_id: Id of the active creature (None if there was none)
+            records (tuple): One (CreatureSnapshot, owner, last_action, current_weather,
+                             last_weather_update, alert) tuple per creature
+        """
+        self.now = now
+        self.next_creature_id = next_creature_id
+        self.active_id = active_id
+        self.records = records
+
+
+def _index_add(index, key, creature_id):
+    """
+    Adds an id to a secondary index.
+    
+    A key held by a single creature (the common case for names and owners)
+    maps directly to its id; a set is only allocated for shared keys.
+    
+    Args:
+        index (dict): Index to update
+        key: Indexed value
+        creature_id: Id of the creature
+    """
+    ids = index.get(key)
+    if ids is None:
+        index[key] = creature_id
+    elif isinstance(ids, set):
+        ids.add(creature_id)
+    else:
+        index[key] = {ids, creature_id}
+
+
+def _index_remove(index, key, creature_id):
+    """
+    Removes an id from a secondary index.
+    
+    Args:
+        index (dict): Index to update
+        key: Indexed value
+        creature_id: Id of the creature
+    """
+    ids = index.get(key)
+    if isinstance(ids, set):
+        ids.discard(creature_id)
+        if len(ids) == 1:
+            index[key] = ids.pop()
+    elif ids == creature_id:
+        del index[key]
+
+
+def _index_get(index, key):
+    """
+    Reads a secondary index.
+    
+    Args:
+        index (dict): Index to read
+        key: Indexed value
+        
+    Returns:
+        list: Ids of the creatures with this value, sorted
+    """
+    ids = index.get(key)
+    if ids is None:
+        return []
+    if isinstance(ids, set):
+        return sorted(ids)
+    return [ids]
+
+
+class CreatureRegistry:
+    """
+    Creatures of a game, stored by id and indexed by owner, name and type.
+    
+    Every lookup is a dictionary access. Memory budget per resident
+    creature: about 280 bytes for the registry (record, id entry and the
+    three index entries) plus about 540 bytes for a newborn Creature and its
+    random stream, so roughly 800 MiB per million creatures (measured by
+    benchmarks/bench_registry.py).
+    """
+    
+    def __init__(self):
+        self._records = {}
+        self._by_owner = {}
+        self._by_name = {}
+        self._by_type = {}
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __contains__(self, creature_id):
+        return creature_id in self._records
+    
+    def __iter__(self):
+        return iter(self._records.values())
+    
+    def add(self, record):
+        """
+        Adds a creature record.
+        
+        Args:
+            record (CreatureRecord): Record to add
+            
+        Raises:
+            ValueError: If a creature with the same id is already registered
+        """
+        creature_id = record.creature_id
+        if creature_id in self._records:
+            raise ValueError(f"Creature id {creature_id} is already registered")
+        self._records[creature_id] = record
+        _index_add(self._by_owner, record.owner, creature_id)
+        _index_add(self._by_name, record.creature.name, creature_id)
+        _index_add(self._by_type, record.creature.creature_type.lower(), creature_id)
+    
+    def remove(self, creature_id):
+        """
+        Removes a creature.
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            CreatureRecord or None: The removed record, None if the id is unknown
+        """
+        record = self._records.pop(creature_id, None)
+        if record is not None:
+            _index_remove(self._by_owner, record.owner, creature_id)
+            _index_remove(self._by_name, record.creature.name, creature_id)
+            _index_remove(self._by_type, record.creature.creature_type.lower(), creature_id)
+        return record
+    
+    def get(self, creature_id):
+        """
+        Returns the record of a creature.
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            CreatureRecord or None: The record, None if the id is unknown
+        """
+        return self._records.get(creature_id)
+    
+    def by_owner(self, owner):
+        """
+        Returns the ids of the creatures of an owner.
+        
+        Args:
+            owner: Owner of the creatures
+            
+        Returns:
+            list: Sorted ids
+        """
+        return _index_get(self._by_owner, owner)
+    
+    def by_name(self, name):
+        """
+        Returns the ids of the creatures with a name.
+        
+        Args:
+            name (str): Name of the creatures
+            
+        Returns:
+            list: Sorted ids
+        """
+        return _index_get(self._by_name, name)
+    
+    def by_type(self, creature_type):
+        """
+        Returns the ids of the creatures of a type.
+        
+        Args:
+            creature_type (str): Type of the creatures (case insensitive)
+            
+        Returns:
+            list: Sorted ids
+        """
+        return _index_get(self._by_type, creature_type.lower())
+
 
 class Game:
     """Class managing the game and its interactions."""
     
-    def __init__(self):
+    def __init__(self, seed=None, clock=None, metrics=None, calendar=None):
         """
         Initializes the game with its basic parameters.
+        
+        Args:
+            seed (int): Root seed of every random stream of the game (None for a non reproducible game)
+            clock (callable): Clock returning the current game time in seconds (real time by default,
+                              see utils.clock for the scaled, manual and fixed-step clocks)
+            metrics (Metrics): Registry recording the timings of the actions (disabled by default)
+            calendar (WeatherCalendar): Weather of the world, to share it between games
+                                        (a calendar derived from the seed by default)
         """
+        self.seed = seed
+        self.clock = clock if clock is not None else RealClock()
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self._timer = None
+        self.calendar = calendar if calendar is not None else WeatherCalendar(seed)
+        self.next_creature_id = 1
+        self.available_types = list(rules.CREATURE_TYPES)
+        
+        # Every creature of the game; actions apply to the active one
+        self.registry = CreatureRegistry()
+        self._active = None
         self.creature = None
-        self.available_types = ["chaton", "chiot", "dragon", "robot", "lapin"]
-        self.last_action = time.time()
-
-        # Add an attribute to store the current weather and the last update
-        self.current_weather = None
-        self.last_weather_update = -1  # Initialized to -1 to force update at startup
+        
+        # Active records to make active again after the actions on other creatures in progress (see do_action)
+        self._resume = []
+        
+        # Optional ThresholdScheduler (game.scheduler), told about every action
+        self.scheduler = None
+        
+        # Optional Journal (game.journal), recording every change of the game
+        self.journal = None
+    
+    @property
+    def active_id(self):
+        """Id of the active creature (None if there is none)."""
+        return self._active.creature_id if self._active else None
+    
+    @property
+    def selected_id(self):
+        """Id of the creature active once the actions in progress on other creatures are over (None if none)."""
+        record = self._resume[0] if self._resume else self._active
+        return record.creature_id if record is not None and record.creature_id in self.registry else None
+    
+    @property
+    def last_action(self):
+        """Game time of the last action of the active creature."""
+        return self._active.last_action if self._active else None
+    
+    @last_action.setter
+    def last_action(self, value):
+        self._active.last_action = value
+    
+    @property
+    def current_weather(self):
+        """Current weather of the active creature."""
+        return self._active.current_weather if self._active else None
+    
+    @current_weather.setter
+    def current_weather(self, value):
+        self._active.current_weather = value
+    
+    @property
+    def last_weather_update(self):
+        """Game day of the current weather of the active creature."""
+        return self._active.last_weather_update if self._active else None
+    
+    @last_weather_update.setter
+    def last_weather_update(self, value):
+        self._active.last_weather_update = value
     
-    def create_creature(self, name, creature_type, color="standard", character_trait="normal"):
+    def _activate(self, record):
         """
-        Creates a new creature with the specified name and type.
+        Makes a creature the target of the actions.
+        
+        Args:
+            record (CreatureRecord): Record of the creature (None for no creature)
+        """
+        self._active = record
+        self.creature = record.creature if record else None
+    
+    def select_creature(self, creature_id):
+        """
+        Makes a registered creature the target of the following actions.
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            bool: True if the creature exists
+        """
+        record = self.registry.get(creature_id)
+        if record is None:
+            return False
+        self._activate(record)
+        if self.journal is not None:
+            self.journal.record_select(creature_id)
+        return True
+    
+    def deactivate(self):
+        """
+        Leaves the game without an active creature (the creatures stay registered).
+        """
+        self._activate(None)
+        if self.journal is not None:
+            self.journal.record_select(None)
+    
+    def add_creature(self, creature, owner=None, last_action=None, weather_day=None, activate=True, renumber=False):
+        """
+        Registers an existing creature and makes it the active one.
+        
+        Args:
+            creature (Creature): The creature (an id and a stream are assigned if it has none)
+            owner: Owner of the creature
+            last_action (float): Game time of its last action (now by default)
+            weather_day (int): Game day of its current weather (none by default: the
+                               weather of the day is applied at its next action)
+            activate (bool): False to leave the active creature unchanged
+            renumber (bool): True to give the creature a new id if its id is already taken
+                             (it keeps its random stream), instead of failing
+            
+        Returns:
+            int: Id of the creature
+        """
+        if creature.creature_id is None:
+            creature.creature_id = self._new_creature_id()
+            creature.rng = self.creature_stream(creature.creature_id)
+        elif renumber and creature.creature_id in self.registry:
+            creature.creature_id = self._new_creature_id()
+        elif isinstance(creature.creature_id, int):
+            self.next_creature_id = max(self.next_creature_id, creature.creature_id + 1)
+        record = CreatureRecord(creature, owner, self.clock() if last_action is None else last_action)
+        if weather_day is not None:
+            record.last_weather_update = weather_day
+            record.current_weather = self.calendar.weather_for_day(weather_day)
+        self.registry.add(record)
+        if activate:
+            self._activate(record)
+        if self.scheduler is not None:
+            self.scheduler.schedule(record)
+        if self.journal is not None:
+            self.journal.record_add(record, activate)
+        return creature.creature_id
+    
+    def remove_creature(self, creature_id):
+        """
+        Removes a creature from the game.
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            Creature or None: The removed creature, None if the id is unknown
+        """
+        record = self._unregister(creature_id)
+        if record is None:
+            return None
+        if self.journal is not None:
+            self.journal.record_remove(creature_id)
+        return record.creature
+    
+    def _unregister(self, creature_id):
+        """
+        Removes a creature from the registry (body of remove_creature, also used when it dies).
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            CreatureRecord or None: Its record, None if the id is unknown
+        """
+        record = self.registry.remove(creature_id)
+        if record is not None and record is self._active:
+            self._activate(None)
+        return record
+    
+    def create_creature(self, name, creature_type, color="standard", character_trait="normal", owner=None):
+        """
+        Creates a new creature with the specified name and type, and makes it the active one.
         
         Args:
             name (str): Name of the creature
             creature_type (str): Type of creature to create
             color (str): Color of the creature
             character_trait (str): Dominant character trait
+            owner: Owner of the creature (None for a single-player game)
             
         Returns:
-            str: Confirmation or error message
+            ActionResult: Confirmation or error message (FAILED for an unknown type)
         """
         if creature_type.lower() not in map(str.lower, self.available_types):
-            return f"Type de créature invalide. Types disponibles : {', '.join(self.available_types)}."
+            return ActionResult(Status.FAILED, "Type de créature invalide. Types disponibles : {types}.",
+                                {"types": ", ".join(self.available_types)})
         
-        self.creature = Creature(name, creature_type, color, character_trait)
-        self.last_action = time.time()
+        creature_id = self._new_creature_id()
+        self.add_creature(Creature(name, creature_type, color, character_trait,
+                                   creature_id=creature_id, rng=self.creature_stream(creature_id)), owner)
         
         # Initialize weather when a creature is created
-        weather = self.update_weather(force=True)
+        weather = self._initialize_weather()
         
-        return f"{name} le {creature_type} {color} de nature {character_trait} a été créé !\n{weather['message']}"
+        return ActionResult(Status.OK, "{name} le {creature_type} {color} de nature {character_trait} a été créé !",
+                            {"name": name, "creature_type": creature_type, "color": color,
+                             "character_trait": character_trait},
+                            parts=(self._weather_result(weather),), value=self.active_id)
     
-    def load_creature(self, filename="sauvegarde.json"):
+    def load_creature(self, filename="sauvegarde.json", owner=None):
         """
-        Loads a creature from a save file.
+        Loads a creature from a save file and makes it the active one.
         
         Args:
             filename (str): Path to the save file
+            owner: Owner of the creature (None for a single-player game)
             
         Returns:
-            str: Confirmation or error message
+            ActionResult: Confirmation or error message (FAILED if the file could not be loaded)
         """
         creature = Creature.load(filename)
         if creature:
-            self.creature = creature
-            self.last_action = time.time()
+            # Saves made without an id get a fresh id and stream; loading a
+            # creature that the owner already has in the game replaces it, and
+            # a creature whose id belongs to another owner gets a new id
+            existing = self.registry.get(creature.creature_id)
+            if existing is not None and existing.owner == owner:
+                self.remove_creature(creature.creature_id)
+            self.add_creature(creature, owner, renumber=True)
             
             # Initialize weather when a creature is loaded
-            weather = self.update_weather(force=True)
+            weather = self._initialize_weather()
+            
+            return ActionResult(Status.OK, "{name} a été chargé !", {"name": creature.name},
+                                parts=(self._weather_result(weather),), value=creature.creature_id)
+        return ActionResult(Status.FAILED, "Impossible de charger la créature.")
+    
+    def snapshot(self):
+        """
+        Captures the state of the game: its creatures, their weather and the game time.
+        
+        The creatures are captured with Creature.snapshot (copy-on-write) and
+        the weather of the days is shared: it comes from the calendar, which is
+        the same for every branch of a game.
+        
+        Returns:
+            GameSnapshot: The state of the game
+        """
+        records = tuple((record.creature.snapshot(), record.owner, record.last_action, record.current_weather,
+                         record.last_weather_update, record.alert) for record in self.registry)
+        return GameSnapshot(self.clock(), self.next_creature_id, self.active_id, records)
+    
+    def restore(self, snapshot):
+        """
+        Puts the game back in the state of a snapshot (which can be restored again later).
+        
+        The creatures still in the game are restored in place, those that
+        died or were removed meanwhile come back, and those created since are
+        removed. A manual clock is set back to the time of the snapshot.
+        
+        Args:
+            snapshot (GameSnapshot): State returned by snapshot
+        """
+        previous = self.registry
+        self.registry = CreatureRegistry()
+        for creature_snapshot, owner, last_action, current_weather, last_weather_update, alert in snapshot.records:
+            old = previous.get(creature_snapshot.creature_id)
+            if old is not None:
+                creature = old.creature
+                creature.restore(creature_snapshot)
+            else:
+                creature = Creature.from_snapshot(creature_snapshot)
+            record = CreatureRecord(creature, owner, last_action)
+            record.current_weather = current_weather
+            record.last_weather_update = last_weather_update
+            record.alert = alert
+            self.registry.add(record)
+            if self.scheduler is not None:
+                self.scheduler.schedule(record)
+        
+        self.next_creature_id = snapshot.next_creature_id
+        if isinstance(self.clock, ManualClock):
+            self.clock.now = snapshot.now
+        self._activate(self.registry.get(snapshot.active_id) if snapshot.active_id is not None else None)
+        
+        # The journal cannot describe the jump: it starts again from a snapshot of the restored game
+        if self.journal is not None:
+            self.journal.checkpoint()
+    
+    def fork(self, clock=None):
+        """
+        Returns an independent copy of the game, for a what-if simulation.
+        
+        The copy shares the calendar of the game (so the same weather) and
+        starts with the same creatures, whose random streams are at the same
+        position. Metrics and the scheduler are not copied.
+        
+        Args:
+            clock (callable): Clock of the copy (a manual clock frozen at the current game time by default)
             
-            return f"{creature.name} a été chargé !\n{weather['message']}"
-        return "Impossible de charger la créature."
+        Returns:
+            Game: The copy
+        """
+        branch = Game(self.seed, clock if clock is not None else ManualClock(self.clock()), calendar=self.calendar)
+        branch.available_types = self.available_types
+        branch.restore(self.snapshot())
+        return branch
     
-    def update_weather(self, force=False):
+    def _new_creature_id(self):
         """
-        Updates the weather if a day has passed or if forced.
+        Returns a new creature id, unique within this game.
+        
+        Returns:
+            int: The new id
+        """
+        creature_id = self.next_creature_id
+        self.next_creature_id += 1
+        return creature_id
+    
+    def creature_stream(self, creature_id):
+        """
+        Returns the random stream of a creature, derived from the root seed and its id.
+        
+        Args:
+            creature_id: Id of the creature
+            
+        Returns:
+            RngStream: Stream of the creature
+        """
+        return RngStream(self.seed, "creature", creature_id)
+    
+    def update_weather(self, force=False, now=None):
+        """
+        Updates the weather of the active creature if a game day has passed or if forced.
+        
+        The weather of a day comes from the calendar of the game, so it is
+        the same for every creature of the world.
         
         Args:
             force (bool): If True, updates the weather regardless of time passed
+            now (float): Game time in seconds (read from the clock if not given)
             
         Returns:
-            dict or None: The new weather if updated, None otherwise
+            MappingProxyType or None: The new weather if updated, None otherwise
         """
         if not self.creature:
             return None
             
-        current_day = int(self.creature.age)
+        current_day = self.calendar.day_of(self.clock() if now is None else now)
         
         # Update weather if a day has passed or if forced
-        if force or current_day > self.last_weather_update:
-            from game.events import generate_random_weather
-            self.current_weather = generate_random_weather()
+        if force or current_day != self.last_weather_update:
+            self.current_weather = self.calendar.weather_for_day(current_day)
             self.last_weather_update = current_day
+            bus.publish(WEATHER_CHANGED, creature=self.creature, weather=self.current_weather, day=current_day)
             
             # Apply weather effects to creature
             if self.creature:
@@ -96,6 +597,18 @@ class Game:
         
         return None
     
+    def _initialize_weather(self):
+        """
+        Gives its first weather to the creature just created or loaded.
+        
+        Returns:
+            MappingProxyType: The weather of the day
+        """
+        weather = self.update_weather(force=True)
+        if self.journal is not None:
+            self.journal.record_weather(self.active_id, self.last_weather_update)
+        return weather
+    
     def get_current_weather(self):
         """
         Returns the current weather information.
@@ -105,265 +618,298 @@ class Game:
         """
         return self.current_weather
     
-    def do_action(self, action, **params):
+    def do_action(self, action, creature_id=None, **params):
         """
-        Performs an action on the current creature.
+        Performs an action on the active creature, or on the creature with the given id.
+        
+        The actions are registered in game.actions. When metrics are enabled,
+        the duration of the action, of each of its phases (catch_up, weather,
+        action, death) and its outcome are recorded.
         
         Args:
             action (str): Name of the action to perform
+            creature_id: Id of the target creature (the active creature by default);
+                         the active creature is unchanged afterwards
             **params: Additional parameters specific to the action
             
         Returns:
-            str: Result of the action
+            ActionResult: Result of the action
         """
-        if not self.creature:
-            return "Aucune créature n'a été créée ou chargée."
+        if creature_id is None:
+            return self._perform(action, params)
         
-        # Calculate time elapsed since last action
-        current_time = time.time()
-        hours_elapsed = (current_time - self.last_action) / 3600  # Convert to hours
-        
-        # Save the age before the action to detect a day change
-        previous_age_day = int(self.creature.age)
+        record = self.registry.get(creature_id)
+        if record is None:
+            return ActionResult(Status.NO_CREATURE, "Aucune créature avec l'identifiant {creature_id}.",
+                                {"creature_id": creature_id})
+        previous = self._active
+        self._resume.append(previous)
+        self._activate(record)
+        try:
+            return self._perform(action, params)
+        finally:
+            self._resume.pop()
+            self._restore_active(previous)
+    
+    def do_actions(self, batch, now=None):
+        """
+        Performs a batch of actions at the same game time.
         
-        result = ""
-        weather_updated = False
+        The clock is read once for the whole batch, so the time elapsed since
+        the previous action (and the weather change it may bring) is applied
+        once per creature, before its first action of the batch.
         
-        # Update creature state based on elapsed time
-        if hours_elapsed > 0.01:  # To avoid too frequent updates (less than 36 seconds)
-            result = self.creature.pass_time(hours_elapsed)
-            if result == "death":
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée. Retour au menu principal."
-            
-            # Check if a day has passed
-            current_age_day = int(self.creature.age)
+        Args:
+            batch (iterable): Actions as dicts with an "action" key, an optional
+                              "creature_id" key (the active creature by default)
+                              and the parameters of the action
+            now (float): Game time of the batch (read from the clock if not given)
             
-            # If a day or more has passed, update the weather
-            if current_age_day > previous_age_day:
-                # Calculate how many days have passed
-                days_passed = current_age_day - previous_age_day
-                
-                # Update the weather for the current day
-                weather = self.update_weather(force=True)
-                if weather:
-                    result += f"\n{weather['message']}"
-                    weather_updated = True
+        Returns:
+            list: One dict per action with the creature_id, the action, its
+                  Status and its ActionResult
+        """
+        if now is None:
+            now = self.clock()
+        previous = self._active
+        self._resume.append(previous)
+        results = []
+        try:
+            for item in batch:
+                params = dict(item)
+                action = params.pop("action")
+                creature_id = params.pop("creature_id", None)
+                record = previous if creature_id is None else self.registry.get(creature_id)
+                if record is not None and record.creature_id not in self.registry:
+                    record = None
+                self._activate(record)
+                result = self._perform(action, params, now)
+                results.append({
+                    "creature_id": record.creature_id if record else creature_id,
+                    "action": action,
+                    "status": result.status,
+                    "result": result
+                })
+        finally:
+            self._resume.pop()
+            self._restore_active(previous)
+        return results
+    
+    def _restore_active(self, record):
+        """
+        Makes a creature active again after working on another one, unless it died meanwhile.
         
-        # Perform the requested action
-        action_result = ""
-        if action == "feed":
-            food = params.get("food", "standard")
-            action_result = self.creature.feed(food)
-        elif action == "play":
-            duration = params.get("duration", 1)
-            
-            # Explicitly make time pass for playing
-            # (in addition to the specific effects of the play action)
-            time_message = self._format_time_message(duration)
-            
-            play_result = self.creature.play(duration)
-            if play_result == "death":
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée pendant le jeu. Retour au menu principal."
-                
-            # Combine time message with play result
-            action_result = f"{time_message}\n{play_result}"
-            
-            # Check if a day has passed during play
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "sleep":
-            duration = params.get("duration", 8)
-            
-            # Explicitly make time pass for sleeping
-            # (in addition to the specific effects of the sleep action)
-            time_message = self._format_time_message(duration)
-            
-            sleep_result = self.creature.sleep(duration)
-            if sleep_result == "death":
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée pendant son sommeil. Retour au menu principal."
-                
-            # Combine time message with sleep result
-            action_result = f"{time_message}\n{sleep_result}"
-            
-            # Check if a day has passed during sleep
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "heal":
-            action_result = self.creature.heal()
-        elif action == "save":
-            filename = params.get("filename", "sauvegarde.json")
-            action_result = self.creature.save(filename)
-        elif action == "explore":
-            # Exploration takes 30 minutes (0.5 hours)
-            exploration_time = 0.5
-            
-            # First, explicitly make time pass for exploration
-            time_result = self.creature.pass_time(exploration_time)
-            if time_result == "death":
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée pendant l'exploration. Retour au menu principal."
-                
-            # Then, generate a random event
-            from game.events import generate_random_event
-            event_result = generate_random_event(self.creature)
-            
-            # Combine results
-            action_result = f"Votre créature a exploré pendant 30 minutes.\n{event_result}"
-            
-            # Check if a day has passed during exploration
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "meet":
-            # Meeting another creature takes 30 minutes (0.5 hours)
-            meet_time = 0.5
-            time_message = self._format_time_message(meet_time)
-            
-            # Generate a meeting with another creature
-            possible_types = self.available_types.copy()
-            if self.creature.creature_type.lower() in map(str.lower, possible_types):
-                possible_types.remove(self.creature.creature_type.lower())
-            
-            other_type = params.get("type", random.choice(possible_types))
-            other_name = params.get("name", f"{other_type.capitalize()}-{random.randint(1, 100)}")
-            
-            # Meet the creature
-            encounter_result = self.creature.encounter_creature(other_name, other_type)
-            
-            # Check if the creature died as a result of the encounter
-            if self._check_creature_death():
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée pendant la rencontre. Retour au menu principal."
-            
-            # Combine results
-            action_result = f"{time_message}\n{encounter_result}"
-            
-            # Check if a day has passed during the meeting
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "play_mini_game":
-            from game.mini_games import mini_game_list
-            
-            game = params.get("game")
-            if not game:
-                # If no game is specified, display the list of available games
-                available_games = mini_game_list()
-                game_names = [game["nom"] for game in available_games]
-                return f"Mini-jeux disponibles: {', '.join(game_names)}"
-            
-            # Mini-games take 1 hour
-            mini_game_time = 1.0
-            time_message = self._format_time_message(mini_game_time)
-            
-            game_result = self.creature.play_mini_game(game)
-            if game_result["success"]:
-                action_result = f"{time_message}\n{game_result['message']} +{game_result['happiness_bonus']} bonheur, +{game_result['points']} points"
-                if game_result.get("item"):
-                    action_result += f"\nVous avez gagné un objet: {game_result['item']}!"
-            else:
-                action_result = f"{time_message}\n{game_result['message']}"
-            
-            # Check if a day has passed during the mini-game
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "use_object":
-            item = params.get("item")
-            if not item:
-                # If no item is specified, display the inventory
-                if not self.creature.inventory:
-                    return "L'inventaire est vide."
-                return f"Objets disponibles: {', '.join(self.creature.inventory)}"
-            
-            # Using an object takes 15 minutes
-            object_time = 0.25
-            time_message = self._format_time_message(object_time)
-            
-            # Use the object
-            object_result = self.creature.use_object(item)
-            
-            # Check if the creature died as a result of using the object
-            if self._check_creature_death():
-                from ui.display import display_death
-                display_death(self.creature.name, self.creature.age)
-                self.creature = None
-                return "Votre créature est décédée. Retour au menu principal."
+        Args:
+            record (CreatureRecord): Previously active record (or None)
+        """
+        if record is not None and record.creature_id not in self.registry:
+            record = None
+        self._activate(record)
+    
+    def _perform(self, action, params, now=None):
+        """
+        Performs an action on the active creature, recording metrics and journaling it when enabled.
+        
+        Args:
+            action (str): Name of the action to perform
+            params (dict): Additional parameters specific to the action
+            now (float): Game time of the action (read from the clock if not given)
             
-            # Combine messages
-            action_result = f"{time_message}\n{object_result}"
+        Returns:
+            ActionResult: Result of the action
+        """
+        journal = self.journal
+        if journal is not None:
+            # The journal needs the time of the action and its creature, even if it dies
+            if now is None:
+                now = self.clock()
+            record = self._active
+        
+        metrics = self.metrics
+        if not metrics.enabled:
+            result = self._do_action(action, params, now)
+            if journal is not None:
+                journal.record_action(now, record, action, params, result)
+            if self.scheduler is not None:
+                self._reschedule()
+            if bus.has_subscribers(CRITICAL):
+                self._watch_alert()
+            return result
+        
+        start = time.perf_counter_ns()
+        self._timer = timer = PhaseTimer("catch_up")
+        try:
+            result = self._do_action(action, params, now)
+        except Exception:
+            metrics.count(f"actions.{action}.error")
+            raise
+        finally:
+            timer.enter(None)
+            self._timer = None
+        duration = time.perf_counter_ns() - start
+        
+        metrics.record_action(action, result.status, duration, timer.phases)
+        if journal is not None:
+            journal.record_action(now, record, action, params, result)
+        if self.scheduler is not None:
+            self._reschedule()
+        if bus.has_subscribers(CRITICAL):
+            self._watch_alert()
+        return result
+    
+    def _reschedule(self):
+        """
+        Tells the scheduler that the active creature changed (it is ignored if the creature died).
+        """
+        if self._active is not None and self._active.creature_id in self.registry:
+            self.scheduler.schedule(self._active)
+    
+    def _watch_alert(self):
+        """
+        Publishes "critical" when the active creature enters a critical state (it is ignored if the creature died).
+        """
+        record = self._active
+        if record is None or record.creature_id not in self.registry:
+            return
+        alert = record.creature._check_critical_state()
+        if alert and alert != record.alert:
+            bus.publish(CRITICAL, creature=record.creature, message=alert)
+        record.alert = alert
+    
+    def _do_action(self, action, params, now=None):
+        """
+        Performs an action on the active creature (body of do_action).
+        
+        Args:
+            action (str): Name of the action to perform
+            params (dict): Additional parameters specific to the action
+            now (float): Game time of the action (read from the clock if not given)
             
-            # Check if a day has passed while using the object
-            if int(self.creature.age) > previous_age_day and not weather_updated:
-                weather = self.update_weather(force=True)
-                if weather:
-                    action_result += f"\n{weather['message']}"
-        elif action == "shop":
-            points = self.creature.game_points
-            if params.get("buy"):
-                item = params.get("buy")
-                price = self._get_object_price(item)
-                
-                if not price:
-                    return f"L'objet {item} n'est pas disponible dans la boutique."
-                
-                if points < price:
-                    return f"Vous n'avez pas assez de points pour acheter {item}. Prix: {price} points, points disponibles: {points}."
-                
-                self.creature.game_points -= price
-                self.creature.inventory.append(item)
-                return f"Vous avez acheté {item} pour {price} points."
+        Returns:
+            ActionResult: Result of the action, made of the results of the
+                          elapsed time, of the weather and of the action itself
+        """
+        creature = self.creature
+        if not creature:
+            return ActionResult(Status.NO_CREATURE, "Aucune créature n'a été créée ou chargée.")
+        
+        timer = self._timer
+        current_time = self.clock() if now is None else now
+        before = (creature.hunger, creature.energy, creature.happiness, creature.health)  # DELTA_STATS
+        parts = []
+        
+        # Update creature state based on elapsed time
+        hours_elapsed = (current_time - self._active.last_action) / SECONDS_PER_HOUR
+        if hours_elapsed > 0.01:  # To avoid too frequent updates (less than 36 seconds)
+            if hours_elapsed > CATCH_UP_THRESHOLD:
+                # Long absence: simulate it event by event
+                elapsed = creature.catch_up(hours_elapsed)
             else:
-                # This function now only returns the points, as the catalog is displayed via shop_menu
-                return points
-        else:
-            action_result = f"Action inconnue: {action}"
+                elapsed = creature.pass_time(hours_elapsed)
+            if elapsed.status == Status.DEATH:
+                return self._handle_death(DEFAULT_DEATH_MESSAGE)
+            parts.append(elapsed)
+        self._active.last_action = current_time
         
-        # Check if the creature died during the action
-        if action_result == "death":
-            from ui.display import display_death
-            display_death(self.creature.name, self.creature.age)
-            self.creature = None
-            return "Votre créature est décédée. Retour au menu principal."
+        # A new game day brings the weather of the calendar: days are counted on the game clock, not on the
+        # age of the creature, so that every creature of the world changes weather at the same time
+        if self.calendar.day_of(current_time) != self._active.last_weather_update:
+            parts.append(self._weather_result(self._refresh_weather(current_time)))
         
-        self.last_action = current_time
+        # Perform the requested action
+        if timer:
+            timer.enter("action")
+        handler = ACTIONS.get(action)
+        if handler is None:
+            status, value = Status.UNKNOWN_ACTION, None
+            parts.append(ActionResult(status, "Action inconnue: {action}", {"action": action}))
+        else:
+            action_result = handler.function(self, creature, params)
+            if isinstance(action_result, Reply):
+                return action_result.result
+            if action_result.status == Status.DEATH or creature.health <= 0:
+                return self._handle_death(handler.death_message)
+            status, value = action_result.status, action_result.value
+            if handler.announce_time:
+                parts.append(self._format_time_message(handler.time_cost(params)))
+            parts.append(action_result)
         
         # Combine the results of the action with the result of the passage of time
-        if result and action_result:
-            return f"{result}\n{action_result}"
-        elif result:
-            return result
-        else:
-            return action_result
+        result = parts[0] if len(parts) == 1 else ActionResult(status, parts=tuple(parts), value=value)
+        result.set_deltas(before, (creature.hunger, creature.energy, creature.happiness, creature.health))
+        return result
+    
+    def simulate(self, hours, step_hours=1):
+        """
+        Lets game time pass without any player action, one step at a time.
+        
+        The clock of the game must be able to advance (ManualClock or
+        FixedStepClock), which makes a year of game time take seconds.
+        
+        Args:
+            hours (float): Number of game hours to simulate
+            step_hours (float): Game hours between two updates of the creature
+            
+        Returns:
+            list: ActionResult of the updates that have a message (events, weather, death)
+        """
+        results = []
+        elapsed = 0
+        while elapsed < hours and self.creature:
+            step = min(step_hours, hours - elapsed)
+            self.clock.advance_hours(step)
+            elapsed += step
+            result = self.do_action("wait")
+            if not result.empty:
+                results.append(result)
+        return results
+    
+    def _handle_death(self, message):
+        """
+        Publishes the death of the active creature and removes it.
+        
+        Args:
+            message (str): Message returned to the player
+            
+        Returns:
+            ActionResult: The death, with the message
+        """
+        if self._timer:
+            self._timer.enter("death")
+        bus.publish(DIED, creature=self.creature, owner=self._active.owner)
+        self._unregister(self._active.creature_id)
+        return ActionResult(Status.DEATH, message, events=(DIED,))
     
-    def _check_creature_death(self):
+    def _refresh_weather(self, now):
         """
-        Checks if the creature is dead.
+        Updates the weather after a day change during an action.
         
+        Args:
+            now (float): Game time of the action
+            
         Returns:
-            bool: True if the creature is dead, False otherwise
+            MappingProxyType: The new weather
         """
-        return self.creature is not None and self.creature.health <= 0
+        timer = self._timer
+        if timer:
+            previous = timer.enter("weather")
+        weather = self.update_weather(force=True, now=now)
+        if timer:
+            timer.enter(previous)
+        return weather
+    
+    @staticmethod
+    def _weather_result(weather):
+        """
+        Returns the announcement of a new weather.
+        
+        Args:
+            weather (MappingProxyType): The new weather
+            
+        Returns:
+            ActionResult: Message of the weather
+        """
+        return ActionResult(Status.OK, weather["message"], events=(WEATHER_CHANGED,))
     
     def _format_time_message(self, hours):
         """
@@ -373,28 +919,27 @@ class Game:
             hours (float): Number of hours elapsed
             
         Returns:
-            str: Formatted message
+            ActionResult: Message, rendered when it is read
         """
         if hours < 1:
-            minutes = int(hours * 60)
-            return f"{minutes} minute(s) se sont écoulées."
+            return ActionResult(Status.OK, "{minutes} minute(s) se sont écoulées.", {"minutes": int(hours * 60)})
         elif hours == 1:
-            return "1 heure s'est écoulée."
+            return ActionResult(Status.OK, "1 heure s'est écoulée.")
         elif hours < 24:
-            return f"{hours} heures se sont écoulées."
+            return ActionResult(Status.OK, "{hours} heures se sont écoulées.", {"hours": hours})
         else:
             days = int(hours // 24)
-            remaining_hours = hours % 24
-            if remaining_hours == 0:
+            fields = {"days": days, "hours": hours % 24}
+            if fields["hours"] == 0:
                 if days == 1:
-                    return "1 jour s'est écoulé."
+                    return ActionResult(Status.OK, "1 jour s'est écoulé.")
                 else:
-                    return f"{days} jours se sont écoulés."
+                    return ActionResult(Status.OK, "{days} jours se sont écoulés.", fields)
             else:
                 if days == 1:
-                    return f"1 jour et {remaining_hours} heure(s) se sont écoulés."
+                    return ActionResult(Status.OK, "1 jour et {hours} heure(s) se sont écoulés.", fields)
                 else:
-                    return f"{days} jours et {remaining_hours} heure(s) se sont écoulés."
+                    return ActionResult(Status.OK, "{days} jours et {hours} heure(s) se sont écoulés.", fields)
     
     def get_creature_state(self):
         """
@@ -412,40 +957,9 @@ class Game:
         Returns the catalog of items available in the shop.
         
         Returns:
-            list: List of available items with their prices
-        """
-        return [
-            {
-                "nom": "Friandise",
-                "prix": 10,
-                "description": "Augmente la faim et un peu le bonheur"
-            },
-            {
-                "nom": "Jouet",
-                "prix": 15,
-                "description": "Augmente le bonheur mais consomme de l'énergie"
-            },
-            {
-                "nom": "Potion d'énergie",
-                "prix": 20,
-                "description": "Restaure beaucoup d'énergie"
-            },
-            {
-                "nom": "Potion de santé",
-                "prix": 25,
-                "description": "Soigne la créature et améliore sa santé"
-            },
-            {
-                "nom": "Amulette de protection",
-                "prix": 50,
-                "description": "Objet permanent qui améliore la santé"
-            },
-            {
-                "nom": "Livre magique",
-                "prix": 40,
-                "description": "Objet permanent qui augmente le bonheur et donne des points de jeu"
-            }
-        ]
+            tuple: Read-only items available with their prices
+        """
+        return rules.SHOP_CATALOG
     
     def _get_object_price(self, object_name):
         """
@@ -457,49 +971,22 @@ class Game:
         Returns:
             int or None: Price of the item or None if the item doesn't exist
         """
-        catalog = self._get_shop_catalog()
-        for item in catalog:
-            if item["nom"] == object_name:
-                return item["prix"]
-        return None
+        return rules.SHOP_PRICES.get(object_name)
     
     def get_available_character_traits(self):
         """
         Returns the list of available character traits.
         
         Returns:
-            dict: Character traits with their descriptions
+            MappingProxyType: Character traits with their descriptions
         """
-        return {
-            "normal": "Aucun bonus ou malus particulier",
-            "joueur": "Bonus de bonheur, légère perte d'énergie",
-            "gourmand": "Faim plus rapide, légère perte de santé",
-            "sportif": "Bonus d'énergie, faim plus rapide",
-            "paresseux": "Perte d'énergie, léger bonus de bonheur",
-            "curieux": "Bonus de bonheur et d'énergie",
-            "timide": "Malus de bonheur et social",
-            "sociable": "Bonus de bonheur et social",
-            "intelligent": "Bonus aux mini-jeux"
-        }
+        return rules.TRAIT_DESCRIPTIONS
     
     def get_available_colors(self):
         """
         Returns the list of available colors according to creature type.
         
         Returns:
-            dict: Available colors by creature type
+            MappingProxyType: Available colors by creature type (including "standard")
         """
-        colors = {
-            "chaton": ["gris", "roux", "blanc", "noir", "tigré"],
-            "chiot": ["marron", "blanc", "noir", "tacheté"],
-            "dragon": ["rouge", "vert", "bleu", "noir", "doré"],
-            "robot": ["argent", "or", "bleu", "noir", "rouge"],
-            "lapin": ["blanc", "gris", "marron", "noir", "roux"]
-        }
-        
-        # Add "standard" color for all types
-        for creature_type in colors:
-            if "standard" not in colors[creature_type]:
-                colors[creature_type].append("standard")
-        
-        return colors
\ No newline at end of file
+        return rules.COLORS
@@ -0,0 +1,253 @@
+"""
+Headless runner replaying action traces through Game.do_action.
+
+A trace is a JSONL file with one action per line, using the parameters of
+Game.do_action, for example:
+
+    {"action": "create", "name": "Pixel", "type": "dragon"}
+    {"action": "feed", "food": "premium", "dt": 600}
+    {"action": "sleep", "duration": 8}
+
+"dt" is the number of virtual seconds elapsed before the action (60 by
+default). The game runs on a virtual clock and without any terminal I/O;
+the interactive mini-games are skipped. The runner reports the throughput,
+a latency histogram per action type and the final state of the creature.
+
+Usage:
+    python -m game.headless trace.jsonl [--seed 1] [--json]
+    python -m game.headless --synthetic 100000 [--seed 1] [--json]
+"""
+
+import argparse
+import json
+import time
+
+from game.game_manager import Game
+from game.metrics import Metrics
+from utils.clock import ManualClock
+from utils.rng import RngStream
+
+# Virtual seconds elapsed before an action when the trace does not say
+DEFAULT_STEP = 60
+
+# Actions that need a human at the keyboard
+INTERACTIVE_ACTIONS = {"play_mini_game"}
+
+# Creature created when the trace does not start with "create" or "load"
+DEFAULT_CREATURE = {"name": "Pixel", "type": "chaton", "color": "standard", "trait": "normal"}
+
+
+class LatencyHistogram:
+    """Histogram of latencies with power-of-two buckets in microseconds."""
+
+    __slots__ = ("buckets", "count", "total", "maximum")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        """
+        Adds a latency to the histogram.
+
+        Args:
+            seconds (float): Measured latency
+        """
+        bucket = int(seconds * 1e6).bit_length()  # bucket b holds [2**(b-1), 2**b) microseconds
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, percent):
+        """
+        Returns an upper bound of a percentile.
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile, in microseconds
+        """
+        target = self.count * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return float(2 ** bucket)
+        return 0.0
+
+    def to_dict(self):
+        """
+        Exports the histogram.
+
+        Returns:
+            dict: Count, mean, percentiles and buckets (labelled in microseconds)
+        """
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count * 1e6, 2) if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "max_us": round(self.maximum * 1e6, 2),
+            "buckets": {(f"<{2 ** bucket}us" if bucket == 0 else f"{2 ** (bucket - 1)}-{2 ** bucket}us"): count
+                        for bucket, count in sorted(self.buckets.items())}
+        }
+
+
+def load_trace(filename):
+    """
+    Reads a JSONL trace lazily.
+
+    Args:
+        filename (str): Path of the trace
+
+    Yields:
+        dict: One action per non-empty line
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def synthetic_trace(count, seed=None):
+    """
+    Generates a random trace covering every non-interactive action.
+
+    Args:
+        count (int): Number of actions
+        seed (int): Seed of the trace
+
+    Yields:
+        dict: One action
+    """
+    rng = RngStream(seed, "trace")
+    yield {"action": "create", "name": "Pixel", "type": rng.choice(["chaton", "chiot", "dragon", "robot", "lapin"])}
+    choices = [
+        lambda: {"action": "feed", "food": rng.choice(["standard", "premium", "malsaine"])},
+        lambda: {"action": "play", "duration": rng.choice([0.5, 1, 2])},
+        lambda: {"action": "sleep", "duration": rng.choice([1, 4, 8])},
+        lambda: {"action": "heal"},
+        lambda: {"action": "explore"},
+        lambda: {"action": "meet"},
+        lambda: {"action": "use_object", "item": rng.choice(["Friandise", "Jouet", "Potion d'énergie"])},
+        lambda: {"action": "shop", "buy": rng.choice(["Friandise", "Jouet"])},
+    ]
+    for _ in range(count):
+        entry = rng.choice(choices)()
+        entry["dt"] = rng.choice([10, 60, 600, 3600])
+        yield entry
+
+
+def run_trace(trace, seed=None, respawn=True, metrics=None):
+    """
+    Replays a trace through Game.do_action on a virtual clock, without terminal I/O.
+
+    Args:
+        trace (iterable): Actions (dicts) to replay
+        seed (int): Root seed of the game
+        respawn (bool): Recreate the creature after its death to keep replaying
+        metrics (Metrics): Registry given to the game to record the phases of every action
+
+    Returns:
+        dict: Throughput, latency per action type, deaths, skipped actions and final state
+    """
+    clock = ManualClock()
+    game = Game(seed, clock, metrics)
+    creature_params = dict(DEFAULT_CREATURE)
+    histograms = {}
+    actions = deaths = skipped = 0
+
+    started = time.perf_counter()
+    for entry in trace:
+        params = dict(entry)
+        action = params.pop("action")
+        clock.advance(params.pop("dt", DEFAULT_STEP))
+
+        if action in INTERACTIVE_ACTIONS:
+            skipped += 1
+            continue
+
+        if action == "create":
+            creature_params.update(params)
+        elif game.creature is None:
+            if actions and not respawn:
+                skipped += 1
+                continue
+            game.create_creature(creature_params["name"], creature_params["type"],
+                                 creature_params["color"], creature_params["trait"])
+
+        before = time.perf_counter()
+        if action == "create":
+            game.create_creature(creature_params["name"], creature_params["type"],
+                                 creature_params["color"], creature_params["trait"])
+        elif action == "load":
+            game.load_creature(params.get("filename", "sauvegarde.json"))
+        else:
+            game.do_action(action, **params)
+        elapsed = time.perf_counter() - before
+
+        histogram = histograms.get(action)
+        if histogram is None:
+            histogram = histograms[action] = LatencyHistogram()
+        histogram.record(elapsed)
+        actions += 1
+        if game.creature is None:
+            deaths += 1
+    wall_time = time.perf_counter() - started
+
+    return {
+        "actions": actions,
+        "skipped": skipped,
+        "deaths": deaths,
+        "wall_time_s": round(wall_time, 6),
+        "actions_per_s": round(actions / wall_time, 1) if wall_time else 0.0,
+        "virtual_hours": round(clock.now / 3600, 3),
+        "latency": {action: histogram.to_dict() for action, histogram in sorted(histograms.items())},
+        "final_state": game.get_creature_state()
+    }
+
+
+def main():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Rejoue une trace d'actions sans terminal.")
+    parser.add_argument("trace", nargs="?", help="fichier JSONL d'actions")
+    parser.add_argument("--synthetic", type=int, help="génère une trace aléatoire de N actions")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-respawn", action="store_true", help="s'arrête à la mort de la créature")
+    parser.add_argument("--json", action="store_true", help="affiche le rapport complet en JSON")
+    parser.add_argument("--metrics", help="écrit les métriques détaillées des actions dans ce fichier JSON")
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        trace = synthetic_trace(args.synthetic, args.seed)
+    elif args.trace:
+        trace = load_trace(args.trace)
+    else:
+        parser.error("une trace ou --synthetic est nécessaire")
+
+    metrics = Metrics() if args.metrics else None
+    report = run_trace(trace, args.seed, respawn=not args.no_respawn, metrics=metrics)
+    if metrics:
+        metrics.to_json(args.metrics)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+        return
+
+    print(f"{report['actions']} actions en {report['wall_time_s']:.3f} s "
+          f"({report['actions_per_s']:,.0f} actions/s), {report['deaths']} décès, "
+          f"{report['skipped']} ignorées, {report['virtual_hours']} heures de jeu")
+    for action, latency in report["latency"].items():
+        print(f"  {action:<12} n={latency['count']:<8} moyenne={latency['mean_us']:>9.2f} us "
+              f"p50<={latency['p50_us']:>8.0f} us p99<={latency['p99_us']:>8.0f} us")
+
+
+if __name__ == "__main__":
+    main()
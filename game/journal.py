@@ -0,0 +1,477 @@
+"""
+Append-only journal of a game, for crash recovery.
+
+A journal lives in a directory of numbered generations: snapshot-N.json
+is the whole game in the save format (every creature as Creature.save
+writes it), journal-N.log the changes made since, one compact JSON line
+each: every Game.do_action call with its game time and the position of
+the creature's random streams after it, and every creature added,
+removed or selected. Recovering a game loads the last readable snapshot
+and replays the lines that follow it with the same seed, which draws the
+same random numbers again.
+
+Lines are written in groups: they are buffered and written with a single
+fsync once the group is full or its oldest line is max_delay seconds old
+(or on flush and close), so the cost of a journaled action stays a few
+microseconds even at high action rates. A writer thread writes the group
+that gets old while no action comes. A crash loses at most the last
+unwritten group, and a line cut by the crash is ignored.
+
+Usage:
+    game, report = recover("journal")  # None if there is nothing to recover
+    journal = Journal("journal")
+    journal.attach(game)                # writes a snapshot and journals every change
+"""
+
+import glob
+import json
+import math
+import os
+import threading
+import time
+
+from game.game_manager import Game
+from game.headless import INTERACTIVE_ACTIONS
+from game.weather import SECONDS_PER_DAY
+from models.creature import Creature
+from models.result import Status
+from utils.clock import ManualClock
+from utils.file_manager import load_data, save_data
+
+# Format of the journal, stored in every snapshot
+JOURNAL_VERSION = 1
+
+# Default group commit: lines written at once, and age of the oldest buffered line that forces a write
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_DELAY = 0.05
+
+# Default number of lines after which a new snapshot starts a new generation
+DEFAULT_SNAPSHOT_EVERY = 100_000
+
+# Actions whose replay would not change the game (their effect is outside of it)
+UNREPLAYED_ACTIONS = frozenset({"save"})
+
+# Kinds of lines: action, state of a creature (after an action that cannot be replayed),
+# creature added, creature removed, active creature selected, weather initialized
+ACTION, STATE, ADD, REMOVE, SELECT, WEATHER = "a", "=", "+", "-", "s", "w"
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _path(directory, kind, generation):
+    """
+    Returns the path of a file of a generation.
+
+    Args:
+        directory (str): Directory of the journal
+        kind (str): "snapshot" or "journal"
+        generation (int): Number of the generation
+
+    Returns:
+        str: Path of the file
+    """
+    extension = "json" if kind == "snapshot" else "log"
+    return os.path.join(directory, f"{kind}-{generation:06d}.{extension}")
+
+
+def _generations(directory, kind):
+    """
+    Lists the generations of the files of a kind in a directory.
+
+    Args:
+        directory (str): Directory of the journal
+        kind (str): "snapshot" or "journal"
+
+    Returns:
+        list: Numbers of the generations, in increasing order
+    """
+    generations = []
+    for path in glob.glob(os.path.join(directory, f"{kind}-*")):
+        number = os.path.basename(path)[len(kind) + 1:].split(".")[0]
+        if number.isdigit():
+            generations.append(int(number))
+    return sorted(generations)
+
+
+class Journal:
+    """Append-only journal of the changes of a game, written with group commits."""
+
+    def __init__(self, directory, batch_size=DEFAULT_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY,
+                 snapshot_every=DEFAULT_SNAPSHOT_EVERY):
+        """
+        Initializes the journal (nothing is written before attach).
+
+        Args:
+            directory (str): Directory of the journal (created if needed)
+            batch_size (int): Number of lines written and synced at once (1 to sync every line)
+            max_delay (float): Seconds after which buffered lines are written even if the group is not full
+                               (inf to write them only when the group is full, on flush and on close)
+            snapshot_every (int): Number of lines after which a new snapshot is written
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.snapshot_every = snapshot_every
+        self.game = None
+        self.generation = None
+        self._file = None
+        self._buffer = []
+        self._oldest = 0.0
+        self._lines = 0  # Lines of the current generation
+
+        # The writer thread of the old groups shares the buffer and the file under the lock
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._writer = None
+
+        self.entries = 0
+        self.commits = 0
+        self.snapshots = 0
+        self.bytes_written = 0
+
+    def attach(self, game):
+        """
+        Starts journaling a game: writes a snapshot of it, then every change.
+
+        Args:
+            game (Game): The game (its seed must be set for the replay to draw the same weather)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        existing = _generations(self.directory, "snapshot") + _generations(self.directory, "journal")
+        self.generation = max(existing, default=-1)
+        self.game = game
+        game.journal = self
+        self.checkpoint()
+        if 0 < self.max_delay < math.inf and self._writer is None:
+            self._stop.clear()
+            self._writer = threading.Thread(target=self._write_old_groups, name="journal-writer", daemon=True)
+            self._writer.start()
+
+    def detach(self):
+        """
+        Writes the buffered lines and stops journaling the game.
+        """
+        self.close()
+        if self.game is not None and self.game.journal is self:
+            self.game.journal = None
+        self.game = None
+
+    def record_action(self, now, record, action, params, result):
+        """
+        Journals an action performed by Game.do_action.
+
+        Args:
+            now (float): Game time of the action
+            record (CreatureRecord): Record of the creature (None if there was none)
+            action (str): Name of the action
+            params (dict): Parameters of the action
+            result (ActionResult): Result of the action
+        """
+        if record is None:
+            return
+        creature = record.creature
+        if action in INTERACTIVE_ACTIONS and result.status != Status.DEATH:
+            # The outcome depends on the player's answers: the creature is journaled as it is now
+            self._append([STATE, now, record.creature_id, creature.to_dict(), record.last_weather_update])
+        else:
+            self._append([ACTION, now, record.creature_id, action, params, creature.rng.draws()])
+
+    def record_add(self, record, activate=True):
+        """
+        Journals a creature added to the game.
+
+        Args:
+            record (CreatureRecord): Record of the creature
+            activate (bool): Whether it became the active creature
+        """
+        entry = [ADD, record.creature.to_dict(), record.owner, record.last_action, record.last_weather_update]
+        if not activate:
+            entry.append(False)
+        self._append(entry)
+
+    def record_remove(self, creature_id):
+        """
+        Journals a creature removed from the game.
+
+        Args:
+            creature_id: Id of the creature
+        """
+        self._append([REMOVE, creature_id])
+
+    def record_select(self, creature_id):
+        """
+        Journals the selection of the active creature.
+
+        Args:
+            creature_id: Id of the creature (None when the game is left without one)
+        """
+        self._append([SELECT, creature_id])
+
+    def record_weather(self, creature_id, day):
+        """
+        Journals the first weather given to a creature just created or loaded.
+
+        Args:
+            creature_id: Id of the creature
+            day (int): Game day of the weather
+        """
+        self._append([WEATHER, creature_id, day])
+
+    def _append(self, entry):
+        """
+        Buffers a line, and writes the group when it is full or old enough.
+
+        Args:
+            entry (list): Content of the line
+        """
+        line = _encode(entry)
+        with self._lock:
+            buffer = self._buffer
+            if not buffer:
+                self._oldest = time.monotonic()
+            buffer.append(line)
+            self.entries += 1
+            self._lines += 1
+            if len(buffer) >= self.batch_size or time.monotonic() - self._oldest >= self.max_delay:
+                self.flush()
+            if self._lines >= self.snapshot_every:
+                self.checkpoint()
+
+    def _write_old_groups(self):
+        """
+        Body of the writer thread: writes the buffered group once its oldest line is max_delay seconds old.
+        """
+        delay = self.max_delay
+        while not self._stop.wait(delay):
+            with self._lock:
+                delay = self.max_delay
+                if self._buffer:
+                    age = time.monotonic() - self._oldest
+                    if age >= self.max_delay:
+                        self.flush()
+                    else:
+                        delay -= age
+
+    def flush(self):
+        """
+        Writes the buffered lines and waits until they are on disk (one fsync for the whole group).
+        """
+        with self._lock:
+            if not self._buffer or self._file is None:
+                return
+            data = "\n".join(self._buffer) + "\n"
+            self._buffer.clear()
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.commits += 1
+            self.bytes_written += len(data)
+
+    def close(self):
+        """
+        Stops the writer thread, writes the buffered lines and closes the current journal file.
+        """
+        writer = self._writer
+        if writer is not None:
+            self._stop.set()
+            writer.join()
+            self._writer = None
+        self._close_file()
+
+    def _close_file(self):
+        """
+        Writes the buffered lines and closes the current journal file.
+        """
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def checkpoint(self):
+        """
+        Starts a new generation: a snapshot of the game and an empty journal file.
+
+        The files of the generations before the previous snapshot are deleted:
+        if the new snapshot cannot be read back, the previous one and the
+        journal files that follow it are still there.
+        """
+        with self._lock:
+            self._close_file()
+            self.generation += 1
+            self._lines = 0
+            game = self.game
+            records = [{
+                "creature": record.creature.to_dict(),
+                "proprietaire": record.owner,
+                "derniere_action": record.last_action,
+                "jour_meteo": record.last_weather_update
+            } for record in game.registry]
+            snapshot = {
+                "version": JOURNAL_VERSION,
+                "graine": game.seed,
+                "instant": game.clock(),
+                "prochain_id": game.next_creature_id,
+                # A snapshot taken during an action on another creature records the creature active after it
+                "creature_active": game.selected_id,
+                "creatures": records
+            }
+            # The journal file exists before the snapshot: a snapshot is never followed by a gap
+            self._file = open(_path(self.directory, "journal", self.generation), "a", encoding="utf-8")
+            if save_data(snapshot, _path(self.directory, "snapshot", self.generation)):
+                self.snapshots += 1
+                snapshots = _generations(self.directory, "snapshot")
+                if len(snapshots) >= 2:
+                    self._prune(snapshots[-2])
+
+    def _prune(self, oldest_kept):
+        """
+        Deletes the files of the generations before a generation.
+
+        Args:
+            oldest_kept (int): First generation kept
+        """
+        for kind in ("snapshot", "journal"):
+            for generation in _generations(self.directory, kind):
+                if generation < oldest_kept:
+                    try:
+                        os.remove(_path(self.directory, kind, generation))
+                    except OSError:
+                        pass
+
+
+def _read_lines(path):
+    """
+    Reads the lines of a journal file, up to the first line cut by a crash.
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        tuple: The decoded lines and True if a cut line was dropped
+    """
+    entries = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                return entries, True
+    return entries, False
+
+
+def _load_snapshot(data, clock):
+    """
+    Rebuilds a game from a snapshot.
+
+    Args:
+        data (dict): The snapshot
+        clock (ManualClock): Clock of the replay
+
+    Returns:
+        Game: The game of the snapshot
+    """
+    clock.now = data["instant"]
+    game = Game(data["graine"], clock)
+    for entry in data["creatures"]:
+        game.add_creature(Creature.from_dict(entry["creature"]), entry["proprietaire"], entry["derniere_action"],
+                          entry["jour_meteo"])
+    game.next_creature_id = data["prochain_id"]
+    active = data["creature_active"]
+    if active is None or not game.select_creature(active):
+        game.deactivate()
+    return game
+
+
+def _replay(game, clock, entry):
+    """
+    Applies a line of the journal to a game.
+
+    Args:
+        game (Game): The game
+        clock (ManualClock): Clock of the replay
+        entry (list): The line
+
+    Returns:
+        bool: False if an action did not draw the random numbers it drew when it was journaled
+    """
+    kind = entry[0]
+    if kind == ACTION:
+        _, now, creature_id, action, params, draws = entry
+        clock.now = max(clock.now, now)
+        record = game.registry.get(creature_id)
+        if record is None or action in UNREPLAYED_ACTIONS:
+            return record is not None
+        game.do_actions([dict(params, action=action, creature_id=creature_id)], now)
+        return record.creature.rng.draws() == draws
+    if kind == STATE:
+        _, now, creature_id, data, weather_day = entry
+        clock.now = max(clock.now, now)
+        record = game.registry.get(creature_id)
+        if record is not None:
+            record.creature = creature = Creature.from_dict(data)
+            record.last_action = now
+            if weather_day is not None:
+                record.last_weather_update = weather_day
+                record.current_weather = game.calendar.weather_for_day(weather_day)
+            if game.active_id == creature_id:
+                # The active creature is selected again to act on its new state
+                game.select_creature(creature_id)
+    elif kind == ADD:
+        _, data, owner, last_action, weather_day, *activate = entry
+        game.add_creature(Creature.from_dict(data), owner, last_action, weather_day, *activate)
+    elif kind == REMOVE:
+        game.remove_creature(entry[1])
+    elif kind == SELECT:
+        if entry[1] is None:
+            game.deactivate()
+        else:
+            game.select_creature(entry[1])
+    elif kind == WEATHER:
+        _, creature_id, day = entry
+        if game.select_creature(creature_id):
+            game.update_weather(force=True, now=day * SECONDS_PER_DAY)
+    return True
+
+
+def recover(directory, clock=None):
+    """
+    Rebuilds a journaled game: its last readable snapshot and the lines that follow it.
+
+    Args:
+        directory (str): Directory of the journal
+        clock (callable): Clock of the recovered game (a manual clock at the time of the last line by default)
+
+    Returns:
+        tuple: The game (None if the directory holds no readable snapshot) and a report
+               (dict with the generation of the snapshot, the lines replayed, the
+               actions that drew other random numbers and whether a cut line was dropped)
+    """
+    report = {"snapshot": None, "entries": 0, "diverged": 0, "truncated": False}
+    if not os.path.isdir(directory):
+        return None, report
+
+    # The last snapshot that can be read back
+    for generation in reversed(_generations(directory, "snapshot")):
+        data = load_data(_path(directory, "snapshot", generation))
+        if isinstance(data, dict) and data.get("version") == JOURNAL_VERSION:
+            break
+    else:
+        return None, report
+
+    replay_clock = ManualClock()
+    game = _load_snapshot(data, replay_clock)
+    report["snapshot"] = generation
+    for journal_generation in _generations(directory, "journal"):
+        if journal_generation < generation:
+            continue
+        entries, truncated = _read_lines(_path(directory, "journal", journal_generation))
+        for entry in entries:
+            if not _replay(game, replay_clock, entry):
+                report["diverged"] += 1
+        report["entries"] += len(entries)
+        report["truncated"] = report["truncated"] or truncated
+
+    if clock is not None:
+        game.clock = clock
+    return game, report
@@ -0,0 +1,279 @@
+"""
+Module collecting low-overhead counters and latency histograms of the game.
+
+Durations are integers in nanoseconds from the monotonic clock
+(time.perf_counter_ns). Histograms are HDR-style: values are grouped in
+buckets whose width grows with the value, so that every bucket keeps
+SIGNIFICANT_BITS significant bits (a relative error below 1/2**SIGNIFICANT_BITS),
+whatever the range of the recorded values.
+"""
+
+import json
+import time
+
+# Significant bits kept by the histogram buckets (3 bits: error below 12.5%)
+SIGNIFICANT_BITS = 3
+_SUB_BUCKET_BITS = SIGNIFICANT_BITS + 1
+
+_now = time.perf_counter_ns
+
+
+class Histogram:
+    """Histogram of non-negative integers with logarithmic, linearly subdivided buckets."""
+
+    __slots__ = ("buckets", "count", "total", "maximum")
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    def record(self, value):
+        """
+        Adds a value to the histogram.
+
+        Args:
+            value (int): Value to record (a duration in nanoseconds)
+        """
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        bucket = (value >> shift) << shift if shift > 0 else value
+        buckets = self.buckets
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """
+        Adds the values of another histogram to this one.
+
+        Args:
+            other (Histogram): Histogram to add
+        """
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    @staticmethod
+    def bucket_width(bucket):
+        """
+        Returns the width of a bucket.
+
+        Args:
+            bucket (int): Lower bound of the bucket
+
+        Returns:
+            int: Number of values grouped in the bucket
+        """
+        return 1 << max(0, bucket.bit_length() - SIGNIFICANT_BITS - 1)
+
+    def percentile(self, percent):
+        """
+        Returns a percentile, rounded up to the end of its bucket.
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            int: Upper bound of the percentile (0 for an empty histogram)
+        """
+        target = self.count * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(bucket + self.bucket_width(bucket) - 1, self.maximum)
+        return 0
+
+    def to_dict(self):
+        """
+        Exports the histogram.
+
+        Returns:
+            dict: Count, extremes, mean, percentiles and non-empty buckets
+                  (the minimum is the lower bound of the first bucket)
+        """
+        return {
+            "count": self.count,
+            "min": min(self.buckets) if self.buckets else 0,
+            "max": self.maximum,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "buckets": [[bucket, count] for bucket, count in sorted(self.buckets.items())]
+        }
+
+
+class PhaseTimer:
+    """Splits the duration of one action between the phases it goes through."""
+
+    __slots__ = ("phases", "phase", "_start")
+
+    def __init__(self, phase):
+        """
+        Starts timing.
+
+        Args:
+            phase (str): Name of the first phase
+        """
+        self.phases = {}
+        self.phase = phase
+        self._start = _now()
+
+    def enter(self, phase):
+        """
+        Ends the current phase and starts another one.
+
+        Args:
+            phase (str): Name of the new phase
+
+        Returns:
+            str: Name of the phase that just ended, to come back to it
+        """
+        now = _now()
+        previous = self.phase
+        self.phases[previous] = self.phases.get(previous, 0) + now - self._start
+        self.phase = phase
+        self._start = now
+        return previous
+
+
+class Metrics:
+    """Registry of named counters and histograms, cheap to leave on."""
+
+    def __init__(self, enabled=True):
+        """
+        Initializes an empty registry.
+
+        Args:
+            enabled (bool): Whether the instrumented code should record anything
+        """
+        self.enabled = enabled
+        self.reset()
+
+    def enable(self, enabled=True):
+        """
+        Turns recording on or off.
+
+        Args:
+            enabled (bool): True to record
+        """
+        self.enabled = enabled
+
+    def reset(self):
+        """
+        Forgets every value recorded so far.
+        """
+        self.counters = {}
+        self.histograms = {}
+        # Actions are only recorded once, by (action, outcome) and by (action, phase);
+        # the other views are merged when a snapshot is taken
+        self._outcomes = {}
+        self._phases = {}
+        self.started = time.time()
+
+    def count(self, name, value=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): Name of the counter
+            value (int): Increment
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name, value):
+        """
+        Records a value in a histogram.
+
+        Args:
+            name (str): Name of the histogram
+            value (int): Value to record (a duration in nanoseconds)
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(value)
+
+    def record_action(self, action, outcome, duration, phases):
+        """
+        Records one call to Game.do_action.
+
+        Args:
+            action (str): Name of the action
+            outcome (str): How the action ended ("ok", "death", "unknown_action"...)
+            duration (int): Total duration in nanoseconds
+            phases (dict): Duration of every phase in nanoseconds
+        """
+        histogram = self._outcomes.get((action, outcome))
+        if histogram is None:
+            histogram = self._outcomes[action, outcome] = Histogram()
+        histogram.record(duration)
+
+        histograms = self._phases
+        for phase, phase_duration in phases.items():
+            histogram = histograms.get((action, phase))
+            if histogram is None:
+                histogram = histograms[action, phase] = Histogram()
+            histogram.record(phase_duration)
+
+    def snapshot(self):
+        """
+        Exports every counter and histogram.
+
+        Actions are exported per action ("action.feed"), per outcome
+        ("outcome.death"), per phase ("phase.weather") and per action and
+        phase ("action.feed.catch_up"), and counted per action and outcome
+        ("actions.feed.ok").
+
+        Returns:
+            dict: JSON serializable snapshot (durations in nanoseconds)
+        """
+        counters = dict(self.counters)
+        histograms = {}
+
+        def merge(name, histogram):
+            merged = histograms.get(name)
+            if merged is None:
+                merged = histograms[name] = Histogram()
+            merged.merge(histogram)
+
+        for name, histogram in self.histograms.items():
+            merge(name, histogram)
+        for (action, outcome), histogram in self._outcomes.items():
+            counters[f"actions.{action}.{outcome}"] = histogram.count
+            merge(f"action.{action}", histogram)
+            merge(f"outcome.{outcome}", histogram)
+        for (action, phase), histogram in self._phases.items():
+            merge(f"action.{action}.{phase}", histogram)
+            merge(f"phase.{phase}", histogram)
+
+        return {
+            "enabled": self.enabled,
+            "uptime_s": round(time.time() - self.started, 3),
+            "unit": "ns",
+            "counters": dict(sorted(counters.items())),
+            "histograms": {name: histogram.to_dict() for name, histogram in sorted(histograms.items())}
+        }
+
+    def to_json(self, filename=None):
+        """
+        Exports the snapshot as JSON.
+
+        Args:
+            filename (str): File to write the snapshot to (None to only return it)
+
+        Returns:
+            str: The snapshot as JSON text
+        """
+        text = json.dumps(self.snapshot(), ensure_ascii=False, indent=4)
+        if filename:
+            with open(filename, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return text
@@ -5,33 +5,35 @@ Module managing mini-games for the virtual creature simulator.
 import random
 import time
 
-def play_mini_game(game, character_trait=None):
+def play_mini_game(game, character_trait=None, rng=random):
     """
     Plays a specific mini-game and returns the result.
     
     Args:
         game (str): Name of the mini-game
         character_trait (str): Character trait of the creature playing
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         dict: Result of the mini-game
     """
     if game == "Devinette":
-        return riddle_game(character_trait)
+        return riddle_game(character_trait, rng)
     elif game == "Reflexe":
-        return reflex_game(character_trait)
+        return reflex_game(character_trait, rng)
     elif game == "Memoire":
-        return memory_game(character_trait)
+        return memory_game(character_trait, rng)
     else:
         return {"success": False, "message": f"Le mini-jeu '{game}' n'existe pas."}
 
 
-def riddle_game(character_trait=None):
+def riddle_game(character_trait=None, rng=random):
     """
     Mini-game where the player must guess a number between 1 and 10.
     
     Args:
         character_trait (str): Character trait of the creature
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         dict: Game result
@@ -41,7 +43,7 @@ def riddle_game(character_trait=None):
     if character_trait == "intelligent":
         hints = 1
     
-    secret_number = random.randint(1, 10)
+    secret_number = rng.randint(1, 10)
     
     print("\n=== JEU DE DEVINETTE ===")
     print("Devinez un nombre entre 1 et 10.")
@@ -66,9 +68,9 @@ def riddle_game(character_trait=None):
                 item = None
                 
                 # Chance to get a bonus item
-                if random.random() < 0.3:
+                if rng.random() < 0.3:
                     possible_items = ["Friandise", "Jouet"]
-                    item = random.choice(possible_items)
+                    item = rng.choice(possible_items)
                 
                 return {
                     "success": True,
@@ -94,18 +96,18 @@ def riddle_game(character_trait=None):
     }
 
 
-def reflex_game(character_trait=None):
+def reflex_game(character_trait=None, rng=random):
     """
     Mini-game where the player must press Enter as quickly as possible.
     
     Args:
         character_trait (str): Character trait of the creature
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         dict: Game result
     """
     import time
-    import random
     import threading
     import sys
     import select
@@ -153,7 +155,7 @@ def reflex_game(character_trait=None):
     thread.start()
     
     # Random wait time
-    wait_time = random.uniform(2, 5)
+    wait_time = rng.uniform(2, 5)
     time.sleep(wait_time)
     
     # If a false start was detected during the wait
@@ -196,13 +198,13 @@ def reflex_game(character_trait=None):
     if reaction_time < 0.5:
         happiness_bonus = 20
         points = 30
-        item = "Potion d'énergie" if random.random() < 0.4 else None
+        item = "Potion d'énergie" if rng.random() < 0.4 else None
         message = "Réflexes exceptionnels ! Votre créature est impressionnée !"
         success = True
     elif reaction_time < 1.0:
         happiness_bonus = 15
         points = 20
-        item = "Friandise" if random.random() < 0.3 else None
+        item = "Friandise" if rng.random() < 0.3 else None
         message = "Très bons réflexes ! Votre créature est contente."
         success = True
     elif reaction_time < 2.0:
@@ -227,12 +229,13 @@ def reflex_game(character_trait=None):
     }
 
 
-def memory_game(character_trait=None):
+def memory_game(character_trait=None, rng=random):
     """
     Mini-game where the player must memorize and reproduce a sequence.
     
     Args:
         character_trait (str): Character trait of the creature
+        rng: Random stream to draw from (the random module by default)
         
     Returns:
         dict: Game result
@@ -261,7 +264,7 @@ def memory_game(character_trait=None):
     
     # Generate a random sequence
     symbols = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L']
-    sequence = [random.choice(symbols) for _ in range(sequence_length)]
+    sequence = [rng.choice(symbols) for _ in range(sequence_length)]
     
     print("\nVoici la séquence:")
     print(' '.join(sequence))
@@ -291,13 +294,13 @@ def memory_game(character_trait=None):
     if correct == sequence_length:
         happiness_bonus = 25
         points = sequence_length * 5
-        item = "Livre magique" if random.random() < 0.2 else None
+        item = "Livre magique" if rng.random() < 0.2 else None
         message = "Mémoire parfaite ! Votre créature est impressionnée !"
         success = True
     elif correct >= sequence_length - 1:
         happiness_bonus = 20
         points = correct * 3
-        item = "Jouet" if random.random() < 0.3 else None
+        item = "Jouet" if rng.random() < 0.3 else None
         message = "Presque parfait ! Votre créature est contente."
         success = True
     elif correct >= sequence_length / 2:
@@ -0,0 +1,166 @@
+"""
+Scheduler waking creatures only when one of their thresholds is crossed.
+
+Between two actions a creature's stats decay linearly (models.catch_up),
+so the game time at which the next threshold is crossed can be computed
+in advance: a stat becoming critical (below 20), health reaching 0, or
+the age of the next evolution. The scheduler keeps one predicted crossing
+per creature in a heap and, when game time reaches it, wakes the creature
+by applying the elapsed time (a "wait" action at that exact time), emits
+the alerts, evolutions and deaths, and predicts its next crossing.
+
+The work done is proportional to the number of due crossings, not to the
+number of creatures. Random sickness and events can bring a crossing
+forward; they are only seen when the creature is woken or acted upon,
+every action rescheduling its creature.
+"""
+
+import heapq
+
+from models.catch_up import LOW_THRESHOLD, _decay_rates
+from models.result import Status
+from models.rules import EVOLUTION_AGES
+from utils.clock import HOURS_PER_DAY, SECONDS_PER_HOUR
+
+# Minimal gap between two wake-ups of a creature (do_action ignores gaps below 0.01 hour)
+MIN_STEP_HOURS = 0.02
+
+# Game hours a crossing is predicted past its threshold: the alerts of Creature._check_critical_state
+# need a stat strictly below LOW_THRESHOLD
+CROSSING_MARGIN_HOURS = 1e-6
+
+
+def next_crossing(creature):
+    """
+    Predicts when the creature will cross its next threshold if nothing random happens.
+
+    Args:
+        creature: The creature to inspect
+
+    Returns:
+        float or None: Game hours until the crossing, None if nothing is going to happen
+    """
+    hunger_rate, energy_rate, happiness_rate, health_rate = _decay_rates(creature)
+    hours = None
+
+    for value, rate in ((creature.hunger, hunger_rate), (creature.energy, energy_rate),
+                        (creature.happiness, happiness_rate)):
+        if value >= LOW_THRESHOLD:
+            crossing = (value - LOW_THRESHOLD) / rate + CROSSING_MARGIN_HOURS
+            if hours is None or crossing < hours:
+                hours = crossing
+
+    if health_rate:
+        # Health first becomes critical, then reaches 0
+        if creature.health >= LOW_THRESHOLD:
+            crossing = (creature.health - LOW_THRESHOLD) / health_rate + CROSSING_MARGIN_HOURS
+        else:
+            crossing = creature.health / health_rate
+        if hours is None or crossing < hours:
+            hours = crossing
+
+    evolution_age = EVOLUTION_AGES.get(creature.evolution_stage)
+    if evolution_age is not None:
+        evolution_hours = max(0, (evolution_age - creature.age) * HOURS_PER_DAY)
+        if hours is None or evolution_hours < hours:
+            hours = evolution_hours
+
+    return hours
+
+
+class ThresholdScheduler:
+    """Priority queue of the predicted threshold crossings of the creatures of a game."""
+
+    def __init__(self, game):
+        """
+        Attaches the scheduler to a game and schedules its creatures.
+
+        Args:
+            game (Game): The game; its actions and new creatures are rescheduled automatically
+        """
+        self.game = game
+        self._heap = []
+        self._due = {}  # creature id -> game time of its valid heap entry
+        self._critical = set()
+        game.scheduler = self
+        for record in game.registry:
+            self.schedule(record)
+
+    def __len__(self):
+        return len(self._due)
+
+    def schedule(self, record):
+        """
+        Predicts the next crossing of a creature and queues it, replacing the previous one.
+
+        Args:
+            record (CreatureRecord): Record of the creature
+        """
+        hours = next_crossing(record.creature)
+        if hours is None:
+            self._due.pop(record.creature_id, None)
+            return
+        due = record.last_action + max(hours, MIN_STEP_HOURS) * SECONDS_PER_HOUR
+        self._due[record.creature_id] = due
+        heapq.heappush(self._heap, (due, record.creature_id))
+
+    def next_due(self):
+        """
+        Returns the game time of the next crossing.
+
+        Returns:
+            float or None: Game time in seconds, None if nothing is scheduled
+        """
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)  # outdated entry
+        return heap[0][0] if heap else None
+
+    def run_until(self, now=None):
+        """
+        Wakes, in chronological order, every creature whose crossing is due.
+
+        Args:
+            now (float): Game time to run up to (the clock of the game by default)
+
+        Returns:
+            list: Notifications as dicts with the creature_id, the game time,
+                  the kind ("critical", "evolution" or "death") and a message
+        """
+        game = self.game
+        if now is None:
+            now = game.clock()
+        notifications = []
+
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                return notifications
+            creature_id = heapq.heappop(self._heap)[1]
+            del self._due[creature_id]
+
+            record = game.registry.get(creature_id)
+            if record is None:
+                self._critical.discard(creature_id)
+                continue
+            creature = record.creature
+            stage = creature.evolution_stage
+
+            # Applying the elapsed time at the crossing reschedules the creature
+            result = game.do_actions([{"action": "wait", "creature_id": creature_id}], now=due)[0]
+
+            if result["status"] == Status.DEATH:
+                self._critical.discard(creature_id)
+                notifications.append({"creature_id": creature_id, "time": due, "kind": "death",
+                                      "message": f"{creature.name} est décédé."})
+                continue
+            if creature.evolution_stage != stage:
+                notifications.append({"creature_id": creature_id, "time": due, "kind": "evolution",
+                                      "message": f"{creature.name} a évolué en {creature.evolution_stage} !"})
+            alert = creature._check_critical_state()
+            if alert and creature_id not in self._critical:
+                self._critical.add(creature_id)
+                notifications.append({"creature_id": creature_id, "time": due, "kind": "critical",
+                                      "message": alert})
+            elif not alert:
+                self._critical.discard(creature_id)
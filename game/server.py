@@ -0,0 +1,452 @@
+"""
+Asyncio server exposing the game to many concurrent players.
+
+The protocol is newline-delimited JSON over a local TCP or Unix socket:
+every request is one JSON object on one line, every response too. A
+request has an "op" and, optionally, an "id" echoed in the response and
+the "session" it applies to (by default the last session created or
+loaded on the connection):
+
+    {"id": 1, "op": "create", "name": "Pixel", "type": "dragon"}
+    {"id": 2, "op": "action", "action": "feed", "params": {"food": "premium"}}
+    {"id": 3, "op": "state"}
+
+Responses carry "ok" and either the result of the operation or an
+"error" message:
+
+    {"id": 1, "ok": true, "session": "9f3c...", "result": "Pixel le dragon ..."}
+
+Actions also carry their "status" ("ok", "failed", "death"), the
+"events" that happened and the "deltas" of the stats of the creature.
+
+Operations: options (types, traits and colors), create, load, state,
+action (every non-interactive action of game.actions), shop (catalog and
+points; buying is the "shop" action with a "buy" parameter), close and
+stats (counters of the server and of its sessions).
+
+All the sessions share one Game, each owning one creature of its
+registry, so they share the clock and the weather of the world. Idle
+sessions can be spilled to disk by the session manager (game.sessions)
+and come back transparently on their next request.
+
+The event loop only reads, parses and writes; every operation on the
+Game runs on a single simulation thread, which takes the pending
+requests in batches and hands the results back to the loop in one call,
+so the loop is never blocked by the simulation and the Game is never
+used by two threads at once.
+
+Usage:
+    python -m game.server [--port 8765] [--unix PATH] [--seed 1] [--scale 3600] [--saves DIR]
+                          [--max-sessions N] [--max-memory MIB] [--spill DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import secrets
+import threading
+
+from game.actions import ACTIONS
+from game.game_manager import Game
+from game.headless import INTERACTIVE_ACTIONS
+from game.sessions import SessionManager
+from models.result import Status
+from utils.clock import RealClock, ScaledClock
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Pending connections accepted by the socket (thousands of players may connect at once)
+DEFAULT_BACKLOG = 4096
+
+# Maximum number of requests executed by the simulation thread before handing the results back
+MAX_BATCH = 256
+
+# Maximum length of a request line
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class RequestError(ValueError):
+    """Invalid request, reported to the client in the "error" field."""
+
+
+class GameServer:
+    """Server routing the requests of the players to a shared Game."""
+
+    def __init__(self, game=None, save_dir=".", sessions=None):
+        """
+        Initializes the server.
+
+        Args:
+            game (Game): Game hosting the creatures of every session (a new real-time game by default)
+            save_dir (str): Directory of the save files of the "load" and "save" requests
+            sessions (SessionManager): Sessions of the players (all kept in memory by default)
+        """
+        self.game = game if game is not None else Game()
+        self.save_dir = save_dir
+        self.sessions = sessions if sessions is not None else SessionManager(self.game)
+        self.requests = 0
+        self.errors = 0
+
+        self._operations = {
+            "options": self._options,
+            "create": self._create,
+            "load": self._load,
+            "state": self._state,
+            "action": self._action,
+            "shop": self._shop,
+            "close": self._close,
+            "stats": self._stats,
+        }
+        self._options_payload = {
+            "types": list(self.game.available_types),
+            "traits": dict(self.game.get_available_character_traits()),
+            "colors": {creature_type: list(colors)
+                       for creature_type, colors in self.game.get_available_colors().items()},
+        }
+        self._catalog = [dict(item) for item in self.game._get_shop_catalog()]
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._loop = None
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, backlog=DEFAULT_BACKLOG):
+        """
+        Starts the simulation thread and listens for connections.
+
+        Args:
+            host (str): Address to listen on
+            port (int): TCP port (0 for any free port)
+            path (str): Path of a Unix socket, used instead of TCP if given
+            backlog (int): Maximum number of pending connections
+
+        Returns:
+            The address listened on
+        """
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._simulate, name="simulation", daemon=True)
+        self._thread.start()
+
+        if path:
+            self._server = await asyncio.start_unix_server(self._serve_connection, path, backlog=backlog,
+                                                           limit=MAX_REQUEST_BYTES)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port, backlog=backlog,
+                                                      limit=MAX_REQUEST_BYTES)
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """
+        Serves the connections until the task is cancelled.
+        """
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and stops the simulation thread.
+        """
+        if self._server is not None:
+            self._server.close()
+        if self._thread is not None:
+            self._queue.put(None)
+            await self._loop.run_in_executor(None, self._thread.join)
+            self._thread = None
+
+    def _simulate(self):
+        """
+        Main loop of the simulation thread: executes the queued requests in batches.
+        """
+        get, get_nowait = self._queue.get, self._queue.get_nowait
+        while True:
+            batch = [get()]
+            try:
+                while len(batch) < MAX_BATCH:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+
+            results = []
+            for item in batch:
+                if item is None:
+                    self._loop.call_soon_threadsafe(self._resolve, results)
+                    return
+                future, function, args = item
+                try:
+                    results.append((future, function(*args), None))
+                except Exception as error:
+                    results.append((future, None, error))
+            self._loop.call_soon_threadsafe(self._resolve, results)
+
+    @staticmethod
+    def _resolve(results):
+        """
+        Hands the results of a batch back to the waiting requests (on the event loop).
+
+        Args:
+            results (list): (future, value, exception) tuples
+        """
+        for future, value, error in results:
+            if future.cancelled():
+                continue
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+
+    def call(self, function, *args):
+        """
+        Runs a function on the simulation thread.
+
+        Args:
+            function (callable): Function using the game
+            *args: Its arguments
+
+        Returns:
+            asyncio.Future: Result of the function
+        """
+        future = self._loop.create_future()
+        self._queue.put((future, function, args))
+        return future
+
+    async def _serve_connection(self, reader, writer):
+        """
+        Answers the requests of one connection, in order.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming requests
+            writer (asyncio.StreamWriter): Outgoing responses
+        """
+        session_id = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(self._encode({"ok": False, "error": "Requête trop longue."}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response, session_id = await self.handle(line, session_id)
+                writer.write(self._encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, line, session_id=None):
+        """
+        Answers one request.
+
+        Args:
+            line (bytes): JSON request
+            session_id (str): Session used when the request does not name one
+
+        Returns:
+            tuple: Response (dict) and session of the connection after the request
+        """
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("La requête doit être un objet JSON.")
+            request_id = request.get("id")
+            operation = self._operations.get(request.get("op"))
+            if operation is None:
+                raise RequestError(f"Opération inconnue : {request.get('op')}.")
+            session_id, payload = await self.call(operation, request.get("session", session_id), request)
+        except Exception as error:
+            self.errors += 1
+            if isinstance(error, RequestError):
+                message = str(error)
+            elif isinstance(error, json.JSONDecodeError):
+                message = "JSON invalide."
+            else:
+                message = f"Requête invalide : {error}"
+            return {"id": request_id, "ok": False, "error": message}, session_id
+
+        response = {"id": request_id, "ok": True, "session": session_id}
+        response.update(payload)
+        return response, session_id
+
+    @staticmethod
+    def _encode(response):
+        """
+        Encodes a response as one line of JSON.
+
+        Args:
+            response (dict): The response
+
+        Returns:
+            bytes: Encoded line
+        """
+        return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    # Operations, executed on the simulation thread: (session id, request) -> (session id, payload)
+
+    def _creature_id(self, session_id):
+        """
+        Returns the creature of a session.
+
+        Args:
+            session_id (str): Id of the session
+
+        Returns:
+            int: Id of the creature
+        """
+        if session_id not in self.sessions:
+            raise RequestError("Session inconnue. Créez ou chargez d'abord une créature.")
+        creature_id = self.sessions.creature_id(session_id)
+        record = self.game.registry.get(creature_id) if creature_id is not None else None
+        if record is None or record.owner != session_id:
+            self.sessions.attach(session_id, None)
+            raise RequestError("Aucune créature vivante dans cette session.")
+        return creature_id
+
+    def _save_path(self, filename):
+        """
+        Returns the path of a save file, which must be a plain file name.
+
+        Args:
+            filename (str): Name of the file
+
+        Returns:
+            str: Path of the file in the save directory
+        """
+        if (not isinstance(filename, str) or not filename or filename in (".", "..")
+                or os.path.basename(filename) != filename):
+            raise RequestError("Nom de fichier invalide.")
+        return os.path.join(self.save_dir, filename)
+
+    def _options(self, session_id, request):
+        return session_id, self._options_payload
+
+    def _create(self, session_id, request):
+        name, creature_type = request.get("name"), request.get("type")
+        if not name or not creature_type:
+            raise RequestError("Le nom et le type de la créature sont nécessaires.")
+        if session_id not in self.sessions:
+            session_id = secrets.token_hex(8)
+
+        game = self.game
+        game.deactivate()
+        result = game.create_creature(name, creature_type, request.get("color", "standard"),
+                                      request.get("trait", "normal"), owner=session_id)
+        if result.status != Status.OK:
+            raise RequestError(result.message)
+        self.sessions.attach(session_id, result.value)
+        return session_id, {"result": result.message}
+
+    def _load(self, session_id, request):
+        path = self._save_path(request.get("filename", "sauvegarde.json"))
+        if session_id not in self.sessions:
+            session_id = secrets.token_hex(8)
+
+        game = self.game
+        game.deactivate()
+        result = game.load_creature(path, owner=session_id)
+        if result.status != Status.OK:
+            raise RequestError(result.message)
+        self.sessions.attach(session_id, result.value)
+        return session_id, {"result": result.message}
+
+    def _state(self, session_id, request):
+        game = self.game
+        game.select_creature(self._creature_id(session_id))
+        weather = game.get_current_weather()
+        return session_id, {"state": game.get_creature_state(), "weather": dict(weather) if weather else None}
+
+    def _action(self, session_id, request):
+        action = request.get("action")
+        if action not in ACTIONS or action in INTERACTIVE_ACTIONS:
+            raise RequestError(f"Action inconnue ou interactive : {action}.")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise RequestError("Les paramètres de l'action doivent être un objet JSON.")
+        if action == "save":
+            params = dict(params, filename=self._save_path(params.get("filename", "sauvegarde.json")))
+
+        creature_id = self._creature_id(session_id)
+        result = self.game.do_actions([dict(params, action=action, creature_id=creature_id)])[0]["result"]
+        if result.status == Status.DEATH:
+            self.sessions.attach(session_id, None)
+        return session_id, {"status": result.status, "result": result.message,
+                            "events": result.events, "deltas": result.deltas}
+
+    def _shop(self, session_id, request):
+        points = None
+        if session_id in self.sessions:
+            creature_id = self.sessions.creature_id(session_id)
+            record = self.game.registry.get(creature_id) if creature_id is not None else None
+            if record is not None and record.owner == session_id:
+                points = record.creature.game_points
+        return session_id, {"catalog": self._catalog, "points": points}
+
+    def _close(self, session_id, request):
+        self.sessions.close(session_id)
+        return None, {}
+
+    def _stats(self, session_id, request):
+        return session_id, {"requests": self.requests, "errors": self.errors, "sessions": self.sessions.stats()}
+
+
+async def serve(server, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, ready=None):
+    """
+    Runs a server until the task is cancelled.
+
+    Args:
+        server (GameServer): The server
+        host (str): Address to listen on
+        port (int): TCP port (0 for any free port)
+        path (str): Path of a Unix socket, used instead of TCP if given
+        ready (callable): Called with the address listened on once the server accepts connections
+    """
+    address = await server.start(host, port, path)
+    if ready is not None:
+        ready(address)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Serveur JSON (une requête par ligne) du simulateur de créatures.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="écoute sur ce socket Unix plutôt qu'en TCP")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--scale", type=float, default=1,
+                        help="secondes de jeu par seconde réelle (3600 : une seconde vaut une heure)")
+    parser.add_argument("--saves", default=".", help="dossier des sauvegardes")
+    parser.add_argument("--max-sessions", type=int, help="nombre maximal de sessions gardées en mémoire")
+    parser.add_argument("--max-memory", type=float, help="mémoire maximale (estimée, en Mio) des sessions en mémoire")
+    parser.add_argument("--spill", help="dossier où sont écrites les sessions inactives")
+    args = parser.parse_args()
+
+    clock = ScaledClock(args.scale) if args.scale != 1 else RealClock()
+    game = Game(args.seed, clock)
+    max_bytes = int(args.max_memory * 1024 * 1024) if args.max_memory else None
+    sessions = SessionManager(game, args.spill, args.max_sessions, max_bytes)
+    server = GameServer(game, save_dir=args.saves, sessions=sessions)
+
+    def ready(address):
+        print(f"Serveur à l'écoute sur {address}")
+
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix, ready))
+    except KeyboardInterrupt:
+        print(f"Arrêt du serveur après {server.requests} requêtes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Session manager keeping the hot sessions of a server in memory.
+
+A session owns at most one creature of a shared Game. Sessions are kept
+in least recently used order; when the number of resident sessions or
+their estimated memory exceeds the budget, the idle ones are evicted:
+their creature is written with Creature.save in the binary save format
+(so a spilled session is an ordinary save file) and removed from the
+game. The next request of an evicted session loads the creature back and
+applies the game time elapsed since its last action, as if it had never
+left.
+"""
+
+import os
+import tempfile
+from collections import OrderedDict
+from itertools import islice
+
+from models.creature import Creature
+from models.result import Status
+from models.save_format import BINARY_EXTENSION
+
+# Estimated memory of a resident session: record, creature, random streams and LRU entry
+# (measured with tracemalloc), plus the growth of its friends and inventory
+SESSION_BYTES = 1024
+FRIEND_BYTES = 80
+ITEM_BYTES = 8
+
+
+class _Evicted:
+    """What is left in memory of an evicted session."""
+
+    __slots__ = ("path", "last_action", "weather_day")
+
+    def __init__(self, path=None, last_action=None, weather_day=None):
+        self.path = path
+        self.last_action = last_action
+        self.weather_day = weather_day
+
+
+class SessionManager:
+    """Sessions of a game, resident in memory within a budget and spilled to disk beyond it."""
+
+    def __init__(self, game, spill_dir=None, max_resident=None, max_bytes=None):
+        """
+        Initializes the manager.
+
+        Args:
+            game (Game): Game hosting the creatures of the sessions
+            spill_dir (str): Directory of the evicted sessions (a temporary directory by default)
+            max_resident (int): Maximum number of sessions in memory (None for no limit)
+            max_bytes (int): Maximum estimated memory of the sessions in memory (None for no limit)
+        """
+        self.game = game
+        self.spill_dir = spill_dir
+        self.max_resident = max_resident
+        self.max_bytes = max_bytes
+        self._resident = OrderedDict()  # session id -> creature id, least recently used first
+        self._sizes = {}  # session id -> estimated bytes
+        self._evicted = {}  # session id -> _Evicted
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, session_id):
+        return session_id in self._resident or session_id in self._evicted
+
+    def __len__(self):
+        return len(self._resident) + len(self._evicted)
+
+    def stats(self):
+        """
+        Returns the counters of the manager.
+
+        Returns:
+            dict: Sessions, resident sessions and bytes, hits, misses and evictions
+        """
+        return {
+            "sessions": len(self),
+            "resident": len(self._resident),
+            "resident_bytes": self.resident_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def creature_id(self, session_id):
+        """
+        Returns the creature of a session, loading it back if the session was evicted.
+
+        Args:
+            session_id (str): Id of the session
+
+        Returns:
+            int or None: Id of the creature, None if the session has no living creature
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        resident = self._resident
+        if session_id in resident:
+            self.hits += 1
+            resident.move_to_end(session_id)
+            creature_id = resident[session_id]
+        else:
+            evicted = self._evicted.pop(session_id)
+            self.misses += 1
+            creature_id = resident[session_id] = self._rehydrate(session_id, evicted)
+        self._account(session_id)
+        return creature_id
+
+    def attach(self, session_id, creature_id):
+        """
+        Makes a creature the creature of a session (creating the session if needed),
+        removing the previous creature of the session from the game.
+
+        Args:
+            session_id (str): Id of the session
+            creature_id (int): Id of the creature (None once it died)
+        """
+        evicted = self._evicted.pop(session_id, None)
+        if evicted is not None:
+            self._discard(evicted)
+        previous = self._resident.get(session_id)
+        if previous is not None and previous != creature_id:
+            record = self.game.registry.get(previous)
+            if record is not None and record.owner == session_id:
+                self.game.remove_creature(previous)
+        self._resident[session_id] = creature_id
+        self._resident.move_to_end(session_id)
+        self._account(session_id)
+
+    def close(self, session_id):
+        """
+        Forgets a session and removes its creature from the game.
+
+        Args:
+            session_id (str): Id of the session
+        """
+        if session_id in self._evicted:
+            self._discard(self._evicted.pop(session_id))
+        elif session_id in self._resident:
+            self.attach(session_id, None)
+            del self._resident[session_id]
+            self.resident_bytes -= self._sizes.pop(session_id)
+
+    def evict(self, session_id):
+        """
+        Writes a resident session to disk and removes its creature from the game.
+
+        Args:
+            session_id (str): Id of the session
+
+        Returns:
+            bool: True if the session was evicted, False if its creature could not be
+                  saved (the session stays resident)
+        """
+        creature_id = self._resident[session_id]
+        record = self.game.registry.get(creature_id) if creature_id is not None else None
+        if record is None or record.owner != session_id:
+            evicted = _Evicted()
+        else:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="sessions-")
+            path = os.path.join(self.spill_dir, f"{session_id}{BINARY_EXTENSION}")
+            if record.creature.save(path).status != Status.OK:
+                return False
+            evicted = _Evicted(path, record.last_action, record.last_weather_update)
+            self.game.remove_creature(creature_id)
+
+        del self._resident[session_id]
+        self.resident_bytes -= self._sizes.pop(session_id)
+        self._evicted[session_id] = evicted
+        self.evictions += 1
+        return True
+
+    def _account(self, session_id):
+        """
+        Updates the estimated memory of a resident session and evicts the idle
+        sessions while the budget is exceeded.
+
+        Args:
+            session_id (str): Id of the session just used
+        """
+        creature_id = self._resident[session_id]
+        record = self.game.registry.get(creature_id) if creature_id is not None else None
+        size = 0
+        if record is not None:
+            creature = record.creature
+            size = SESSION_BYTES + FRIEND_BYTES * len(creature.friends) + ITEM_BYTES * len(creature.inventory)
+        self.resident_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+
+        # The sessions that could not be saved stay first and are skipped
+        resident = self._resident
+        skipped = 0
+        while len(resident) - skipped > 1 and (
+                (self.max_resident is not None and len(resident) > self.max_resident)
+                or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)):
+            if not self.evict(next(islice(resident, skipped, None))):
+                skipped += 1
+
+    def _rehydrate(self, session_id, evicted):
+        """
+        Loads the creature of an evicted session back into the game and applies the elapsed time.
+
+        Args:
+            session_id (str): Id of the session
+            evicted (_Evicted): What was kept of the session
+
+        Returns:
+            int or None: Id of the creature, None if it has none or died meanwhile
+        """
+        if evicted.path is None:
+            return None
+        creature = Creature.load(evicted.path)
+        self._discard(evicted)
+        if creature is None:
+            return None
+
+        # If the save was loaded by another session meanwhile, the creature gets a new id
+        game = self.game
+        creature_id = game.add_creature(creature, owner=session_id, last_action=evicted.last_action,
+                                        weather_day=evicted.weather_day, activate=False, renumber=True)
+
+        # The time elapsed while the session was on disk is applied now
+        result = game.do_actions([{"action": "wait", "creature_id": creature_id}])[0]
+        return None if result["status"] == Status.DEATH else creature_id
+
+    @staticmethod
+    def _discard(evicted):
+        """
+        Deletes the file of an evicted session.
+
+        Args:
+            evicted (_Evicted): The evicted session
+        """
+        if evicted.path is not None:
+            try:
+                os.remove(evicted.path)
+            except OSError:
+                pass
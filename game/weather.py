@@ -0,0 +1,122 @@
+"""
+Module providing the weather calendar shared by the creatures of a world.
+
+The weather of game-day N is drawn from its own random stream, derived
+from the seed of the world and N, so it is the same for every creature,
+every process and every run with the same seed, whatever the order in
+which days are requested. Days are memoized in a bounded LRU cache and
+can be precomputed in bulk.
+"""
+
+from collections import OrderedDict
+
+from game.events import generate_random_weather
+from utils.clock import HOURS_PER_DAY, SECONDS_PER_HOUR
+from utils.rng import RngStream
+
+SECONDS_PER_DAY = HOURS_PER_DAY * SECONDS_PER_HOUR
+
+# Number of days kept in memory by default
+DEFAULT_CACHE_SIZE = 4096
+
+
+class WeatherCalendar:
+    """Deterministic weather of every game day, memoized in an LRU cache."""
+
+    def __init__(self, seed=None, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Initializes the calendar.
+
+        Args:
+            seed: Root seed of the world (None for a non reproducible calendar)
+            cache_size (int): Maximum number of days kept in memory
+        """
+        self.seed = seed
+        self.cache_size = cache_size
+        self._stream = RngStream(seed, "weather")
+        self._days = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._days)
+
+    @staticmethod
+    def day_of(game_time):
+        """
+        Returns the game day containing a game time.
+
+        Args:
+            game_time (float): Game time in seconds
+
+        Returns:
+            int: Number of the day
+        """
+        return int(game_time // SECONDS_PER_DAY)
+
+    def weather_for_day(self, day):
+        """
+        Returns the weather of a game day.
+
+        Args:
+            day (int): Number of the day
+
+        Returns:
+            MappingProxyType: Weather of the day (shared, read-only)
+        """
+        days = self._days
+        weather = days.get(day)
+        if weather is not None:
+            self.hits += 1
+            days.move_to_end(day)
+            return weather
+
+        self.misses += 1
+        weather = days[day] = generate_random_weather(self._stream.split(day))
+        if len(days) > self.cache_size:
+            days.popitem(last=False)
+        return weather
+
+    def precompute(self, first_day, last_day):
+        """
+        Computes a range of days in advance.
+
+        Args:
+            first_day (int): First day
+            last_day (int): Last day (included)
+
+        Returns:
+            list: Weather of every day of the range
+        """
+        return [self.weather_for_day(day) for day in range(first_day, last_day + 1)]
+
+    def happiness_effects(self, first_day, last_day):
+        """
+        Returns the happiness effects of a range of days.
+
+        Args:
+            first_day (int): First day
+            last_day (int): Last day (included)
+
+        Returns:
+            list: Happiness effect of every day of the range
+        """
+        return [weather["happiness_effect"] for weather in self.precompute(first_day, last_day)]
+
+    def apply(self, population, day):
+        """
+        Applies the happiness effect of a day to every living creature of a population at once.
+
+        Args:
+            population (CreaturePopulation): The creatures
+            day (int): Number of the day
+
+        Returns:
+            MappingProxyType: Weather of the day
+        """
+        import numpy as np
+
+        weather = self.weather_for_day(day)
+        alive = population.alive
+        population.happiness[alive] = np.clip(population.happiness[alive] + weather["happiness_effect"], 0, 100)
+        return weather
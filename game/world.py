@@ -0,0 +1,273 @@
+"""
+World simulator sharding a large population of creatures across worker processes.
+
+Each worker owns shards of CreaturePopulation (so the rules are those of
+models.population, which mirror Creature and read models.rules and the
+compiled event tables) and advances them in lockstep game ticks. Only
+aggregated results travel back to the parent: ids of the creatures that
+died, evolved or fell sick, and the critical alerts.
+
+Every worker derives the same weather calendar (game.weather) from the
+world seed, and applies the weather of each new game day to its whole
+shard at once.
+
+Creature streams are derived from the world seed and the creature id, so
+the results are identical whatever the number of workers.
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from game.weather import WeatherCalendar
+from models.population import CreaturePopulation
+from utils.clock import HOURS_PER_DAY
+
+# Below this value a stat is critical (same threshold as Creature._check_critical_state)
+CRITICAL_THRESHOLD = 20
+
+
+class _Shard:
+    """Populations owned by one worker, with the critical state of their creatures."""
+
+    def __init__(self, seed):
+        """
+        Initializes an empty shard.
+
+        Args:
+            seed (int): Root seed of the world
+        """
+        self.seed = seed
+        self.populations = []
+        self.critical = []
+        self.calendar = WeatherCalendar(seed)
+        self.hours = 0.0  # Game hours elapsed since the start of the world
+
+    def add(self, count, creature_type, color, character_trait, first_id):
+        """
+        Spawns newborn creatures in the shard.
+
+        Args:
+            count (int): Number of creatures
+            creature_type (str): Type of the creatures
+            color (str): Color of the creatures
+            character_trait (str): Character trait of the creatures
+            first_id (int): Id of the first creature, the next ones being consecutive
+        """
+        population = CreaturePopulation.spawn(count, creature_type, color, character_trait,
+                                              seed=self.seed, first_id=first_id)
+        self.populations.append(population)
+        self.critical.append(np.zeros(count, dtype=bool))
+
+    def tick(self, hours):
+        """
+        Advances every population of the shard.
+
+        Args:
+            hours (float): Number of game hours of the tick
+
+        Returns:
+            dict: Aggregated results of the tick
+        """
+        result = {"deaths": [], "evolutions": [], "fell_sick": [], "new_critical": [],
+                  "critical": 0, "alive": 0, "events": 0}
+
+        # Game days starting during the tick
+        first_day = int(self.hours // HOURS_PER_DAY) + 1
+        self.hours += hours
+        new_days = range(first_day, int(self.hours // HOURS_PER_DAY) + 1)
+
+        for index, population in enumerate(self.populations):
+            report = population.pass_time(hours)
+            for day in new_days:
+                self.calendar.apply(population, day)
+            ids = population.ids
+            result["deaths"].extend(ids[i] for i in report["deaths"])
+            result["evolutions"].extend(ids[i] for i in report["evolved"])
+            result["fell_sick"].extend(ids[i] for i in report["fell_sick"])
+            result["events"] += report["events"]
+
+            # Alerts are only sent when a creature becomes critical
+            critical = population.alive & ((population.hunger < CRITICAL_THRESHOLD)
+                                           | (population.energy < CRITICAL_THRESHOLD)
+                                           | (population.happiness < CRITICAL_THRESHOLD)
+                                           | (population.health < CRITICAL_THRESHOLD)
+                                           | population.is_sick)
+            result["new_critical"].extend(ids[i] for i in np.flatnonzero(critical & ~self.critical[index]))
+            self.critical[index] = critical
+            result["critical"] += int(critical.sum())
+            result["alive"] += int(population.alive.sum())
+
+        return result
+
+    def creatures(self):
+        """
+        Rebuilds the creatures of the shard.
+
+        Returns:
+            list: Creature objects of every population
+        """
+        return [creature for population in self.populations for creature in population.to_creatures()]
+
+
+def _worker_loop(connection, seed):
+    """
+    Main loop of a worker process: executes the commands sent by the parent.
+
+    Args:
+        connection: End of the pipe connected to the parent
+        seed (int): Root seed of the world
+    """
+    shard = _Shard(seed)
+    while True:
+        command, args = connection.recv()
+        if command == "add":
+            shard.add(*args)
+            connection.send(None)
+        elif command == "tick":
+            connection.send(shard.tick(*args))
+        elif command == "creatures":
+            connection.send(shard.creatures())
+        elif command == "stop":
+            connection.close()
+            return
+
+
+class WorldSimulator:
+    """Class advancing a sharded population of creatures in lockstep ticks."""
+
+    def __init__(self, seed=0, workers=None):
+        """
+        Initializes the world and starts its long-lived worker processes.
+
+        Args:
+            seed (int): Root seed of the creatures' random streams
+            workers (int): Number of worker processes (number of CPUs by default,
+                           0 to simulate in the current process)
+        """
+        self.seed = seed
+        self.workers = multiprocessing.cpu_count() if workers is None else workers
+        self.next_creature_id = 1
+        self.ticks = 0
+        self.hours = 0.0
+        self._connections = []
+        self._processes = []
+        self._local_shard = None
+
+        if self.workers == 0:
+            self._local_shard = _Shard(seed)
+            return
+
+        for _ in range(self.workers):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker_loop, args=(child_end, seed), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _broadcast(self, commands):
+        """
+        Sends one command per worker and waits for every answer.
+
+        Args:
+            commands (list): (command, args) tuples, one per worker
+
+        Returns:
+            list: Answers of the workers, in the same order
+        """
+        if self._local_shard is not None:
+            return [getattr(self._local_shard, command)(*args) for command, args in commands]
+        for connection, command in zip(self._connections, commands):
+            connection.send(command)
+        return [connection.recv() for connection in self._connections]
+
+    def add_creatures(self, count, creature_type, color="standard", character_trait="normal"):
+        """
+        Adds newborn creatures to the world, spread evenly over the workers.
+
+        Args:
+            count (int): Number of creatures
+            creature_type (str): Type of the creatures
+            color (str): Color of the creatures
+            character_trait (str): Character trait of the creatures
+
+        Returns:
+            range: Ids of the new creatures
+        """
+        ids = range(self.next_creature_id, self.next_creature_id + count)
+        shards = max(1, self.workers)
+        commands = []
+        first_id = self.next_creature_id
+        for shard in range(shards):
+            shard_count = count // shards + (1 if shard < count % shards else 0)
+            commands.append(("add", (shard_count, creature_type, color, character_trait, first_id)))
+            first_id += shard_count
+        self._broadcast(commands)
+        self.next_creature_id += count
+        return ids
+
+    def tick(self, hours=1):
+        """
+        Advances every creature by one game tick, on all workers in parallel.
+
+        Args:
+            hours (float): Game hours per tick
+
+        Returns:
+            dict: Ids of the creatures that died, evolved, fell sick or became critical,
+                  and the numbers of critical and living creatures
+        """
+        results = self._broadcast([("tick", (hours,))] * max(1, self.workers))
+        self.ticks += 1
+        self.hours += hours
+
+        merged = {"deaths": [], "evolutions": [], "fell_sick": [], "new_critical": [],
+                  "critical": 0, "alive": 0, "events": 0}
+        for result in results:
+            for key, value in result.items():
+                merged[key] += value
+        for key in ("deaths", "evolutions", "fell_sick", "new_critical"):
+            merged[key].sort()
+        return merged
+
+    def run(self, ticks, hours=1):
+        """
+        Advances the world by several ticks.
+
+        Args:
+            ticks (int): Number of ticks
+            hours (float): Game hours per tick
+
+        Returns:
+            list: Result of every tick
+        """
+        return [self.tick(hours) for _ in range(ticks)]
+
+    def creatures(self):
+        """
+        Gathers every creature of the world as Creature objects (expensive, for inspection).
+
+        Returns:
+            list: Creatures sorted by id
+        """
+        shards = self._broadcast([("creatures", ())] * max(1, self.workers))
+        return sorted((creature for shard in shards for creature in shard), key=lambda creature: creature.creature_id)
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        for connection in self._connections:
+            connection.send(("stop", ()))
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
@@ -3,22 +3,56 @@ Virtual Creature Simulator
 Main entry point of the program
 """
 
-import random
+import argparse
+import os
 from game.game_manager import Game
+from game.journal import Journal, recover
+from utils.clock import RealClock
 from ui.menu import main_menu, actions_menu, mini_games_menu, objects_menu, shop_menu, customization_menu, food_menu
-from ui.display import display_state, display_home, display_help
+from ui.display import display_state, display_home, display_help, subscribe_terminal
+from models.result import Status
+from utils.event_bus import bus
 
-def play():
+def play(seed=None, journal_directory=None):
     """
     Main function that runs the game.
     Presents menus and manages the game flow.
+    
+    Args:
+        seed (int): Root seed of the random streams (None for a different game every time)
+        journal_directory (str): Directory of the journal restoring the game after a crash (None for no journal)
     """
-    game = Game()
+    game = None
+    if journal_directory:
+        recovered, report = recover(journal_directory, clock=RealClock())
+        if recovered is not None and recovered.creature is not None:
+            answer = input(f"Une partie a été trouvée dans le journal {journal_directory} "
+                           f"({report['entries']} entrées). La restaurer ? (o/n) ")
+            # Otherwise the new game starts a new generation of the journal and the old one is deleted later
+            if answer.strip().lower() in ("o", "oui"):
+                game = recovered
+    if game is None:
+        # A journaled game needs a seed to draw the same random numbers again when it is replayed
+        if seed is None and journal_directory:
+            seed = int.from_bytes(os.urandom(8), "little")
+        game = Game(seed)
+    journal = None
+    if journal_directory:
+        # Interactive actions are rare: every one is written at once
+        journal = Journal(journal_directory, batch_size=1)
+        journal.attach(game)
     quit_game = False
     
+    # Evolution and death screens
+    subscribe_terminal(bus)
+    
     # Display welcome
     display_home()
     
+    if game.creature is not None:
+        print(f"Partie restaurée depuis le journal ({report['entries']} entrées rejouées).")
+        manage_actions(game)
+    
     while not quit_game:
         choice = main_menu()
         
@@ -42,7 +76,7 @@ def play():
             result = game.create_creature(name, creature_type, customization["color"], customization["trait"])
             print(result)
             
-            if "a été créé" in result:
+            if result.status == Status.OK:
                 # If creation succeeded, display actions menu
                 manage_actions(game)
         
@@ -55,7 +89,7 @@ def play():
             result = game.load_creature(filename)
             print(result)
             
-            if "a été chargé" in result:
+            if result.status == Status.OK:
                 # If loading succeeded, display actions menu
                 manage_actions(game)
         
@@ -66,6 +100,9 @@ def play():
         
         else:
             print("Choix invalide. Veuillez réessayer.")
+    
+    if journal is not None:
+        journal.detach()
 
 
 def manage_actions(game):
@@ -84,7 +121,7 @@ def manage_actions(game):
             result = game.do_action("feed", food=food)
             print(result)
             # Check if creature died
-            if "décédée" in result:
+            if result.status == Status.DEATH:
                 continue_actions = False
         
         elif action_choice == "2":  # Play
@@ -94,7 +131,7 @@ def manage_actions(game):
                 result = game.do_action("play", duration=duration)
                 print(result)
                 # Check if creature died
-                if "décédée" in result:
+                if result.status == Status.DEATH:
                     continue_actions = False
             except ValueError:
                 print("Durée invalide. Veuillez entrer un nombre.")
@@ -106,7 +143,7 @@ def manage_actions(game):
                 result = game.do_action("sleep", duration=duration)
                 print(result)
                 # Check if creature died
-                if "décédée" in result:
+                if result.status == Status.DEATH:
                     continue_actions = False
             except ValueError:
                 print("Durée invalide. Veuillez entrer un nombre.")
@@ -115,7 +152,7 @@ def manage_actions(game):
             result = game.do_action("heal")
             print(result)
             # Check if creature died
-            if "décédée" in result:
+            if result.status == Status.DEATH:
                 continue_actions = False
         
         elif action_choice == "5":  # Display state
@@ -135,7 +172,7 @@ def manage_actions(game):
             result = game.do_action("explore")
             print(result)
             # Check if creature died
-            if "décédée" in result:
+            if result.status == Status.DEATH:
                 continue_actions = False
         
         elif action_choice == "8":  # Meet another creature
@@ -147,17 +184,13 @@ def manage_actions(game):
             
             print(f"Types disponibles: {', '.join(possible_types)}")
             other_type = input("Type de créature à rencontrer (laissez vide pour aléatoire): ")
-            if not other_type:
-                other_type = random.choice(possible_types)
-            
             other_name = input(f"Nom de la créature à rencontrer (laissez vide pour aléatoire): ")
-            if not other_name:
-                other_name = f"{other_type.capitalize()}-{random.randint(1, 100)}"
             
+            # Empty answers are drawn at random by the game, from the creature's stream
             result = game.do_action("meet", type=other_type, name=other_name)
             print(result)
             # Check if creature died
-            if "décédée" in result:
+            if result.status == Status.DEATH:
                 continue_actions = False
         
         elif action_choice == "9":  # Mini-games
@@ -166,7 +199,7 @@ def manage_actions(game):
                 result = game.do_action("play_mini_game", game=chosen_game)
                 print(result)
                 # Check if creature died
-                if "décédée" in result:
+                if result.status == Status.DEATH:
                     continue_actions = False
         
         elif action_choice == "10":  # Inventory and items
@@ -176,7 +209,7 @@ def manage_actions(game):
                 result = game.do_action("use_object", item=chosen_item)
                 print(result)
                 # Check if creature died
-                if "décédée" in result:
+                if result.status == Status.DEATH:
                     continue_actions = False
         
         elif action_choice == "11":  # Shop
@@ -204,4 +237,10 @@ def manage_actions(game):
 
 
 if __name__ == "__main__":
-    play()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simulateur de créature virtuelle")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine aléatoire, pour rejouer exactement la même partie")
+    parser.add_argument("--journal", default=None, metavar="REPERTOIRE",
+                        help="journaliser la partie dans ce répertoire, pour la restaurer après un arrêt brutal")
+    args = parser.parse_args()
+    play(args.seed, args.journal)
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+Catch-up engine advancing a creature across long periods of time.
+
+Creature.pass_time applies its decay in one step and rolls sickness and
+random events once, whatever the number of hours. This module treats the
+same rules as a continuous process instead: stats decay linearly between
+two stochastic events, sickness and random events arrive as Poisson
+processes, and the effects of _update_state become extra decay rates
+while their condition holds. The work done is proportional to the number
+of events and threshold crossings, not to the number of hours.
+"""
+
+from game.events import draw_event
+from models.result import DEATH, ActionResult, Status
+from models.rules import EVOLUTION_AGES
+from utils.clock import HOURS_PER_DAY, hours_to_days
+from utils.event_bus import FELL_SICK, bus
+
+# Hourly decay rates used by Creature.pass_time
+HUNGER_DECAY = 3
+ENERGY_DECAY = 2
+HAPPINESS_DECAY = 2
+
+# Hourly penalties applied by Creature._update_state
+LOW_THRESHOLD = 20
+LOW_HUNGER_HEALTH_LOSS = 5
+LOW_ENERGY_HAPPINESS_LOSS = 5
+SICK_ENERGY_LOSS = 2
+SICK_HAPPINESS_LOSS = 2
+
+# Hourly probabilities of Creature.pass_time, used as Poisson rates
+SICKNESS_RATE = 0.05
+EVENT_RATE = 0.1
+SICKNESS_HEALTH_LOSS = 10
+
+# Above this number of random events, they are summarized instead of listed
+MAX_LISTED_EVENTS = 3
+
+
+def _decay_rates(creature):
+    """
+    Returns the current hourly decay rates of the creature.
+
+    Args:
+        creature: The creature to inspect
+
+    Returns:
+        tuple: Decay rates of hunger, energy, happiness and health
+    """
+    energy_rate = ENERGY_DECAY
+    happiness_rate = HAPPINESS_DECAY
+    health_rate = 0
+
+    if creature.hunger <= LOW_THRESHOLD:
+        health_rate += LOW_HUNGER_HEALTH_LOSS
+    if creature.energy <= LOW_THRESHOLD:
+        happiness_rate += LOW_ENERGY_HAPPINESS_LOSS
+    if creature.is_sick:
+        energy_rate += SICK_ENERGY_LOSS
+        happiness_rate += SICK_HAPPINESS_LOSS
+
+    return HUNGER_DECAY, energy_rate, happiness_rate, health_rate
+
+
+def catch_up(creature, hours):
+    """
+    Advances a creature by an arbitrary number of hours.
+
+    Args:
+        creature: The creature to advance
+        hours (float): Number of hours elapsed
+
+    Returns:
+        ActionResult: Summary of what happened (DEATH if the creature died)
+    """
+    remaining = hours
+    notable = []
+    events = []
+
+    sickness_rng = creature.rng.child("sickness")
+    events_rng = creature.rng.child("events")
+    
+    # Arrival times are memoryless, so they are only drawn again once consumed
+    next_sickness = sickness_rng.expovariate(SICKNESS_RATE) if not creature.is_sick else None
+    next_event = events_rng.expovariate(EVENT_RATE)
+
+    while remaining > 0:
+        hunger_rate, energy_rate, happiness_rate, health_rate = _decay_rates(creature)
+
+        # Find the first thing that happens in this linear segment
+        step = remaining
+        cause = None
+        if next_sickness is not None and next_sickness < step:
+            step, cause = next_sickness, "sickness"
+        if next_event < step:
+            step, cause = next_event, "event"
+        if creature.hunger > LOW_THRESHOLD and (creature.hunger - LOW_THRESHOLD) / hunger_rate < step:
+            step, cause = (creature.hunger - LOW_THRESHOLD) / hunger_rate, "low_hunger"
+        if creature.energy > LOW_THRESHOLD and (creature.energy - LOW_THRESHOLD) / energy_rate < step:
+            step, cause = (creature.energy - LOW_THRESHOLD) / energy_rate, "low_energy"
+        if health_rate and creature.health / health_rate < step:
+            step, cause = creature.health / health_rate, "death"
+        evolution_age = EVOLUTION_AGES.get(creature.evolution_stage)
+        if evolution_age is not None and (evolution_age - creature.age) * HOURS_PER_DAY < step:
+            step, cause = max(0, (evolution_age - creature.age) * HOURS_PER_DAY), "evolution"
+
+        # Apply the linear decay up to the end of the segment
+        creature.hunger = max(0, creature.hunger - hunger_rate * step)
+        creature.energy = max(0, creature.energy - energy_rate * step)
+        creature.happiness = max(0, creature.happiness - happiness_rate * step)
+        creature.health = max(0, creature.health - health_rate * step)
+        creature.age += hours_to_days(step)
+        remaining -= step
+        if next_sickness is not None:
+            next_sickness -= step
+        next_event -= step
+
+        if cause == "low_hunger":
+            creature.hunger = LOW_THRESHOLD
+        elif cause == "low_energy":
+            creature.energy = LOW_THRESHOLD
+        elif cause == "evolution":
+            creature.age = max(creature.age, evolution_age)
+            notable.append(creature._check_evolution())
+        elif cause == "sickness":
+            creature.is_sick = True
+            creature.health = max(0, creature.health - SICKNESS_HEALTH_LOSS)
+            next_sickness = None
+            bus.publish(FELL_SICK, creature=creature)
+            notable.append(ActionResult(Status.OK, "{name} est tombé malade !", {"name": creature.name}, (FELL_SICK,)))
+        elif cause == "event":
+            event = draw_event(creature, events_rng)
+            event.apply(creature)
+            events.append(event)
+            next_event = events_rng.expovariate(EVENT_RATE)
+
+        if creature.health <= 0:
+            creature.health = 0
+            return DEATH
+
+    if len(events) > MAX_LISTED_EVENTS:
+        notable.append(ActionResult(Status.OK, "{count} événements se sont produits pendant votre absence.",
+                                    {"count": len(events)}))
+    else:
+        fields = {"name": creature.name}
+        notable.extend(ActionResult(Status.OK, event.template, fields) for event in events)
+    return ActionResult(Status.OK, "{hours} heure(s) se sont écoulées.", {"hours": round(hours, 1)},
+                        parts=tuple(notable))
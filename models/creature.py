@@ -2,13 +2,45 @@
 Creature class defining the attributes and behaviors of a virtual creature.
 """
 
-import random
-from utils.file_manager import save_data, load_data
+import os
+
+from models import rules
+from utils.clock import hours_to_days
+from utils.event_bus import EVOLVED, FELL_SICK, ITEM_GAINED, bus
+from models.result import DEATH, ActionResult, Status
+from models.save_format import SAVE_KEYS, decode_save, encoder_for
+from utils.file_manager import save_data, save_many, load_data
+from utils.rng import RngStream
+from utils.store import STORE_EXTENSION, CreatureStore
+
+# List attributes shared between a creature and its snapshots or forks until one of them writes to them
+SHARED_LISTS = ("friends", "inventory")
+
+
+class CreatureSnapshot:
+    """Frozen state of a creature, returned by Creature.snapshot."""
+    
+    __slots__ = ("state",)
+    
+    def __init__(self, state):
+        """
+        Wraps the state.
+        
+        Args:
+            state (dict): Attributes of the creature (its lists are shared, never written to)
+        """
+        self.state = state
+    
+    @property
+    def creature_id(self):
+        """Id of the creature captured."""
+        return self.state["creature_id"]
+
 
 class Creature:
     """Class representing a virtual creature with its attributes and behaviors."""
     
-    def __init__(self, name, creature_type, color="standard", character_trait="normal"):
+    def __init__(self, name, creature_type, color="standard", character_trait="normal", creature_id=None, rng=None):
         """
         Initializes a new creature with its basic attributes.
         
@@ -17,7 +49,10 @@ class Creature:
             creature_type (str): The type of creature (e.g., chaton, chiot, dragon...)
             color (str): The color of the creature
             character_trait (str): The dominant character trait
+            creature_id: Stable identifier of the creature (assigned by the game)
+            rng (RngStream): Random stream of the creature (non reproducible if not given)
         """
+        self.creature_id = creature_id
         self.name = name
         self.creature_type = creature_type
         self.hunger = 50  # 0-100, 0 = starving, 100 = satiated
@@ -40,46 +75,141 @@ class Creature:
         self.inventory = []  # List of owned items
         self.game_points = 0  # Points earned in mini-games
         
+        # Random stream, split into one sub-stream per subsystem (sickness, events...)
+        self.rng = rng if rng is not None else RngStream(None, creature_id)
+        
+        # Lists still shared with a snapshot or a fork (copied before the first write)
+        self._shared = ()
+        
+        # File the creature was last saved to or loaded from, and its values then (see dirty_fields)
+        self._saved = None
+        
         # Specific modifiers according to creature type
         self.modifiers = self._define_modifiers()
         
         # Apply bonuses according to character trait
         self._apply_bonus_trait()
     
+    def __getstate__(self):
+        # Modifiers are shared read-only tables: they are rebuilt from the type when unpickled
+        state = self.__dict__.copy()
+        del state["modifiers"]
+        state["_shared"] = ()
+        state["_saved"] = None
+        return state
+    
+    def __setstate__(self, state):
+        state.setdefault("_shared", ())
+        state.setdefault("_saved", None)
+        self.__dict__.update(state)
+        self.modifiers = self._define_modifiers()
+    
+    def snapshot(self):
+        """
+        Captures the state of the creature, to restore it or fork it later.
+        
+        Nothing is deep-copied: the immutable attributes and the modifiers are
+        shared, the friends and inventory lists are shared until the creature
+        writes to them (copy-on-write), and only the random stream is copied.
+        
+        Returns:
+            CreatureSnapshot: The state of the creature
+        """
+        state = self.__dict__.copy()
+        state["rng"] = self.rng.copy()
+        self._shared = SHARED_LISTS
+        return CreatureSnapshot(state)
+    
+    def restore(self, snapshot):
+        """
+        Puts the creature back in the state of a snapshot (which can be restored again later).
+        
+        Args:
+            snapshot (CreatureSnapshot): State returned by snapshot
+        """
+        # What the creature knows of its save file is still true: it is kept
+        saved = self._saved
+        self.__dict__.update(snapshot.state)
+        self.rng = snapshot.state["rng"].copy()
+        self._shared = SHARED_LISTS
+        self._saved = saved
+    
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Creates a creature in the state of a snapshot.
+        
+        Args:
+            snapshot (CreatureSnapshot): State returned by snapshot
+            
+        Returns:
+            Creature: The new creature
+        """
+        creature = cls.__new__(cls)
+        creature._saved = None
+        creature.restore(snapshot)
+        return creature
+    
+    def fork(self):
+        """
+        Returns an independent copy of the creature, for a what-if simulation.
+        
+        The copy shares the lists of the creature until either writes to them,
+        and its random stream is at the same position, so both draw the same
+        luck from there.
+        
+        Returns:
+            Creature: The copy
+        """
+        creature = self.__class__.__new__(self.__class__)
+        creature.__dict__.update(self.__dict__)
+        creature.rng = self.rng.copy()
+        creature._saved = None
+        self._shared = creature._shared = SHARED_LISTS
+        return creature
+    
+    def _own(self, attribute):
+        """
+        Returns a list attribute, copied first if it is still shared with a snapshot or a fork.
+        
+        Args:
+            attribute (str): "friends" or "inventory"
+            
+        Returns:
+            list: The list, owned by this creature only
+        """
+        value = getattr(self, attribute)
+        if attribute in self._shared:
+            value = list(value)
+            setattr(self, attribute, value)
+            self._shared = tuple(name for name in self._shared if name != attribute)
+        return value
+    
+    def add_item(self, item):
+        """
+        Adds an item to the inventory.
+        
+        Args:
+            item (str): Name of the item
+        """
+        self._own("inventory").append(item)
+    
     def _define_modifiers(self):
         """
         Defines specific modifiers according to creature type.
         
         Returns:
-            dict: Dictionary containing modifiers for each attribute
-        """
-        modifiers = {
-            "chaton": {"hunger": 1.2, "energy": 0.9, "happiness": 1.1},
-            "chiot": {"hunger": 1.3, "energy": 1.2, "happiness": 1.3},
-            "dragon": {"hunger": 1.5, "energy": 0.8, "happiness": 0.9},
-            "robot": {"hunger": 0.7, "energy": 1.4, "happiness": 0.8},
-            "lapin": {"hunger": 1.1, "energy": 1.1, "happiness": 1.2}
-        }
-        
-        return modifiers.get(self.creature_type.lower(), {"hunger": 1.0, "energy": 1.0, "happiness": 1.0})
+            MappingProxyType: Read-only modifiers for each attribute, shared by all creatures of the type
+        """
+        return rules.get_modifiers(self.creature_type)
     
     def _apply_bonus_trait(self):
         """
         Applies bonuses or penalties according to the creature's character trait.
         """
-        trait_effects = {
-            "joueur": {"happiness": 10, "energy": -5},
-            "gourmand": {"hunger": -10, "health": -5},
-            "sportif": {"energy": 10, "hunger": -5},
-            "paresseux": {"energy": -10, "happiness": 5},
-            "curieux": {"happiness": 5, "energy": 5},
-            "timide": {"happiness": -5, "social_level": -20},
-            "sociable": {"happiness": 5, "social_level": 20},
-            "intelligent": {"game_points": 10}
-        }
-        
-        if self.character_trait in trait_effects:
-            for attribute, value in trait_effects[self.character_trait].items():
+        effects = rules.TRAIT_EFFECTS.get(self.character_trait)
+        if effects:
+            for attribute, value in effects.items():
                 if hasattr(self, attribute):
                     current_value = getattr(self, attribute)
                     new_value = max(0, min(100, current_value + value))
@@ -93,7 +223,7 @@ class Creature:
             food (str): Type of food ("standard", "premium" or "malsaine")
             
         Returns:
-            str: Message indicating the result of the action
+            ActionResult: Result of the action
         """
         if food == "standard":
             hunger_gain = 20 * self.modifiers["hunger"]
@@ -105,10 +235,10 @@ class Creature:
             self.health -= 5
         
         self.hunger = min(100, self.hunger + hunger_gain)
-        result = self._update_state()
-        if result == "death":
-            return "death"
-        return f"{self.name} a été nourri avec de la nourriture {food}."
+        if self._update_state():
+            return DEATH
+        return ActionResult(Status.OK, "{name} a été nourri avec de la nourriture {food}.",
+                            {"name": self.name, "food": food})
     
     def play(self, duration=1):
         """
@@ -118,13 +248,13 @@ class Creature:
             duration (float): Play duration in hours
             
         Returns:
-            str: Message indicating the result of the action
+            ActionResult: Result of the action
         """
         if self.energy < 20:
-            return f"{self.name} est trop fatigué pour jouer !"
+            return ActionResult(Status.FAILED, "{name} est trop fatigué pour jouer !", {"name": self.name})
         
         # Aging - playing also makes time pass
-        self.age += duration / 24  # convert hours to days
+        self._grow(duration)
         
         happiness_gain = 15 * duration
         energy_loss = 10 * duration
@@ -138,10 +268,10 @@ class Creature:
         if evolution:
             return evolution
             
-        result = self._update_state()
-        if result == "death":
-            return "death"
-        return f"{self.name} a joué pendant {duration} heure(s) et est maintenant plus heureux !"
+        if self._update_state():
+            return DEATH
+        return ActionResult(Status.OK, "{name} a joué pendant {duration} heure(s) et est maintenant plus heureux !",
+                            {"name": self.name, "duration": duration})
     
     def sleep(self, duration=8):
         """
@@ -151,10 +281,10 @@ class Creature:
             duration (float): Sleep duration in hours
             
         Returns:
-            str: Message indicating the result of the action
+            ActionResult: Result of the action
         """
         # Aging - sleeping makes time pass
-        self.age += duration / 24  # convert hours to days
+        self._grow(duration)
         
         energy_gain = 10 * duration * self.modifiers["energy"]
         hunger_loss = 5 * duration
@@ -167,26 +297,26 @@ class Creature:
         if evolution:
             return evolution
             
-        result = self._update_state()
-        if result == "death":
-            return "death"
-        return f"{self.name} a dormi pendant {duration} heures et a récupéré de l'énergie."
+        if self._update_state():
+            return DEATH
+        return ActionResult(Status.OK, "{name} a dormi pendant {duration} heures et a récupéré de l'énergie.",
+                            {"name": self.name, "duration": duration})
     
     def heal(self):
         """
         Heals the creature if it is sick.
         
         Returns:
-            str: Message indicating the result of the action
+            ActionResult: Result of the action
         """
         if not self.is_sick:
-            return f"{self.name} n'est pas malade."
+            return ActionResult(Status.FAILED, "{name} n'est pas malade.", {"name": self.name})
         
         self.is_sick = False
         self.health = min(100, self.health + 30)
         
         self._update_state()
-        return f"{self.name} a été soigné et se sent mieux !"
+        return ActionResult(Status.OK, "{name} a été soigné et se sent mieux !", {"name": self.name})
     
     def pass_time(self, hours=1):
         """
@@ -196,23 +326,23 @@ class Creature:
             hours (float): Number of hours elapsed
             
         Returns:
-            str: Message describing what happened during this time
+            ActionResult: What happened during this time
         """
         self.hunger = max(0, self.hunger - 3 * hours)
         self.energy = max(0, self.energy - 2 * hours)
         self.happiness = max(0, self.happiness - 2 * hours)
         
         # Aging - time is explicitly passing
-        self.age += hours / 24  # convert hours to days
+        self._grow(hours)
         
         # Possibility of getting sick
-        if random.random() < 0.05 * hours and not self.is_sick:
+        if self.rng.child("sickness").random() < 0.05 * hours and not self.is_sick:
             self.is_sick = True
             self.health = max(0, self.health - 10)
-            result = self._update_state()
-            if result == "death":
-                return "death"
-            return f"{self.name} est tombé malade !"
+            bus.publish(FELL_SICK, creature=self)
+            if self._update_state():
+                return DEATH
+            return ActionResult(Status.OK, "{name} est tombé malade !", {"name": self.name}, (FELL_SICK,))
         
         # Check for evolution based on new age
         evolution = self._check_evolution()
@@ -220,22 +350,50 @@ class Creature:
             return evolution
         
         # Random event
-        if random.random() < 0.1 * hours:
-            from game.events import generate_random_event
-            event = generate_random_event(self)
-            result = self._update_state()
-            if result == "death":
-                return "death"
-            return event
-        
-        result = self._update_state()
-        if result == "death":
-            return "death"
-        return f"{hours} heure(s) se sont écoulées."
+        events_rng = self.rng.child("events")
+        if events_rng.random() < 0.1 * hours:
+            from game.events import draw_event
+            event = draw_event(self, events_rng)
+            event.apply(self)
+            if self._update_state():
+                return DEATH
+            return ActionResult(Status.OK, event.template, {"name": self.name})
+        
+        if self._update_state():
+            return DEATH
+        return ActionResult(Status.OK, "{hours} heure(s) se sont écoulées.", {"hours": hours})
+    
+    def catch_up(self, hours):
+        """
+        Simulates a long period of time (hours to months) event by event.
+        
+        Unlike pass_time, sickness and random events can happen several times
+        and the decay follows the thresholds of _update_state hour after hour.
+        
+        Args:
+            hours (float): Number of hours elapsed
+            
+        Returns:
+            ActionResult: Summary of what happened during this time
+        """
+        from models.catch_up import catch_up
+        return catch_up(self, hours)
+    
+    def _grow(self, hours):
+        """
+        Ages the creature by a duration of game time.
+        
+        Args:
+            hours (float): Number of game hours elapsed
+        """
+        self.age += hours_to_days(hours)
     
     def _update_state(self):
         """
         Updates the general state of the creature based on its attributes.
+        
+        Returns:
+            bool: True if the creature died
         """
         # If hunger is low, health decreases
         if self.hunger < 20:
@@ -253,30 +411,28 @@ class Creature:
         # Check if the creature has died
         if self.health <= 0:
             self.health = 0
-            return "death"
+            return True
         
-        return None
+        return False
     
     def _check_evolution(self):
         """
         Checks if the creature can evolve based on its age.
         
         Returns:
-            str or None: Evolution message or None if no evolution
+            ActionResult or None: The evolution, None if no evolution
         """
-        if self.age >= 30 and self.evolution_stage == "bébé":
+        if self.age >= rules.EVOLUTION_AGES["bébé"] and self.evolution_stage == "bébé":
             self.evolution_stage = "jeune"
-            evolution_message = f"{self.name} a évolué en {self.evolution_stage} !"
-            from ui.display import display_evolution
-            display_evolution(evolution_message)
-            return evolution_message
-        elif self.age >= 60 and self.evolution_stage == "jeune":
+        elif self.age >= rules.EVOLUTION_AGES["jeune"] and self.evolution_stage == "jeune":
             self.evolution_stage = "adulte"
-            evolution_message = f"{self.name} a évolué en {self.evolution_stage} !"
-            from ui.display import display_evolution
-            display_evolution(evolution_message)
-            return evolution_message
-        return None
+        else:
+            return None
+        evolution = ActionResult(Status.OK, "{name} a évolué en {stage} !",
+                                 {"name": self.name, "stage": self.evolution_stage}, (EVOLVED,))
+        if bus.has_subscribers(EVOLVED):
+            bus.publish(EVOLVED, creature=self, stage=self.evolution_stage, message=evolution.message)
+        return evolution
         
     def encounter_creature(self, other_name, other_type):
         """
@@ -287,35 +443,37 @@ class Creature:
             other_type (str): Type of the other creature
             
         Returns:
-            str: Description of the encounter
+            ActionResult: Description of the encounter
         """
-        from game.events import generate_encounter
-        
-        # Check if it's a friend
-        is_friend = other_name in self.friends
+        from game.events import draw_encounter
         
-        # Generate the encounter
-        scenario = generate_encounter(self)
+        # Draw the encounter (the type drawn is only used if none is given)
+        encounters_rng = self.rng.child("encounters")
+        random_type, scenario = draw_encounter(self.creature_type, encounters_rng)
+        other_type = other_type or random_type
+        if not other_name:
+            other_name = f"{other_type.capitalize()}-{encounters_rng.randint(1, 100)}"
         
         # Possibility of becoming friends
-        if "amis" in scenario["message"] and other_name not in self.friends:
-            self.friends.append(other_name)
+        if scenario.friendship and other_name not in self.friends:
+            self._own("friends").append(other_name)
             self.social_level = min(100, self.social_level + 10)
             
         # Apply the effects of the encounter
-        if "happiness_effect" in scenario:
-            self.happiness = max(0, min(100, self.happiness + scenario["happiness_effect"]))
+        if scenario.happiness_effect is not None:
+            self.happiness = max(0, min(100, self.happiness + scenario.happiness_effect))
         
-        if "energy_effect" in scenario:
-            self.energy = max(0, min(100, self.energy + scenario["energy_effect"]))
+        if scenario.energy_effect is not None:
+            self.energy = max(0, min(100, self.energy + scenario.energy_effect))
             
-        if "hunger_effect" in scenario:
-            self.hunger = max(0, min(100, self.hunger + scenario["hunger_effect"]))
+        if scenario.hunger_effect is not None:
+            self.hunger = max(0, min(100, self.hunger + scenario.hunger_effect))
             
         # Meeting other creatures takes time (30 minutes)
-        self.age += 0.5 / 24
+        self._grow(0.5)
             
-        return scenario["message"]
+        return ActionResult(Status.OK, scenario.template,
+                            scenario.fields(self.name, self.creature_type, other_name, other_type))
         
     def play_mini_game(self, game):
         """
@@ -325,33 +483,42 @@ class Creature:
             game (str): The chosen mini-game
             
         Returns:
-            dict: Result of the mini-game
+            ActionResult: Result of the mini-game, its value being the result
+                          dict of game.mini_games (None if too tired to play)
         """
         from game.mini_games import play_mini_game
         
         # Check if the creature is in a state to play
         if self.energy < 15:
-            return {"success": False, "message": f"{self.name} est trop fatigué pour jouer !"}
+            return ActionResult(Status.FAILED, "{name} est trop fatigué pour jouer !", {"name": self.name})
         
         # Play the mini-game
-        result = play_mini_game(game, self.character_trait)
+        result = play_mini_game(game, self.character_trait, self.rng.child("mini_games"))
         
         # Apply rewards
+        events = ()
         if result["success"]:
             self.happiness = min(100, self.happiness + result["happiness_bonus"])
             self.game_points += result["points"]
             
             # Add the item to the inventory if there is one
             if "item" in result and result["item"]:
-                self.inventory.append(result["item"])
+                self.add_item(result["item"])
+                events = (ITEM_GAINED,)
+                bus.publish(ITEM_GAINED, creature=self, item=result["item"])
         
         # Spend energy
         self.energy = max(0, self.energy - 10)
         
         # Mini-games take time (1 hour)
-        self.age += 1.0 / 24
+        self._grow(1.0)
         
-        return result
+        if not result["success"]:
+            return ActionResult(Status.FAILED, result["message"], value=result)
+        template = "{message} +{happiness_bonus} bonheur, +{points} points"
+        if events:
+            template += "\nVous avez gagné un objet: {item}!"
+        return ActionResult(Status.OK, template, result, events, value=result)
         
     def use_object(self, item):
         """
@@ -361,24 +528,15 @@ class Creature:
             item (str): Name of the item to use
             
         Returns:
-            str: Result of the use
+            ActionResult: Result of the use
         """
         if item not in self.inventory:
-            return f"{self.name} ne possède pas cet objet."
-        
-        # Effects of different items
-        effects = {
-            "Friandise": {"hunger": 15, "happiness": 5},
-            "Jouet": {"happiness": 15, "energy": -5},
-            "Potion d'énergie": {"energy": 30},
-            "Potion de santé": {"health": 30, "is_sick": False},
-            "Amulette de protection": {"health": 10},
-            "Livre magique": {"happiness": 10, "game_points": 5}
-        }
+            return ActionResult(Status.FAILED, "{name} ne possède pas cet objet.", {"name": self.name})
         
         # Apply effects
-        if item in effects:
-            for attribute, value in effects[item].items():
+        effects = rules.ITEM_EFFECTS.get(item)
+        if effects:
+            for attribute, value in effects.items():
                 if attribute == "is_sick":
                     self.is_sick = value
                 elif hasattr(self, attribute):
@@ -388,15 +546,16 @@ class Creature:
                         setattr(self, attribute, new_value)
             
             # Remove the item from the inventory (except permanent items)
-            if item not in ["Amulette de protection", "Livre magique"]:
-                self.inventory.remove(item)
+            if item not in rules.PERMANENT_ITEMS:
+                self._own("inventory").remove(item)
             
             # Using items takes a little time (15 minutes)
-            self.age += 0.25 / 24
+            self._grow(0.25)
             
-            return f"{self.name} a utilisé {item} et en ressent les effets !"
+            return ActionResult(Status.OK, "{name} a utilisé {item} et en ressent les effets !",
+                                {"name": self.name, "item": item})
         
-        return f"{item} n'a pas d'effet connu."
+        return ActionResult(Status.FAILED, "{item} n'a pas d'effet connu.", {"item": item})
     
     def get_state(self):
         """
@@ -449,42 +608,104 @@ class Creature:
             return f"{self.name} est malade et a besoin de soins !"
         return None
     
+    def _save_values(self):
+        """
+        Returns the values of the save format, in the order of SAVE_KEYS.
+        
+        Returns:
+            tuple: The values (its lists are copies)
+        """
+        return (self.name, self.creature_type, self.color, self.character_trait, self.hunger, self.energy,
+                self.happiness, self.health, self.age, self.is_sick, self.evolution_stage, self.social_level,
+                list(self.friends), self.game_points, list(self.inventory), self.creature_id, self.rng.getstate())
+    
+    def to_dict(self):
+        """
+        Returns the state of the creature in the save format.
+        
+        Returns:
+            dict: JSON serializable state (its lists are copies)
+        """
+        return dict(zip(SAVE_KEYS, self._save_values()))
+    
+    def dirty_fields(self):
+        """
+        Returns the keys of the save format whose value changed since the creature was last saved or loaded.
+        
+        Returns:
+            list: The changed keys (all of them if the creature was never saved nor loaded)
+        """
+        if self._saved is None:
+            return list(SAVE_KEYS)
+        return [key for key, value, saved in zip(SAVE_KEYS, self._save_values(), self._saved[1]) if value != saved]
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates a creature from its state in the save format.
+        
+        Args:
+            data (dict): State returned by to_dict (or read from a save file)
+            
+        Returns:
+            Creature: The creature
+        """
+        # Get customization attributes if they exist
+        color = data.get("couleur", "standard")
+        character_trait = data.get("trait_caractere", "normal")
+        
+        creature = cls(data["nom"], data["type_creature"], color, character_trait)
+        creature.hunger = data["faim"]
+        creature.energy = data["energie"]
+        creature.happiness = data["bonheur"]
+        creature.health = data["sante"]
+        creature.age = data["age"]
+        creature.is_sick = data["est_malade"]
+        creature.evolution_stage = data["stade_evolution"]
+        
+        # Load advanced attributes if they exist
+        if "niveau_social" in data:
+            creature.social_level = data["niveau_social"]
+        if "amis" in data:
+            creature.friends = data["amis"]
+        if "points_jeu" in data:
+            creature.game_points = data["points_jeu"]
+        if "inventaire" in data:
+            creature.inventory = data["inventaire"]
+        if data.get("id") is not None:
+            creature.creature_id = data["id"]
+        if "etat_aleatoire" in data:
+            creature.rng.setstate(data["etat_aleatoire"])
+        
+        return creature
+    
     def save(self, filename="sauvegarde.json"):
         """
-        Saves the creature's state to a JSON file.
+        Saves the creature's state to a file: JSON, or the binary format of
+        models.save_format if the file name ends with BINARY_EXTENSION.
+        
+        The file is not written again if the creature did not change since it
+        was last saved to it or loaded from it, and the file is still there.
         
         Args:
             filename (str): Name of the save file
             
         Returns:
-            str: Confirmation message
+            ActionResult: Confirmation message (FAILED if the file could not be written)
         """
-        data = {
-            "nom": self.name,
-            "type_creature": self.creature_type,
-            "couleur": self.color,
-            "trait_caractere": self.character_trait,
-            "faim": self.hunger,
-            "energie": self.energy,
-            "bonheur": self.happiness,
-            "sante": self.health,
-            "age": self.age,
-            "est_malade": self.is_sick,
-            "stade_evolution": self.evolution_stage,
-            "niveau_social": self.social_level,
-            "amis": self.friends,
-            "points_jeu": self.game_points,
-            "inventaire": self.inventory
-        }
-        
-        save_data(data, filename)
+        values = self._save_values()
+        if self._saved != (filename, values) or not os.path.exists(filename):
+            if not save_data(dict(zip(SAVE_KEYS, values)), filename, encoder_for(filename)):
+                return ActionResult(Status.FAILED, "Impossible de sauvegarder la créature dans {filename}.",
+                                    {"filename": filename})
+            self._saved = (filename, values)
         
-        return f"Créature sauvegardée dans {filename}"
+        return ActionResult(Status.OK, "Créature sauvegardée dans {filename}", {"filename": filename})
     
     @classmethod
     def load(cls, filename="sauvegarde.json"):
         """
-        Loads a creature from a JSON file.
+        Loads a creature from a save file, in either format (recognized by its magic bytes).
         
         Args:
             filename (str): Name of the save file
@@ -492,32 +713,116 @@ class Creature:
         Returns:
             Creature or None: Instance of the creature or None if failure
         """
-        data = load_data(filename)
+        data = load_data(filename, decode_save)
         
         if data:
-            # Get customization attributes if they exist
-            color = data.get("couleur", "standard")
-            character_trait = data.get("trait_caractere", "normal")
-            
-            creature = cls(data["nom"], data["type_creature"], color, character_trait)
-            creature.hunger = data["faim"]
-            creature.energy = data["energie"]
-            creature.happiness = data["bonheur"]
-            creature.health = data["sante"]
-            creature.age = data["age"]
-            creature.is_sick = data["est_malade"]
-            creature.evolution_stage = data["stade_evolution"]
+            creature = cls.from_dict(data)
+            creature._saved = (filename, creature._save_values())
+            return creature
+        
+        return None
+    
+    @staticmethod
+    def save_many(creatures, directory, extension=".json", owners=None):
+        """
+        Saves many creatures in a directory, one file per creature named after its id,
+        or in a store (utils.store) if the name ends with STORE_EXTENSION.
+        
+        Only the creatures that changed since they were last saved there are
+        written: each file atomically, with a single flush of the directory,
+        or the whole store in batched transactions.
+        
+        Args:
+            creatures (iterable): The creatures
+            directory (str): Directory of the save files (created if needed), or file name of the store
+            extension (str): Extension of the files, which chooses their format (".json" or BINARY_EXTENSION)
+            owners (dict): Owner of each creature id, kept by a store with the creatures written
             
-            # Load advanced attributes if they exist
-            if "niveau_social" in data:
-                creature.social_level = data["niveau_social"]
-            if "amis" in data:
-                creature.friends = data["amis"]
-            if "points_jeu" in data:
-                creature.game_points = data["points_jeu"]
-            if "inventaire" in data:
-                creature.inventory = data["inventaire"]
+        Returns:
+            int: Number of files (or creatures of the store) written
+        """
+        if directory.endswith(STORE_EXTENSION):
+            return Creature._save_to_store(creatures, directory, owners or {})
+        
+        os.makedirs(directory, exist_ok=True)
+        existing = set(os.listdir(directory))
+        prefix = os.path.join(directory, "")
+        pending = []
+        for creature in creatures:
+            name = f"{creature.creature_id}{extension}"
+            filename = prefix + name
+            values = creature._save_values()
+            if name not in existing or creature._saved != (filename, values):
+                pending.append((creature, filename, values))
+        
+        saved = set(save_many(((dict(zip(SAVE_KEYS, values)), filename) for _, filename, values in pending),
+                              encoder_for(extension)))
+        for creature, filename, values in pending:
+            if filename in saved:
+                creature._saved = (filename, values)
+        return len(saved)
+    
+    @staticmethod
+    def _save_to_store(creatures, filename, owners):
+        """
+        Saves the creatures that changed since they were last saved in a store.
+        
+        Args:
+            creatures (iterable): The creatures
+            filename (str): File name of the store
+            owners (dict): Owner of each creature id
             
-            return creature
+        Returns:
+            int: Number of creatures written
+        """
+        store = CreatureStore(filename)
+        try:
+            existing = set(store.ids())
+            pending = []
+            for creature in creatures:
+                values = creature._save_values()
+                if creature.creature_id not in existing or creature._saved != (filename, values):
+                    pending.append((creature, values))
+            store.upsert((dict(zip(SAVE_KEYS, values)), owners.get(creature.creature_id))
+                         for creature, values in pending)
+        finally:
+            store.close()
+        
+        for creature, values in pending:
+            creature._saved = (filename, values)
+        return len(pending)
+    
+    @classmethod
+    def load_many(cls, directory):
+        """
+        Loads every creature of a directory of save files (in either format), or of a store.
         
-        return None
\ No newline at end of file
+        Args:
+            directory (str): Directory of the save files, or file name of the store (ending with STORE_EXTENSION)
+            
+        Returns:
+            list: The creatures, by id for a store and by file name for a directory
+        """
+        if not os.path.exists(directory):
+            print(f"Le fichier {directory} n'existe pas.")
+            return []
+        
+        creatures = []
+        if directory.endswith(STORE_EXTENSION):
+            store = CreatureStore(directory)
+            try:
+                for data, _ in store.find():
+                    creature = cls.from_dict(data)
+                    creature._saved = (directory, creature._save_values())
+                    creatures.append(creature)
+            finally:
+                store.close()
+            return creatures
+        
+        for name in sorted(os.listdir(directory)):
+            # Temporary files of the atomic saves start with a dot
+            if not name.startswith("."):
+                creature = cls.load(os.path.join(directory, name))
+                if creature is not None:
+                    creatures.append(creature)
+        return creatures
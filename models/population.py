@@ -0,0 +1,517 @@
+"""
+Vectorized population of creatures stored as columns (struct of arrays).
+
+Requires NumPy. The rules applied by CreaturePopulation.pass_time mirror
+Creature.pass_time, Creature._update_state and Creature._check_evolution.
+
+Every row draws from the same counter-based streams (utils.rng) as the
+corresponding Creature ("sickness" and "events" sub-streams), evaluated in
+bulk. A row's trajectory therefore only depends on its own streams: it is
+the same whatever the size or the sharding of the population, and the same
+as ticking the Creature itself with pass_time.
+"""
+
+import numpy as np
+
+from models.creature import Creature
+from models.rules import EVOLUTION_AGES, EVOLUTION_STAGES, STAGE_IDS
+from game.events import EVENT_STATS, get_event_table
+from utils.rng import GOLDEN_GAMMA, TO_UNIT, RngStream
+from utils.clock import hours_to_days
+
+
+def stream_values(keys, counters):
+    """
+    Vectorized SplitMix64: returns the 64-bit output number counters + 1 of each stream.
+
+    Args:
+        keys (ndarray): uint64 keys of the streams
+        counters (ndarray): uint64 positions of the streams
+
+    Returns:
+        ndarray: uint64 values (also usable as keys of new streams)
+    """
+    with np.errstate(over="ignore"):
+        values = keys + (counters + np.uint64(1)) * np.uint64(GOLDEN_GAMMA)
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+
+def stream_uniforms(keys, counters):
+    """
+    Vectorized RngStream.random: returns draw number counters + 1 of each stream.
+
+    Args:
+        keys (ndarray): uint64 keys of the streams
+        counters (ndarray): uint64 positions of the streams
+
+    Returns:
+        ndarray: Floats in [0, 1), bit-identical to RngStream.random
+    """
+    return (stream_values(keys, counters) >> np.uint64(11)).astype(np.float64) * TO_UNIT
+
+
+class CreaturePopulation:
+    """Class storing many creatures as NumPy columns and ticking them in batches."""
+
+    def __init__(self, size=0):
+        """
+        Initializes a population of default creatures.
+
+        Args:
+            size (int): Number of creatures in the population
+        """
+        self.size = size
+
+        # Numeric stats (same defaults as Creature.__init__)
+        self.hunger = np.full(size, 50.0)
+        self.energy = np.full(size, 100.0)
+        self.happiness = np.full(size, 50.0)
+        self.health = np.full(size, 100.0)
+        self.age = np.zeros(size)
+        self.social_level = np.zeros(size)
+        self.game_points = np.zeros(size)
+        self.is_sick = np.zeros(size, dtype=bool)
+        self.alive = np.ones(size, dtype=bool)
+        self.stage = np.zeros(size, dtype=np.int8)  # id in STAGE_IDS
+
+        # Modifiers columns: hunger, energy, happiness
+        self.modifiers = np.ones((size, 3))
+
+        # Interned creature types
+        self.type_names = []
+        self.type_codes = np.zeros(size, dtype=np.int16)
+
+        # Ids and random streams (root key, then "sickness" and "events" sub-streams)
+        self.ids = [None] * size
+        self.rng_keys = np.zeros(size, dtype=np.uint64)
+        self.sickness_keys = np.zeros(size, dtype=np.uint64)
+        self.sickness_counters = np.zeros(size, dtype=np.uint64)
+        self.event_keys = np.zeros(size, dtype=np.uint64)
+        self.event_counters = np.zeros(size, dtype=np.uint64)
+
+        # Non numeric attributes, kept as Python lists
+        self.names = [""] * size
+        self.colors = ["standard"] * size
+        self.traits = ["normal"] * size
+        self.friends = [[] for _ in range(size)]
+        self.inventory = [[] for _ in range(size)]
+
+        # Event tables, rebuilt when a new creature type is interned
+        self._event_deltas = None
+        self._event_masks = None
+        self._event_probabilities = None
+        self._event_aliases = None
+        self._event_counts = None
+
+    def __len__(self):
+        return self.size
+
+    def _type_code(self, creature_type):
+        """
+        Returns the integer code of a creature type, interning it if needed.
+
+        Args:
+            creature_type (str): Type of creature
+
+        Returns:
+            int: Code of the type in type_names
+        """
+        key = creature_type.lower()
+        if key not in self.type_names:
+            self.type_names.append(key)
+            self._event_deltas = None
+        return self.type_names.index(key)
+
+    def _build_event_tables(self):
+        """
+        Packs the compiled event tables of every interned type into padded arrays.
+        """
+        tables = [get_event_table(name) for name in self.type_names]
+        longest = max([len(table.events) for table in tables] + [1])
+
+        deltas = np.zeros((len(tables), longest, len(EVENT_STATS)))
+        masks = np.zeros((len(tables), longest, len(EVENT_STATS)), dtype=bool)
+        probabilities = np.ones((len(tables), longest))
+        aliases = np.zeros((len(tables), longest), dtype=np.intp)
+        counts = np.zeros(len(tables), dtype=np.intp)
+
+        for type_code, table in enumerate(tables):
+            size = len(table.events)
+            counts[type_code] = size
+            probabilities[type_code, :size] = table.sampler.probabilities
+            aliases[type_code, :size] = table.sampler.aliases
+            for event_index, event in enumerate(table.events):
+                for stat, value in enumerate(event.deltas):
+                    if value is not None:
+                        deltas[type_code, event_index, stat] = value
+                        masks[type_code, event_index, stat] = True
+
+        self._event_deltas = deltas
+        self._event_masks = masks
+        self._event_probabilities = probabilities
+        self._event_aliases = aliases
+        self._event_counts = counts
+
+    @classmethod
+    def spawn(cls, count, creature_type, color="standard", character_trait="normal", name_prefix=None,
+              seed=None, first_id=1):
+        """
+        Creates a population of identical newborn creatures.
+
+        The streams of the creature with id i are those of Game(seed).creature_stream(i).
+
+        Args:
+            count (int): Number of creatures to create
+            creature_type (str): Type of the creatures
+            color (str): Color of the creatures
+            character_trait (str): Character trait of the creatures
+            name_prefix (str): Prefix of the generated names, followed by the id (defaults to the type)
+            seed (int): Root seed of the random streams
+            first_id (int): Id of the first creature, the next ones being consecutive
+
+        Returns:
+            CreaturePopulation: The new population
+        """
+        prefix = name_prefix or creature_type.capitalize()
+
+        # Build one creature so that modifiers and trait bonuses come from Creature itself
+        prototype = Creature(prefix, creature_type, color, character_trait)
+
+        population = cls(count)
+        population.hunger[:] = prototype.hunger
+        population.energy[:] = prototype.energy
+        population.happiness[:] = prototype.happiness
+        population.health[:] = prototype.health
+        population.social_level[:] = prototype.social_level
+        population.game_points[:] = prototype.game_points
+        population.modifiers[:] = [prototype.modifiers["hunger"],
+                                   prototype.modifiers["energy"],
+                                   prototype.modifiers["happiness"]]
+        population.type_codes[:] = population._type_code(creature_type)
+        population.ids = list(range(first_id, first_id + count))
+        population.names = [f"{prefix}-{creature_id}" for creature_id in population.ids]
+        population.colors = [color] * count
+        population.traits = [character_trait] * count
+        for i, creature_id in enumerate(population.ids):
+            population._set_streams(i, RngStream(seed, "creature", creature_id))
+
+        return population
+
+    @classmethod
+    def from_creatures(cls, creatures):
+        """
+        Builds a population from individual Creature objects, including their random streams.
+
+        Args:
+            creatures (list): Creatures to copy into the population
+
+        Returns:
+            CreaturePopulation: The new population
+        """
+        creatures = list(creatures)
+        population = cls(len(creatures))
+
+        for i, creature in enumerate(creatures):
+            population.hunger[i] = creature.hunger
+            population.energy[i] = creature.energy
+            population.happiness[i] = creature.happiness
+            population.health[i] = creature.health
+            population.age[i] = creature.age
+            population.social_level[i] = creature.social_level
+            population.game_points[i] = creature.game_points
+            population.is_sick[i] = creature.is_sick
+            population.alive[i] = creature.health > 0
+            population.stage[i] = STAGE_IDS[creature.evolution_stage]
+            population.modifiers[i] = [creature.modifiers["hunger"],
+                                       creature.modifiers["energy"],
+                                       creature.modifiers["happiness"]]
+            population.type_codes[i] = population._type_code(creature.creature_type)
+            population.names[i] = creature.name
+            population.colors[i] = creature.color
+            population.traits[i] = creature.character_trait
+            population.friends[i] = list(creature.friends)
+            population.inventory[i] = list(creature.inventory)
+            population.ids[i] = creature.creature_id
+            population._set_streams(i, creature.rng)
+
+        return population
+
+    @classmethod
+    def replicate(cls, creature, count):
+        """
+        Builds a population of copies of one creature, for example to roll out its possible futures.
+
+        Every row starts with the creature's random streams: give the rows
+        their own streams (sickness_keys, event_keys) before ticking them, or
+        they all live the same future.
+
+        Args:
+            creature (Creature): The creature to copy
+            count (int): Number of copies
+
+        Returns:
+            CreaturePopulation: The new population
+        """
+        population = cls(count)
+        population.hunger[:] = creature.hunger
+        population.energy[:] = creature.energy
+        population.happiness[:] = creature.happiness
+        population.health[:] = creature.health
+        population.age[:] = creature.age
+        population.social_level[:] = creature.social_level
+        population.game_points[:] = creature.game_points
+        population.is_sick[:] = creature.is_sick
+        population.alive[:] = creature.health > 0
+        population.stage[:] = STAGE_IDS[creature.evolution_stage]
+        population.modifiers[:] = [creature.modifiers["hunger"],
+                                   creature.modifiers["energy"],
+                                   creature.modifiers["happiness"]]
+        population.type_codes[:] = population._type_code(creature.creature_type)
+        population.ids = [creature.creature_id] * count
+        population.names = [creature.name] * count
+        population.colors = [creature.color] * count
+        population.traits = [creature.character_trait] * count
+
+        sickness = creature.rng.child("sickness")
+        events = creature.rng.child("events")
+        population.rng_keys[:] = creature.rng.key
+        population.sickness_keys[:] = sickness.key
+        population.sickness_counters[:] = sickness.counter
+        population.event_keys[:] = events.key
+        population.event_counters[:] = events.counter
+        return population
+
+    def _set_streams(self, index, stream):
+        """
+        Copies the position of a creature's random streams into a row.
+
+        Args:
+            index (int): Row of the creature
+            stream (RngStream): Root stream of the creature
+        """
+        sickness = stream.child("sickness")
+        events = stream.child("events")
+        self.rng_keys[index] = stream.key
+        self.sickness_keys[index] = sickness.key
+        self.sickness_counters[index] = sickness.counter
+        self.event_keys[index] = events.key
+        self.event_counters[index] = events.counter
+
+    def _get_streams(self, index):
+        """
+        Rebuilds the random streams of a row.
+
+        Args:
+            index (int): Row of the creature
+
+        Returns:
+            RngStream: Root stream of the creature, with its sub-streams positioned
+        """
+        stream = RngStream(key=int(self.rng_keys[index]))
+        stream.child("sickness").counter = int(self.sickness_counters[index])
+        stream.child("events").counter = int(self.event_counters[index])
+        return stream
+
+    def to_creature(self, index):
+        """
+        Rebuilds an individual Creature from a row of the population.
+
+        Args:
+            index (int): Index of the creature in the population
+
+        Returns:
+            Creature: The rebuilt creature
+        """
+        creature = Creature(self.names[index], self.type_names[self.type_codes[index]],
+                            self.colors[index], self.traits[index],
+                            creature_id=self.ids[index], rng=self._get_streams(index))
+        creature.hunger = float(self.hunger[index])
+        creature.energy = float(self.energy[index])
+        creature.happiness = float(self.happiness[index])
+        creature.health = float(self.health[index])
+        creature.age = float(self.age[index])
+        creature.is_sick = bool(self.is_sick[index])
+        creature.evolution_stage = EVOLUTION_STAGES[self.stage[index]]
+        creature.social_level = float(self.social_level[index])
+        creature.game_points = float(self.game_points[index])
+        creature.friends = list(self.friends[index])
+        creature.inventory = list(self.inventory[index])
+        return creature
+
+    def to_creatures(self):
+        """
+        Rebuilds every creature of the population.
+
+        Returns:
+            list: List of Creature objects, in population order
+        """
+        return [self.to_creature(i) for i in range(self.size)]
+
+    def pass_time(self, hours=1):
+        """
+        Simulates the passage of time for every living creature in one batched call.
+
+        Each row follows the same rules as Creature.pass_time: decay, sickness roll,
+        evolution check, random event roll, then _update_state.
+
+        Args:
+            hours (float): Number of hours elapsed
+
+        Returns:
+            dict: Indices of the creatures that fell sick, evolved or died,
+                  and the number of random events that occurred
+        """
+        if self.alive.all():
+            rows = slice(None)
+        else:
+            rows = np.flatnonzero(self.alive)
+
+        # Stats are never negative, so np.maximum(0, stat - penalty * mask) only
+        # changes the masked rows: cheaper than indexing them with the mask
+        hunger = np.maximum(0, self.hunger[rows] - 3 * hours)
+        energy = np.maximum(0, self.energy[rows] - 2 * hours)
+        happiness = np.maximum(0, self.happiness[rows] - 2 * hours)
+        age = self.age[rows] + hours_to_days(hours)
+        is_sick = self.is_sick[rows].copy()
+        stage = self.stage[rows].copy()
+
+        # Possibility of getting sick (the roll is drawn even for sick creatures)
+        sickness_counters = self.sickness_counters[rows]
+        falls_sick = (stream_uniforms(self.sickness_keys[rows], sickness_counters) < 0.05 * hours) & ~is_sick
+        self.sickness_counters[rows] = sickness_counters + np.uint64(1)
+        is_sick |= falls_sick
+        health = np.maximum(0, self.health[rows] - 10 * falls_sick)
+
+        # Evolution, only checked when the creature did not just fall sick
+        to_young = ~falls_sick & (age >= EVOLUTION_AGES["bébé"]) & (stage == 0)
+        to_adult = ~falls_sick & (age >= EVOLUTION_AGES["jeune"]) & (stage == 1)
+        stage[to_young] = 1
+        stage[to_adult] = 2
+        evolved = to_young | to_adult
+
+        # Random event, only rolled when nothing else happened
+        # (every row is drawn, which is cheaper than gathering the rolled ones, but
+        # only the streams of the rolled rows advance)
+        event_keys = self.event_keys[rows]
+        event_counters = self.event_counters[rows]
+        rolled = ~falls_sick & ~evolved
+        event_rows = np.flatnonzero(rolled & (stream_uniforms(event_keys, event_counters) < 0.1 * hours))
+        event_counters += rolled
+        if event_rows.size:
+            if self._event_deltas is None:
+                self._build_event_tables()
+            type_codes = self.type_codes[rows][event_rows]
+            # Vectorized alias method: one uniform draw per event
+            positions = stream_uniforms(event_keys[event_rows], event_counters[event_rows]) * self._event_counts[type_codes]
+            event_counters[event_rows] += np.uint64(1)
+            slots = np.minimum(positions.astype(np.intp), self._event_counts[type_codes] - 1)
+            choices = np.where(positions - slots < self._event_probabilities[type_codes, slots],
+                               slots, self._event_aliases[type_codes, slots])
+            deltas = self._event_deltas[type_codes, choices]
+            masks = self._event_masks[type_codes, choices]
+            for stat, column in enumerate((hunger, energy, happiness, health)):
+                values = column[event_rows]
+                column[event_rows] = np.where(masks[:, stat],
+                                              np.clip(values + deltas[:, stat], 0, 100),
+                                              values)
+
+        # _update_state is skipped when the creature evolved
+        updated = ~evolved
+        health = np.maximum(0, health - 5 * (updated & (hunger < 20)))
+        happiness = np.maximum(0, happiness - 5 * (updated & (energy < 20)))
+        sick_rows = updated & is_sick
+        energy = np.maximum(0, energy - 2 * sick_rows)
+        happiness = np.maximum(0, happiness - 2 * sick_rows)
+        died = updated & (health <= 0)
+        health[died] = 0
+
+        self.hunger[rows] = hunger
+        self.energy[rows] = energy
+        self.happiness[rows] = happiness
+        self.health[rows] = health
+        self.age[rows] = age
+        self.is_sick[rows] = is_sick
+        self.stage[rows] = stage
+        self.event_counters[rows] = event_counters
+
+        indices = np.arange(self.size)[rows]
+        self.alive[indices[died]] = False
+
+        return {
+            "fell_sick": indices[falls_sick],
+            "evolved": indices[evolved],
+            "deaths": indices[died],
+            "events": int(event_rows.size)
+        }
+
+    def feed(self, rows, food="standard"):
+        """
+        Feeds some creatures, with the rules of Creature.feed.
+
+        Args:
+            rows (ndarray): Indices of the living creatures to feed
+            food (str): Type of food ("standard", "premium" or "malsaine")
+
+        Returns:
+            ndarray: Indices of the creatures that died
+        """
+        if food == "standard":
+            gain = 20
+        elif food == "premium":
+            gain = 30
+            self.happiness[rows] += 5
+        elif food == "malsaine":
+            gain = 15
+            self.health[rows] -= 5
+        else:
+            raise ValueError(f"Unknown food: {food}")
+
+        self.hunger[rows] = np.minimum(100, self.hunger[rows] + gain * self.modifiers[rows, 0])
+        return self._update_state(rows)
+
+    def heal(self, rows):
+        """
+        Heals the sick creatures among some rows, with the rules of Creature.heal.
+
+        Args:
+            rows (ndarray): Indices of living creatures
+
+        Returns:
+            ndarray: Indices of the creatures that were healed
+        """
+        rows = rows[self.is_sick[rows]]
+        self.is_sick[rows] = False
+        self.health[rows] = np.minimum(100, self.health[rows] + 30)
+        self._update_state(rows)
+        return rows
+
+    def _update_state(self, rows):
+        """
+        Applies Creature._update_state to some rows.
+
+        Args:
+            rows (ndarray): Indices of living creatures
+
+        Returns:
+            ndarray: Indices of the creatures that died
+        """
+        health = self.health[rows]
+        energy = self.energy[rows]
+        happiness = self.happiness[rows]
+        low_hunger = self.hunger[rows] < 20
+        health[low_hunger] = np.maximum(0, health[low_hunger] - 5)
+        low_energy = energy < 20
+        happiness[low_energy] = np.maximum(0, happiness[low_energy] - 5)
+        sick = self.is_sick[rows]
+        energy[sick] = np.maximum(0, energy[sick] - 2)
+        happiness[sick] = np.maximum(0, happiness[sick] - 2)
+        died = health <= 0
+        health[died] = 0
+
+        self.health[rows] = health
+        self.energy[rows] = energy
+        self.happiness[rows] = happiness
+        self.alive[rows[died]] = False
+        return rows[died]
@@ -0,0 +1,104 @@
+"""
+Module defining the result returned by the creature methods and the game actions.
+
+An ActionResult carries what the callers branch on (a status, the events
+that happened, the change of the stats) and a message that is only
+rendered when it is read: it keeps a template and its fields, and the
+results it is made of, so headless runs and servers that never show the
+text never format it.
+"""
+
+# Stats reported in the deltas of an action
+DELTA_STATS = ("hunger", "energy", "happiness", "health")
+
+
+class Status:
+    """Outcomes of an action (plain strings: they serialize as is and, unlike Enum members, cost nothing to look up)."""
+
+    OK = "ok"
+    FAILED = "failed"  # the action failed (too tired, missing item, not enough points, lost mini-game...)
+    DEATH = "death"
+    UNKNOWN_ACTION = "unknown_action"
+    NO_CREATURE = "no_creature"
+
+
+class ActionResult:
+    """Status, events, stat changes and lazily rendered message of an action."""
+
+    __slots__ = ("status", "template", "fields", "parts", "value", "_events", "_deltas")
+
+    def __init__(self, status=Status.OK, template="", fields=None, events=(), parts=(), value=None):
+        """
+        Initializes the result.
+
+        Args:
+            status (str): Outcome of the action (one of Status)
+            template (str): Message, with "{field}" placeholders if fields are given
+            fields (dict): Values of the placeholders (None for a message used as is)
+            events (tuple): Names of the events of utils.event_bus that happened
+            parts (tuple): Results this one is made of, rendered after its own message
+            value: Answer of the action for the caller (points, result of a mini-game...)
+        """
+        self.status = status
+        self.template = template
+        self.fields = fields
+        self.parts = parts
+        self.value = value
+        self._events = events
+        self._deltas = None
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"ActionResult({self.status!r}, {self.message!r})"
+
+    @property
+    def message(self):
+        """Text of the result and of its parts, one per line."""
+        text = self.template.format_map(self.fields) if self.fields else self.template
+        if not self.parts:
+            return text
+        lines = [text] if text else []
+        for part in self.parts:
+            line = part.message
+            if line:
+                lines.append(line)
+        return "\n".join(lines)
+
+    @property
+    def empty(self):
+        """True if the result has no message at all."""
+        return not self.template and all(part.empty for part in self.parts)
+
+    @property
+    def events(self):
+        """Events of the result and of its parts, in order."""
+        if not self.parts:
+            return self._events
+        events = list(self._events)
+        for part in self.parts:
+            events.extend(part.events)
+        return tuple(events)
+
+    @property
+    def deltas(self):
+        """Change of each stat during the action (only the stats that changed)."""
+        if self._deltas is None:
+            return {}
+        before, after = self._deltas
+        return {stat: new - old for stat, old, new in zip(DELTA_STATS, before, after) if new != old}
+
+    def set_deltas(self, before, after):
+        """
+        Records the change of the stats.
+
+        Args:
+            before (tuple): Values of DELTA_STATS before the action
+            after (tuple): Values of DELTA_STATS after the action
+        """
+        self._deltas = (before, after)
+
+
+# Result of a creature method when the creature died
+DEATH = ActionResult(Status.DEATH)
@@ -0,0 +1,159 @@
+"""
+Registry of the balance tables of the game.
+
+Every table is built once at import and frozen (read-only mappings and
+tuples), so it can be shared by all creatures and looked up in O(1)
+without being rebuilt on every call. Names also get stable integer ids,
+in declaration order, for compact storage.
+"""
+
+from types import MappingProxyType
+
+
+def _freeze(value):
+    """
+    Recursively converts dicts to read-only mappings and lists to tuples.
+
+    Args:
+        value: Table to freeze
+
+    Returns:
+        The frozen table
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _ids(names):
+    """
+    Assigns integer ids to names, in order.
+
+    Args:
+        names (iterable): Names to number
+
+    Returns:
+        MappingProxyType: Id of each name
+    """
+    return MappingProxyType({name: index for index, name in enumerate(names)})
+
+
+# Multipliers applied to hunger, energy and happiness gains, by creature type
+TYPE_MODIFIERS = _freeze({
+    "chaton": {"hunger": 1.2, "energy": 0.9, "happiness": 1.1},
+    "chiot": {"hunger": 1.3, "energy": 1.2, "happiness": 1.3},
+    "dragon": {"hunger": 1.5, "energy": 0.8, "happiness": 0.9},
+    "robot": {"hunger": 0.7, "energy": 1.4, "happiness": 0.8},
+    "lapin": {"hunger": 1.1, "energy": 1.1, "happiness": 1.2}
+})
+DEFAULT_MODIFIERS = _freeze({"hunger": 1.0, "energy": 1.0, "happiness": 1.0})
+CREATURE_TYPES = tuple(TYPE_MODIFIERS)
+
+# Bonuses or penalties applied once at creation, by character trait
+TRAIT_EFFECTS = _freeze({
+    "joueur": {"happiness": 10, "energy": -5},
+    "gourmand": {"hunger": -10, "health": -5},
+    "sportif": {"energy": 10, "hunger": -5},
+    "paresseux": {"energy": -10, "happiness": 5},
+    "curieux": {"happiness": 5, "energy": 5},
+    "timide": {"happiness": -5, "social_level": -20},
+    "sociable": {"happiness": 5, "social_level": 20},
+    "intelligent": {"game_points": 10}
+})
+TRAIT_DESCRIPTIONS = _freeze({
+    "normal": "Aucun bonus ou malus particulier",
+    "joueur": "Bonus de bonheur, légère perte d'énergie",
+    "gourmand": "Faim plus rapide, légère perte de santé",
+    "sportif": "Bonus d'énergie, faim plus rapide",
+    "paresseux": "Perte d'énergie, léger bonus de bonheur",
+    "curieux": "Bonus de bonheur et d'énergie",
+    "timide": "Malus de bonheur et social",
+    "sociable": "Bonus de bonheur et social",
+    "intelligent": "Bonus aux mini-jeux"
+})
+CHARACTER_TRAITS = tuple(TRAIT_DESCRIPTIONS)
+
+# Available colors by creature type ("standard" is available for every type)
+COLORS = _freeze({
+    "chaton": ["gris", "roux", "blanc", "noir", "tigré", "standard"],
+    "chiot": ["marron", "blanc", "noir", "tacheté", "standard"],
+    "dragon": ["rouge", "vert", "bleu", "noir", "doré", "standard"],
+    "robot": ["argent", "or", "bleu", "noir", "rouge", "standard"],
+    "lapin": ["blanc", "gris", "marron", "noir", "roux", "standard"]
+})
+ALL_COLORS = tuple(dict.fromkeys(color for colors in COLORS.values() for color in colors))
+
+# Effects of the items when used
+ITEM_EFFECTS = _freeze({
+    "Friandise": {"hunger": 15, "happiness": 5},
+    "Jouet": {"happiness": 15, "energy": -5},
+    "Potion d'énergie": {"energy": 30},
+    "Potion de santé": {"health": 30, "is_sick": False},
+    "Amulette de protection": {"health": 10},
+    "Livre magique": {"happiness": 10, "game_points": 5}
+})
+ITEMS = tuple(ITEM_EFFECTS)
+
+# Items that are not consumed when used
+PERMANENT_ITEMS = frozenset(["Amulette de protection", "Livre magique"])
+
+# Items sold in the shop, in display order
+SHOP_CATALOG = _freeze([
+    {
+        "nom": "Friandise",
+        "prix": 10,
+        "description": "Augmente la faim et un peu le bonheur"
+    },
+    {
+        "nom": "Jouet",
+        "prix": 15,
+        "description": "Augmente le bonheur mais consomme de l'énergie"
+    },
+    {
+        "nom": "Potion d'énergie",
+        "prix": 20,
+        "description": "Restaure beaucoup d'énergie"
+    },
+    {
+        "nom": "Potion de santé",
+        "prix": 25,
+        "description": "Soigne la créature et améliore sa santé"
+    },
+    {
+        "nom": "Amulette de protection",
+        "prix": 50,
+        "description": "Objet permanent qui améliore la santé"
+    },
+    {
+        "nom": "Livre magique",
+        "prix": 40,
+        "description": "Objet permanent qui augmente le bonheur et donne des points de jeu"
+    }
+])
+SHOP_PRICES = MappingProxyType({item["nom"]: item["prix"] for item in SHOP_CATALOG})
+
+# Evolution stages and the age (in days) at which each stage is left
+EVOLUTION_STAGES = ("bébé", "jeune", "adulte")
+EVOLUTION_AGES = _freeze({"bébé": 30, "jeune": 60})
+
+# Integer ids, stable as long as the tables above are only appended to
+TYPE_IDS = _ids(CREATURE_TYPES)
+TRAIT_IDS = _ids(CHARACTER_TRAITS)
+COLOR_IDS = _ids(ALL_COLORS)
+ITEM_IDS = _ids(ITEMS)
+STAGE_IDS = _ids(EVOLUTION_STAGES)
+
+
+def get_modifiers(creature_type):
+    """
+    Returns the modifiers of a creature type.
+
+    Args:
+        creature_type (str): Type of creature (case insensitive)
+
+    Returns:
+        MappingProxyType: Multipliers for hunger, energy and happiness
+    """
+    return TYPE_MODIFIERS.get(creature_type.lower(), DEFAULT_MODIFIERS)
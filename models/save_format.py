@@ -0,0 +1,312 @@
+"""
+Compact binary save format of the creatures, alongside the JSON format.
+
+A binary save starts with magic bytes and the version of the format,
+followed by one record: the stats and flags in a fixed-width struct, the
+type, color, character trait and evolution stage as the interned codes
+of models.rules (a name missing from the tables is written out after the
+escape code), the name, friends and inventory prefixed by their length,
+and the positions of the random streams. Ints and floats are told apart,
+so every save survives a round trip from one format to the other.
+
+Creature.save writes this format when the file name ends with
+BINARY_EXTENSION, and Creature.load recognizes it by its magic bytes.
+
+Usage:
+    payload = encode(creature.to_dict())
+    data = decode(payload)  # the same dict
+"""
+
+import json
+import struct
+
+from models.rules import (ALL_COLORS, CHARACTER_TRAITS, COLOR_IDS, CREATURE_TYPES, EVOLUTION_STAGES, ITEM_IDS, ITEMS,
+                          STAGE_IDS, TRAIT_IDS, TYPE_IDS)
+
+# Keys of the save format, in the order of Creature._save_values
+SAVE_KEYS = ("nom", "type_creature", "couleur", "trait_caractere", "faim", "energie", "bonheur", "sante", "age",
+             "est_malade", "stade_evolution", "niveau_social", "amis", "points_jeu", "inventaire", "id",
+             "etat_aleatoire")
+
+# File names ending with this extension are saved in the binary format
+BINARY_EXTENSION = ".bin"
+
+# First bytes of a binary save, and version of its record (increased on every change of the layout)
+MAGIC = b"TMGS"
+FORMAT_VERSION = 1
+
+# Code of a name missing from the tables of models.rules: the name follows
+ESCAPE = 0xFF
+
+# Keys stored as interned codes, with their tables
+_CODED = (("type_creature", CREATURE_TYPES, TYPE_IDS),
+          ("couleur", ALL_COLORS, COLOR_IDS),
+          ("trait_caractere", CHARACTER_TRAITS, TRAIT_IDS),
+          ("stade_evolution", EVOLUTION_STAGES, STAGE_IDS))
+
+# Numeric keys, stored as doubles with a flag for the ints
+_NUMBERS = ("faim", "energie", "bonheur", "sante", "age", "niveau_social", "points_jeu")
+
+# Flags of a record: sick creature, no id, id other than an int, then one bit per int of _NUMBERS
+_SICK = 1
+_NO_ID = 2
+_TEXT_ID = 4
+_INT_FLAGS = tuple(8 << index for index in range(len(_NUMBERS)))
+
+# Largest int stored exactly in a double
+_MAX_EXACT_INT = 2 ** 53
+
+_HEADER = struct.Struct("<4sB")
+# Codes of _CODED, flags, id, _NUMBERS
+_FIXED = struct.Struct("<4BHq7d")
+_LENGTH = struct.Struct("<H")
+# Key, counter and number of sub-streams of a random stream
+_STREAM = struct.Struct("<QQH")
+
+
+def _text(value, parts):
+    """
+    Appends a length-prefixed UTF-8 string.
+
+    Args:
+        value (str): The string
+        parts (list): Parts of the record
+    """
+    data = value.encode("utf-8")
+    parts.append(_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def _stream(state, parts):
+    """
+    Appends the position of a random stream and of its sub-streams.
+
+    Args:
+        state (dict): State returned by RngStream.getstate
+        parts (list): Parts of the record
+    """
+    children = state.get("children", {})
+    parts.append(_STREAM.pack(state["key"], state["counter"], len(children)))
+    for name, child in children.items():
+        _text(name, parts)
+        _stream(child, parts)
+
+
+def encode(data):
+    """
+    Encodes a creature in the binary format.
+
+    Args:
+        data (dict): State of the creature in the save format (Creature.to_dict)
+
+    Returns:
+        bytes: The binary save
+
+    Raises:
+        ValueError: If a value cannot be stored in the format (string or list too long, huge int)
+    """
+    flags = _SICK if data["est_malade"] else 0
+    numbers = []
+    for key, int_flag in zip(_NUMBERS, _INT_FLAGS):
+        value = data[key]
+        if type(value) is int:
+            if abs(value) > _MAX_EXACT_INT:
+                raise ValueError(f"{key} is too large for the binary save format: {value}")
+            flags |= int_flag
+        numbers.append(value)
+
+    creature_id = data["id"]
+    if creature_id is None:
+        flags |= _NO_ID
+    elif type(creature_id) is not int:
+        flags |= _TEXT_ID
+    codes = [ids.get(data[key], ESCAPE) for key, _, ids in _CODED]
+
+    try:
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION),
+                 _FIXED.pack(*codes, flags, creature_id if type(creature_id) is int else 0, *numbers)]
+        for code, (key, _, _) in zip(codes, _CODED):
+            if code == ESCAPE:
+                _text(data[key], parts)
+        if flags & _TEXT_ID:
+            _text(creature_id, parts)
+        _text(data["nom"], parts)
+
+        friends = data["amis"]
+        parts.append(_LENGTH.pack(len(friends)))
+        for friend in friends:
+            _text(friend, parts)
+        inventory = data["inventaire"]
+        parts.append(_LENGTH.pack(len(inventory)))
+        for item in inventory:
+            code = ITEM_IDS.get(item, ESCAPE)
+            parts.append(bytes((code,)))
+            if code == ESCAPE:
+                _text(item, parts)
+
+        _stream(data["etat_aleatoire"], parts)
+    except struct.error as error:
+        raise ValueError(f"Creature cannot be stored in the binary save format: {error}") from error
+    return b"".join(parts)
+
+
+def _read_text(payload, offset):
+    """
+    Reads a length-prefixed UTF-8 string.
+
+    Args:
+        payload (bytes): The binary save
+        offset (int): Position of the string
+
+    Returns:
+        tuple: The string and the position after it
+    """
+    start = offset + 2
+    end = start + (payload[offset] | payload[offset + 1] << 8)
+    if end > len(payload):
+        raise ValueError("Truncated binary save")
+    return payload[start:end].decode("utf-8"), end
+
+
+def _read_stream(payload, offset):
+    """
+    Reads the position of a random stream and of its sub-streams.
+
+    Args:
+        payload (bytes): The binary save
+        offset (int): Position of the stream
+
+    Returns:
+        tuple: The state (as RngStream.getstate returns it) and the position after it
+    """
+    key, counter, count = _STREAM.unpack_from(payload, offset)
+    offset += _STREAM.size
+    state = {"key": key, "counter": counter}
+    if count:
+        children = state["children"] = {}
+        for _ in range(count):
+            name, offset = _read_text(payload, offset)
+            children[name], offset = _read_stream(payload, offset)
+    return state, offset
+
+
+def decode(payload):
+    """
+    Decodes a binary save.
+
+    Args:
+        payload (bytes): The binary save
+
+    Returns:
+        dict: State of the creature in the save format, as Creature.to_dict returns it
+
+    Raises:
+        ValueError: If the bytes are not a binary save of a known version, or are truncated
+    """
+    try:
+        magic, version = _HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise ValueError("Not a binary save")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unknown version of the binary save format: {version}")
+        fixed = _FIXED.unpack_from(payload, _HEADER.size)
+        offset = _HEADER.size + _FIXED.size
+        flags, creature_id = fixed[4], fixed[5]
+        hunger, energy, happiness, health, age, social_level, game_points = [
+            int(value) if flags & int_flag else value for value, int_flag in zip(fixed[6:], _INT_FLAGS)]
+
+        coded = []
+        for code, (_, names, _) in zip(fixed, _CODED):
+            if code == ESCAPE:
+                value, offset = _read_text(payload, offset)
+            else:
+                value = names[code]
+            coded.append(value)
+        if flags & _NO_ID:
+            creature_id = None
+        elif flags & _TEXT_ID:
+            creature_id, offset = _read_text(payload, offset)
+        name, offset = _read_text(payload, offset)
+
+        friends = []
+        count = payload[offset] | payload[offset + 1] << 8
+        offset += 2
+        for _ in range(count):
+            friend, offset = _read_text(payload, offset)
+            friends.append(friend)
+        inventory = []
+        count = payload[offset] | payload[offset + 1] << 8
+        offset += 2
+        for _ in range(count):
+            code = payload[offset]
+            offset += 1
+            if code == ESCAPE:
+                item, offset = _read_text(payload, offset)
+            else:
+                item = ITEMS[code]
+            inventory.append(item)
+        random_state, offset = _read_stream(payload, offset)
+    except (struct.error, IndexError, UnicodeDecodeError) as error:
+        raise ValueError(f"Corrupted binary save: {error}") from error
+    if offset != len(payload):
+        raise ValueError("Unexpected bytes after the binary save")
+
+    creature_type, color, trait, stage = coded
+    return {
+        "nom": name,
+        "type_creature": creature_type,
+        "couleur": color,
+        "trait_caractere": trait,
+        "faim": hunger,
+        "energie": energy,
+        "bonheur": happiness,
+        "sante": health,
+        "age": age,
+        "est_malade": bool(flags & _SICK),
+        "stade_evolution": stage,
+        "niveau_social": social_level,
+        "amis": friends,
+        "points_jeu": game_points,
+        "inventaire": inventory,
+        "id": creature_id,
+        "etat_aleatoire": random_state
+    }
+
+
+def is_binary(payload):
+    """
+    Tells whether bytes are a binary save.
+
+    Args:
+        payload (bytes): Content of a save file
+
+    Returns:
+        bool: True if it starts with the magic bytes of the binary format
+    """
+    return payload[:len(MAGIC)] == MAGIC
+
+
+def decode_save(payload):
+    """
+    Decodes a save file in either format, recognized by its magic bytes.
+
+    Args:
+        payload (bytes): Content of the save file
+
+    Returns:
+        dict: State of the creature in the save format
+    """
+    return decode(payload) if is_binary(payload) else json.loads(payload)
+
+
+def encoder_for(filename):
+    """
+    Returns the encoder of the format chosen by the extension of a file name.
+
+    Args:
+        filename (str): Name of the save file (or its extension)
+
+    Returns:
+        callable or None: encode for the binary format, None for JSON
+    """
+    return encode if filename.endswith(BINARY_EXTENSION) else None
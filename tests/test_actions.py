@@ -0,0 +1,61 @@
+"""
+Tests of the action table (game.actions) and of batched actions.
+"""
+
+from game.actions import ACTIONS, Reply, action, time_cost
+from game.game_manager import Game
+from models.result import ActionResult, Status
+from utils.clock import ManualClock
+
+
+def test_time_costs():
+    assert time_cost("sleep") == 8
+    assert time_cost("sleep", {"duration": 3}) == 3
+    assert time_cost("explore") == 0.5
+    assert time_cost("feed") == 0
+    assert time_cost("fly") == 0
+
+
+def test_registered_action_is_dispatched():
+    @action("dance", hours=("duration", 2), announce_time=True)
+    def dance(game, creature, params):
+        creature.happiness += 1
+        return ActionResult(Status.OK, "{name} danse.", {"name": creature.name})
+
+    @action("ping")
+    def ping(game, creature, params):
+        return Reply(ActionResult(Status.OK, "pong"))
+
+    try:
+        game = Game(1, ManualClock())
+        game.create_creature("Pixel", "lapin")
+        happiness = game.creature.happiness
+        result = game.do_action("dance", duration=3)
+        assert result.status == Status.OK
+        assert "Pixel danse." in result.message
+        assert game.creature.happiness == happiness + 1
+        assert game.do_action("ping").message == "pong"
+    finally:
+        del ACTIONS["dance"], ACTIONS["ping"]
+
+
+def test_batch_reads_the_clock_once():
+    game = Game(1, ManualClock())
+    for name in ("Pixel", "Rex"):
+        game.create_creature(name, "chiot")
+    game.clock.advance_hours(3)
+    results = game.do_actions([
+        {"action": "feed", "creature_id": 1},
+        {"action": "play", "creature_id": 1, "duration": 1},
+        {"action": "heal", "creature_id": 2},
+        {"action": "fly"},
+        {"action": "feed", "creature_id": 9},
+    ], now=game.clock())
+
+    assert [(result["creature_id"], result["action"], result["status"]) for result in results] == [
+        (1, "feed", Status.OK), (1, "play", Status.OK), (2, "heal", Status.FAILED),
+        (2, "fly", Status.UNKNOWN_ACTION), (9, "feed", Status.NO_CREATURE)]
+    # The elapsed time is applied once per creature, before its first action
+    assert "heure" in results[0]["result"].message
+    assert game.registry.get(1).last_action == game.registry.get(2).last_action == game.clock()
+    assert game.active_id == 2
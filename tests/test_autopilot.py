@@ -0,0 +1,46 @@
+"""
+Tests of the autopilot (game.autopilot) and of its action.
+"""
+
+from game.autopilot import GRID_LEVELS, decide, get_value_table
+from game.game_manager import Game
+from models.creature import Creature
+from models.result import Status
+from utils.clock import ManualClock, SECONDS_PER_HOUR
+
+
+def test_table_is_cached_per_type():
+    table = get_value_table("Chaton")
+    assert get_value_table("chaton") is table
+    assert table.sweeps > 1
+    assert len(table.values) == GRID_LEVELS ** 4 * 2
+    assert table.state_index(0, 0, 0, 0, False) == 0
+    assert table.state_index(100, 100, 130, 100, True) == len(table.values) - 1
+
+
+def test_decisions():
+    creature = Creature("Pixel", "chaton", creature_id=1)
+    creature.hunger = 0
+    assert decide(creature)[0] == "feed"
+
+    creature.hunger = 80
+    creature.is_sick = True
+    creature.health = 40
+    assert decide(creature)[0] == "heal"
+
+
+def test_autopilot_keeps_the_creature_alive():
+    game = Game(4, ManualClock())
+    cared = game.create_creature("Pixel", "chaton").value
+    neglected = game.create_creature("Rex", "chaton").value
+    game.select_creature(cared)
+    actions = set()
+    for _ in range(24 * 3):
+        game.clock.advance(SECONDS_PER_HOUR)
+        result = game.do_action("autopilot", creature_id=cared)
+        assert result.status in (Status.OK, Status.FAILED)
+        actions.add(result.value["action"])
+    assert "feed" in actions
+
+    assert game.do_action("wait", creature_id=neglected).status == Status.DEATH
+    assert game.registry.get(cared).creature.health > 0
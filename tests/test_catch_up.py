@@ -0,0 +1,87 @@
+"""
+Tests of the catch-up engine for long absences (models.catch_up).
+"""
+
+import pytest
+
+from game.game_manager import CATCH_UP_THRESHOLD, Game
+from models import catch_up as catch_up_module
+from models.creature import Creature
+from models.result import Status
+from models.rules import EVOLUTION_AGES
+from utils.clock import ManualClock
+from utils.rng import RngStream
+
+
+@pytest.fixture
+def no_random_events(monkeypatch):
+    """Pushes sickness and random events far beyond the tested durations."""
+    monkeypatch.setattr(catch_up_module, "SICKNESS_RATE", 1e-12)
+    monkeypatch.setattr(catch_up_module, "EVENT_RATE", 1e-12)
+
+
+def _creature(seed=1):
+    return Creature("Pixel", "chaton", creature_id=1, rng=RngStream(seed, "creature", 1))
+
+
+def test_decay_follows_the_low_hunger_threshold(no_random_events):
+    creature = _creature()
+    result = creature.catch_up(20)
+    assert result.status == Status.OK
+    # Hunger reaches the threshold after 10 hours, then health drops by 5 per hour
+    assert creature.hunger == 0
+    assert creature.health == pytest.approx(50)
+    assert creature.energy == pytest.approx(60)
+    assert creature.happiness == pytest.approx(10)
+
+
+def test_low_energy_speeds_up_unhappiness(no_random_events):
+    creature = _creature()
+    creature.hunger = 100
+    creature.energy = 30
+    creature.happiness = 100
+    creature.catch_up(10)
+    # Energy reaches the threshold after 5 hours, then happiness drops by 2 + 5 per hour
+    assert creature.energy == pytest.approx(10)
+    assert creature.happiness == pytest.approx(100 - 2 * 5 - 7 * 5)
+
+
+def test_death_stops_at_the_exact_crossing(no_random_events):
+    creature = _creature()
+    creature.hunger = 20
+    creature.health = 30
+    result = creature.catch_up(10)
+    assert result.status == Status.DEATH
+    assert creature.health == 0
+    assert creature.age * 24 == pytest.approx(6)
+
+
+def test_evolution_during_the_absence(no_random_events):
+    creature = _creature()
+    creature.hunger = 100
+    creature.age = EVOLUTION_AGES["bébé"] - 0.1
+    result = creature.catch_up(5)
+    assert creature.evolution_stage == "jeune"
+    assert any("jeune" in part.message for part in result.parts)
+
+
+def test_same_stream_same_absence():
+    first, second = _creature(4), _creature(4)
+    results = [creature.catch_up(200).message for creature in (first, second)]
+    assert results[0] == results[1]
+    assert first.to_dict() == second.to_dict()
+
+
+def test_game_uses_catch_up_above_the_threshold(monkeypatch):
+    calls = []
+    original = Creature.catch_up
+    monkeypatch.setattr(Creature, "catch_up", lambda self, hours: calls.append(hours) or original(self, hours))
+    game = Game(1, ManualClock())
+    game.create_creature("Pixel", "chaton")
+
+    game.clock.advance_hours(CATCH_UP_THRESHOLD / 2)
+    game.do_action("wait")
+    assert calls == []
+    game.clock.advance_hours(CATCH_UP_THRESHOLD * 3)
+    game.do_action("wait")
+    assert calls == [pytest.approx(CATCH_UP_THRESHOLD * 3)]
@@ -0,0 +1,48 @@
+"""
+Tests of the game clocks (utils.clock) and of fixed-step simulation.
+"""
+
+import pytest
+
+from game.game_manager import Game
+from utils.clock import SECONDS_PER_HOUR, FixedStepClock, ManualClock, ScaledClock, hours_to_days
+
+
+def test_manual_and_fixed_step_clocks():
+    clock = ManualClock(100)
+    clock.advance(20)
+    clock.advance_hours(1.5)
+    assert clock() == 120 + 1.5 * SECONDS_PER_HOUR
+
+    steps = FixedStepClock(step_hours=0.5)
+    steps.tick(4)
+    assert (steps(), steps.steps) == (2 * SECONDS_PER_HOUR, 4)
+    assert hours_to_days(36) == 1.5
+
+
+def test_scaled_clock_runs_faster_than_real_time(monkeypatch):
+    now = [50.0]
+    monkeypatch.setattr("utils.clock.time.monotonic", lambda: now[0])
+    clock = ScaledClock(scale=60, start=1000)
+    now[0] += 2
+    assert clock() == pytest.approx(1120)
+
+
+def test_simulation_only_depends_on_the_seed():
+    creatures = []
+    for _ in range(2):
+        game = Game(6, FixedStepClock())
+        game.create_creature("Pixel", "robot")
+        creature = game.creature
+        game.simulate(20, step_hours=2)
+        creatures.append((creature.to_dict(), game.clock()))
+    assert creatures[0] == creatures[1]
+    assert creatures[0][1] == 20 * SECONDS_PER_HOUR
+
+
+def test_simulation_stops_at_death():
+    game = Game(6, ManualClock())
+    game.create_creature("Pixel", "robot")
+    game.simulate(24 * 365, step_hours=6)
+    assert game.creature is None
+    assert game.clock() < 24 * 365 * SECONDS_PER_HOUR
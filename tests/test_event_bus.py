@@ -0,0 +1,66 @@
+"""
+Tests of the event bus (utils.event_bus) and of the events published by the game.
+"""
+
+import asyncio
+
+import pytest
+
+from game.game_manager import Game
+from utils.clock import ManualClock
+from utils.event_bus import DIED, EVOLVED, FELL_SICK, EventBus, bus
+
+
+def test_subscribers_are_called_in_order():
+    events = EventBus()
+    calls = []
+    first = lambda **payload: calls.append(("first", payload))
+    events.subscribe(FELL_SICK, first)
+    events.subscribe(FELL_SICK, lambda **payload: calls.append(("second", payload)))
+    events.publish(FELL_SICK, creature="Pixel")
+    assert calls == [("first", {"creature": "Pixel"}), ("second", {"creature": "Pixel"})]
+
+    events.unsubscribe(FELL_SICK, first)
+    events.publish(FELL_SICK, creature="Rex")
+    assert calls[-1] == ("second", {"creature": "Rex"}) and len(calls) == 3
+    events.clear()
+    assert not events.has_subscribers(FELL_SICK)
+    with pytest.raises(ValueError):
+        events.subscribe("unknown", first)
+
+
+def test_coroutines_run_on_their_loop():
+    events = EventBus()
+    received = []
+
+    async def main():
+        async def listener(creature):
+            received.append(creature)
+        events.subscribe(DIED, listener)
+        await asyncio.get_running_loop().run_in_executor(None, lambda: events.publish(DIED, creature="Pixel"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+    asyncio.run(main())
+    assert received == ["Pixel"]
+
+
+def test_game_publishes_without_printing(capsys):
+    events = []
+    listeners = {event: (lambda event: lambda **payload: events.append((event, payload)))(event)
+                 for event in (EVOLVED, DIED)}
+    for event, listener in listeners.items():
+        bus.subscribe(event, listener)
+    try:
+        game = Game(2, ManualClock())
+        game.create_creature("Pixel", "robot", owner="alice")
+        creature = game.creature
+        creature.age = 29.9
+        game.simulate(24 * 30, step_hours=1)
+    finally:
+        for event, listener in listeners.items():
+            bus.unsubscribe(event, listener)
+
+    assert capsys.readouterr().out == ""
+    assert [event for event, _ in events] == [EVOLVED, DIED]
+    assert events[0][1]["stage"] == "jeune"
+    assert events[1][1] == {"creature": creature, "owner": "alice"}
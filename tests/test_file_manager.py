@@ -0,0 +1,59 @@
+"""
+Tests of the atomic saves (utils.file_manager) and of the saves of the creatures that changed (models.creature).
+"""
+
+import os
+
+from models.creature import Creature
+from models.result import Status
+from utils import file_manager
+from utils.file_manager import load_data, save_data, save_many
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path, monkeypatch):
+    filename = str(tmp_path / "save.json")
+    assert save_data({"faim": 50}, filename)
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(file_manager.os, "fsync", fail)
+    assert not save_data({"faim": 10}, filename)
+    monkeypatch.setattr(file_manager.os, "fsync", lambda descriptor: None)
+    monkeypatch.setattr(file_manager.os, "replace", fail)
+    assert not save_data({"faim": 10}, filename)
+    assert save_many([({"faim": 10}, filename)]) == []
+
+    assert load_data(filename) == {"faim": 50}
+    assert os.listdir(tmp_path) == ["save.json"]
+
+
+def test_unchanged_creature_is_not_written_again(tmp_path):
+    filename = str(tmp_path / "pixel.json")
+    creature = Creature("Pixel", "chaton", creature_id=1)
+    assert creature.save(filename).status == Status.OK
+    os.utime(filename, ns=(0, 0))
+    assert creature.save(filename).status == Status.OK
+    assert os.stat(filename).st_mtime_ns == 0
+
+    creature.feed()
+    assert creature.dirty_fields() == ["faim"]
+    creature.save(filename)
+    assert os.stat(filename).st_mtime_ns != 0 and creature.dirty_fields() == []
+
+    # A deleted file is written again
+    os.remove(filename)
+    creature.save(filename)
+    assert Creature.load(filename).to_dict() == creature.to_dict()
+
+
+def test_save_many_writes_only_the_changed_creatures(tmp_path):
+    directory = str(tmp_path / "creatures")
+    creatures = [Creature(f"Pixel-{index}", "chaton", creature_id=index) for index in range(10)]
+    assert Creature.save_many(creatures, directory) == 10
+    assert Creature.save_many(creatures, directory) == 0
+    creatures[3].play()
+    creatures[7].feed()
+    assert Creature.save_many(creatures, directory) == 2
+    assert sorted(os.listdir(directory)) == sorted(f"{index}.json" for index in range(10))
+    loaded = {creature.creature_id: creature.to_dict() for creature in Creature.load_many(directory)}
+    assert loaded == {creature.creature_id: creature.to_dict() for creature in creatures}
@@ -0,0 +1,60 @@
+"""
+Tests of the Monte Carlo forecaster (game.forecast).
+"""
+
+import numpy as np
+import pytest
+
+from game.forecast import CarePolicy, forecast
+from models.creature import Creature
+from utils.rng import RngStream
+
+
+def _creature():
+    creature = Creature("Pixel", "chaton", creature_id=1, rng=RngStream(5, "creature", 1))
+    creature.hunger = 30
+    return creature
+
+
+def test_parse_policy():
+    policy = CarePolicy.parse("feed=30:premium, heal")
+    assert (policy.feed_below, policy.food, policy.heal) == (30.0, "premium", True)
+    policy = CarePolicy.parse("none")
+    assert (policy.feed_below, policy.heal) == (None, False)
+    with pytest.raises(ValueError):
+        CarePolicy.parse("dance")
+
+
+def test_forecast_is_reproducible_whatever_the_chunks():
+    creature = _creature()
+    twin = _creature()
+    whole = forecast(creature, 48, rollouts=2000)
+    chunked = forecast(creature, 48, rollouts=2000, chunk_size=300)
+    # The creature is left unchanged: it draws the same luck as its twin afterwards
+    for _ in range(10):
+        creature.pass_time(3)
+        twin.pass_time(3)
+    assert creature.to_dict() == twin.to_dict()
+    assert whole.rollouts == chunked.rollouts == 2000
+    assert np.array_equal(whole.deaths, chunked.deaths)
+    assert np.array_equal(whole.alive, chunked.alive)
+    assert np.allclose(whole.sums, chunked.sums)
+
+
+def test_forecast_with_workers():
+    creature = _creature()
+    local = forecast(creature, 24, rollouts=1000, chunk_size=250)
+    pooled = forecast(creature, 24, rollouts=1000, chunk_size=250, workers=2)
+    assert np.array_equal(local.deaths, pooled.deaths)
+    assert np.allclose(local.sums, pooled.sums)
+
+
+def test_care_keeps_the_creature_alive():
+    creature = _creature()
+    neglected = forecast(creature, 24 * 4, rollouts=2000, step_hours=2).summary()
+    cared = forecast(creature, 24 * 4, rollouts=2000, step_hours=2, policy=CarePolicy(60, heal=True)).summary()
+    assert neglected["hours"] == 96.0
+    low, high = cared["death"][1], cared["death"][2]
+    assert 0 <= low <= cared["death"][0] <= high <= 1
+    assert cared["death"][0] < neglected["death"][0]
+    assert cared["hunger"][0] > neglected["hunger"][0] or np.isnan(neglected["hunger"][0])
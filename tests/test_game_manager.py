@@ -0,0 +1,57 @@
+"""
+Tests of Game and of its creature registry (game.game_manager).
+"""
+
+import pytest
+
+from game.game_manager import CreatureRecord, CreatureRegistry, Game
+from models.creature import Creature
+from models.result import Status
+from utils.clock import ManualClock
+
+
+def _game(count):
+    """Creates a game with creatures owned in turn by alice and bob."""
+    game = Game(2, ManualClock())
+    for i in range(count):
+        game.create_creature(f"Pixel-{i}", ("chaton", "dragon")[i % 2], owner=("alice", "bob")[i % 2])
+    return game
+
+
+def test_registry_indexes():
+    registry = CreatureRegistry()
+    for i, name in enumerate(["Pixel", "Rex", "Pixel"], start=1):
+        registry.add(CreatureRecord(Creature(name, "Chaton", creature_id=i), f"joueur-{i % 2}", 0))
+    assert registry.by_name("Pixel") == [1, 3]
+    assert registry.by_owner("joueur-0") == [2]
+    assert registry.by_type("chaton") == [1, 2, 3]
+    with pytest.raises(ValueError):
+        registry.add(CreatureRecord(Creature("Bis", "chaton", creature_id=2), None, 0))
+
+    registry.remove(3)
+    assert registry.by_name("Pixel") == [1]
+    assert 3 not in registry and len(registry) == 2
+    assert registry.remove(3) is None
+
+
+def test_actions_target_a_creature_by_id():
+    game = _game(3)
+    assert game.active_id == 3
+    game.clock.advance_hours(2)
+    result = game.do_action("feed", creature_id=1)
+    assert result.status == Status.OK
+    assert game.active_id == 3
+    assert game.registry.get(1).last_action == game.clock()
+    assert game.registry.get(2).last_action == 0
+    assert game.do_action("feed", creature_id=42).status == Status.NO_CREATURE
+
+
+def test_select_and_remove():
+    game = _game(3)
+    assert game.select_creature(2)
+    assert game.creature.name == "Pixel-1"
+    assert not game.select_creature(42)
+    assert game.remove_creature(2).name == "Pixel-1"
+    assert game.active_id is None and game.creature is None
+    assert game.registry.by_owner("bob") == []
+    assert game.do_action("feed").status == Status.NO_CREATURE
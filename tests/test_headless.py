@@ -0,0 +1,39 @@
+"""
+Tests of the headless trace runner (game.headless).
+"""
+
+import json
+
+from game.headless import LatencyHistogram, load_trace, run_trace, synthetic_trace
+
+
+def test_synthetic_trace_is_reproducible():
+    assert list(synthetic_trace(500, seed=2)) == list(synthetic_trace(500, seed=2))
+
+
+def test_replay_is_reproducible():
+    first = run_trace(synthetic_trace(3000, seed=1), seed=1)
+    second = run_trace(synthetic_trace(3000, seed=1), seed=1)
+    for key in ("actions", "skipped", "deaths", "virtual_hours", "final_state"):
+        assert first[key] == second[key]
+    assert first["actions"] == 3001
+    assert sum(latency["count"] for latency in first["latency"].values()) == first["actions"]
+
+
+def test_interactive_actions_are_skipped(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    lines = [{"action": "create", "name": "Pixel", "type": "dragon"}, {"action": "play_mini_game"},
+             {"action": "feed", "food": "premium", "dt": 600}]
+    path.write_text("\n".join(map(json.dumps, lines)) + "\n\n", encoding="utf-8")
+    result = run_trace(load_trace(str(path)), seed=1)
+    assert (result["actions"], result["skipped"]) == (2, 1)
+    assert result["final_state"]["nom"] == "Pixel"
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    histogram = LatencyHistogram()
+    for microseconds in (3, 3, 3, 100):
+        histogram.record(microseconds / 1e6)
+    assert histogram.percentile(50) == 4.0
+    assert histogram.percentile(100) == 128.0
+    assert histogram.to_dict()["count"] == 4
@@ -0,0 +1,109 @@
+"""
+Tests of the action journal and of the recovery of a game (game.journal).
+"""
+
+import time
+
+from game.game_manager import Game
+from game.journal import Journal, recover
+from models.creature import Creature
+from utils.clock import ManualClock
+
+
+def _states(game):
+    """Returns the creatures of a game in the save format, by id."""
+    return {record.creature_id: record.creature.to_dict() for record in game.registry}
+
+
+def test_add_without_activation_is_replayed(tmp_path):
+    game = Game(3, ManualClock())
+    game.create_creature("Pixel", "chaton")
+    journal = Journal(str(tmp_path), batch_size=1)
+    journal.attach(game)
+    game.add_creature(Creature("Rex", "chiot"), owner="bob", activate=False)
+    game.clock.advance_hours(2)
+    game.do_actions([{"action": "wait", "creature_id": 2}])
+    journal.close()
+
+    recovered, report = recover(str(tmp_path))
+    assert report["diverged"] == 0
+    assert recovered.active_id == game.active_id == 1
+    assert _states(recovered) == _states(game)
+
+
+def test_deactivation_is_replayed(tmp_path):
+    game = Game(3, ManualClock())
+    game.create_creature("Pixel", "chaton")
+    journal = Journal(str(tmp_path), batch_size=1)
+    journal.attach(game)
+    game.deactivate()
+    journal.close()
+
+    assert game.active_id is None and game.creature is None
+    recovered, _ = recover(str(tmp_path))
+    assert recovered.active_id is None
+    assert _states(recovered) == _states(game)
+
+
+def test_old_group_is_written_without_new_actions(tmp_path):
+    game = Game(3, ManualClock())
+    game.create_creature("Pixel", "chaton")
+    journal = Journal(str(tmp_path), batch_size=256, max_delay=0.01)
+    journal.attach(game)
+    try:
+        game.clock.advance_hours(1)
+        game.do_action("wait")
+        deadline = time.monotonic() + 5
+        while journal.commits == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert journal.commits == 1
+
+        # The game crashes here: the line is already on disk
+        recovered, report = recover(str(tmp_path))
+        assert report["entries"] == 1
+        assert _states(recovered) == _states(game)
+    finally:
+        journal.close()
+
+
+def test_long_game_is_recovered_across_snapshots(tmp_path):
+    game = Game(5, ManualClock())
+    for name in ("Pixel", "Rex", "Nuage"):
+        game.create_creature(name, "chaton")
+    journal = Journal(str(tmp_path), batch_size=16, max_delay=float("inf"), snapshot_every=50)
+    journal.attach(game)
+    for step in range(120):
+        game.clock.advance_hours(0.5)
+        creature_id = step % 3 + 1
+        if creature_id in game.registry:
+            game.do_action(("feed", "play", "wait")[step % 3], creature_id=creature_id)
+    journal.close()
+
+    assert journal.snapshots > 1
+    recovered, report = recover(str(tmp_path))
+    assert report["diverged"] == 0 and not report["truncated"]
+    assert recovered.active_id == game.active_id
+    assert recovered.next_creature_id == game.next_creature_id
+    assert _states(recovered) == _states(game)
+
+
+def test_cut_line_is_dropped(tmp_path):
+    game = Game(3, ManualClock())
+    game.create_creature("Pixel", "chaton")
+    journal = Journal(str(tmp_path), batch_size=1)
+    journal.attach(game)
+    game.clock.advance_hours(1)
+    game.do_action("feed")
+    expected = _states(game)
+    game.clock.advance_hours(1)
+    game.do_action("play")
+    journal.close()
+
+    # The crash cut the last line in the middle
+    path = max(tmp_path.glob("journal*"))
+    content = path.read_text(encoding="utf-8")
+    path.write_text(content[:content.rindex("\n", 0, -1) + 10], encoding="utf-8")
+
+    recovered, report = recover(str(tmp_path))
+    assert report["truncated"] and report["entries"] == 1
+    assert _states(recovered) == expected
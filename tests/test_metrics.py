@@ -0,0 +1,56 @@
+"""
+Tests of the action metrics (game.metrics) recorded by Game.do_action.
+"""
+
+import json
+
+from game.game_manager import Game
+from game.metrics import SIGNIFICANT_BITS, Histogram, Metrics
+from utils.clock import ManualClock
+
+
+def test_buckets_keep_the_significant_bits():
+    histogram = Histogram()
+    for value in list(range(100)) + [1_000, 12_345, 10 ** 6 + 7, 2 ** 40 + 3]:
+        histogram.record(value)
+        bucket = max(histogram.buckets)
+        if value >= 100:
+            assert bucket <= value < bucket + Histogram.bucket_width(bucket)
+            assert Histogram.bucket_width(bucket) <= bucket / 2 ** SIGNIFICANT_BITS
+    assert len([bucket for bucket in histogram.buckets if bucket < 100]) < 100
+    assert histogram.percentile(100) == 2 ** 40 + 3
+
+
+def test_merge_adds_the_values():
+    first, second = Histogram(), Histogram()
+    for value in range(10):
+        first.record(value)
+        second.record(value * 1000)
+    first.merge(second)
+    assert first.count == 20
+    assert first.maximum == 9000
+    assert first.total == sum(range(10)) * 1001
+
+
+def test_game_records_actions_and_phases():
+    metrics = Metrics()
+    game = Game(1, ManualClock(), metrics)
+    game.create_creature("Pixel", "chaton")
+    for _ in range(3):
+        game.clock.advance_hours(2)
+        game.do_action("feed")
+    game.do_action("fly")
+
+    snapshot = json.loads(metrics.to_json())
+    assert snapshot["counters"]["actions.feed.ok"] == 3
+    assert snapshot["counters"]["actions.fly.unknown_action"] == 1
+    assert snapshot["histograms"]["action.feed"]["count"] == 3
+    assert {"phase.catch_up", "phase.action", "action.feed.catch_up"} <= set(snapshot["histograms"])
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    game = Game(1, ManualClock(), metrics)
+    game.create_creature("Pixel", "chaton")
+    game.do_action("feed")
+    assert metrics.snapshot()["histograms"] == {}
@@ -0,0 +1,51 @@
+"""
+Tests of the vectorized population engine (models.population).
+"""
+
+import numpy as np
+
+from models.creature import Creature
+from models.population import CreaturePopulation
+from models.rules import CREATURE_TYPES
+from utils.rng import RngStream
+
+
+def _creatures(count, seed=3):
+    """Creates creatures of every type, each with its own stream."""
+    return [Creature(f"Pixel-{i}", CREATURE_TYPES[i % len(CREATURE_TYPES)], creature_id=i,
+                     rng=RngStream(seed, "creature", i)) for i in range(count)]
+
+
+def test_pass_time_matches_creatures():
+    creatures = _creatures(300)
+    population = CreaturePopulation.from_creatures(creatures)
+    deaths = set()
+    for _ in range(25):
+        for creature in creatures:
+            if creature.health > 0:
+                creature.pass_time(2)
+        deaths.update(population.pass_time(2)["deaths"].tolist())
+
+    assert deaths == {creature.creature_id for creature in creatures if creature.health <= 0}
+    assert 0 < len(deaths) < len(creatures)
+    for index, creature in enumerate(creatures):
+        assert population.to_creature(index).to_dict() == creature.to_dict()
+
+
+def test_feed_and_heal_match_creatures():
+    creatures = _creatures(50)
+    for creature in creatures[::2]:
+        creature.is_sick = True
+        creature.health = 40
+    population = CreaturePopulation.from_creatures(creatures)
+    rows = np.arange(len(creatures))
+
+    population.feed(rows, "premium")
+    healed = population.heal(rows)
+    for creature in creatures:
+        creature.feed("premium")
+        creature.heal()
+
+    assert healed.tolist() == list(range(0, len(creatures), 2))
+    for index, creature in enumerate(creatures):
+        assert population.to_creature(index).to_dict() == creature.to_dict()
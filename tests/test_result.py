@@ -0,0 +1,69 @@
+"""
+Tests of the results of the actions (models.result).
+"""
+
+from game.game_manager import Game
+from models.creature import Creature
+from models.result import ActionResult, Status
+from utils.clock import ManualClock
+from utils.event_bus import EVOLVED, FELL_SICK
+
+
+class _Counted:
+    """Value of a placeholder that counts how many times it is rendered."""
+
+    def __init__(self):
+        self.renders = 0
+
+    def __format__(self, spec):
+        self.renders += 1
+        return "Pixel"
+
+
+def test_message_is_rendered_only_when_read():
+    name = _Counted()
+    result = ActionResult(Status.OK, "{name} a mangé.", {"name": name})
+    assert name.renders == 0
+    assert result.message == "Pixel a mangé." and str(result) == "Pixel a mangé."
+    assert name.renders == 2
+
+    # A template without fields is used as is, braces included
+    assert ActionResult(Status.OK, "{rien}").message == "{rien}"
+
+
+def test_parts_are_combined_in_order():
+    sick = ActionResult(Status.OK, "{name} est tombé malade !", {"name": "Pixel"}, (FELL_SICK,))
+    evolved = ActionResult(Status.OK, "Pixel a évolué !", events=(EVOLVED,))
+    result = ActionResult(Status.OK, parts=(sick, ActionResult(), evolved), value=3)
+    assert result.message == "Pixel est tombé malade !\nPixel a évolué !"
+    assert result.events == (FELL_SICK, EVOLVED)
+    assert result.value == 3
+    assert not result.empty and ActionResult(parts=(ActionResult(),)).empty
+
+
+def test_deltas_keep_only_the_stats_that_changed():
+    result = ActionResult()
+    assert result.deltas == {}
+    result.set_deltas((50, 100, 50, 100), (70, 100, 45, 100))
+    assert result.deltas == {"hunger": 20, "happiness": -5}
+
+
+def test_creature_statuses():
+    creature = Creature("Pixel", "chaton", creature_id=1)
+    assert creature.feed().status == Status.OK
+    assert creature.heal().status == Status.FAILED
+    creature.energy = 0
+    assert creature.play().status == Status.FAILED
+    assert creature.use_object("inconnu").status == Status.FAILED
+
+
+def test_game_statuses_and_deltas():
+    game = Game(1, ManualClock())
+    assert game.do_action("feed").status == Status.NO_CREATURE
+    game.create_creature("Pixel", "chaton")
+    assert game.do_action("danser").status == Status.UNKNOWN_ACTION
+
+    result = game.do_action("feed", food="standard")
+    assert result.status == Status.OK
+    assert result.deltas["hunger"] > 0
+    assert game.do_action("feed", creature_id=99).status == Status.NO_CREATURE
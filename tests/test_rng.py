@@ -0,0 +1,68 @@
+"""
+Tests of the reproducible random streams (utils.rng).
+"""
+
+import pickle
+
+from models.creature import Creature
+from utils.rng import RngStream, mix64
+
+
+def test_same_seed_and_path_same_values():
+    first, second = RngStream(42, "creature", 7), RngStream(42, "creature", 7)
+    assert [first.random() for _ in range(100)] == [second.random() for _ in range(100)]
+    assert RngStream(42, "creature", 8).random() != RngStream(42, "creature", 7).random()
+
+
+def test_draw_only_depends_on_key_and_position():
+    stream = RngStream(1, "a")
+    values = [stream.random() for _ in range(10)]
+    late = RngStream(1, "a")
+    late.counter = 5
+    assert [late.random() for _ in range(5)] == values[5:]
+    assert mix64(0) != mix64(1)
+
+
+def test_children_are_independent_of_their_parent():
+    stream = RngStream(3, "creature", 1)
+    sickness = [stream.child("sickness").random() for _ in range(5)]
+    other = RngStream(3, "creature", 1)
+    other.random()
+    other.child("events").random()
+    assert [other.child("sickness").random() for _ in range(5)] == sickness
+    assert stream.child("sickness") is stream.child("sickness")
+
+
+def test_state_round_trip_and_copy():
+    stream = RngStream(5, "x")
+    stream.random()
+    stream.child("events").uniform(0, 1)
+    restored = RngStream()
+    restored.setstate(stream.getstate())
+    copy = stream.copy()
+    pickled = pickle.loads(pickle.dumps(stream))
+    assert restored.draws() == copy.draws() == pickled.draws() == 2
+    expected = [stream.child("events").random(), stream.random()]
+    for other in (restored, copy, pickled):
+        assert [other.child("events").random(), other.random()] == expected
+
+
+def test_interface_of_the_random_module():
+    stream = RngStream(8, "api")
+    values = list(range(20))
+    stream.shuffle(values)
+    assert sorted(values) == list(range(20))
+    assert all(0 <= stream.randrange(3) < 3 for _ in range(100))
+    assert all(1 <= stream.randint(1, 6) <= 6 for _ in range(100))
+    assert all(2 <= stream.uniform(2, 4) < 4 for _ in range(100))
+    assert stream.choice("abc") in "abc"
+    assert stream.expovariate(2) >= 0
+
+
+def test_creatures_with_the_same_stream_live_the_same_life():
+    creatures = [Creature("Pixel", "dragon", creature_id=1, rng=RngStream(11, "creature", 1)) for _ in range(2)]
+    for creature in creatures:
+        for _ in range(20):
+            creature.pass_time(3)
+            creature.feed()
+    assert creatures[0].to_dict() == creatures[1].to_dict()
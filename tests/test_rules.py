@@ -0,0 +1,42 @@
+"""
+Tests of the balance tables (models.rules) and of their use by Creature.
+"""
+
+import pytest
+
+from models import rules
+from models.creature import Creature
+
+
+def test_tables_are_read_only():
+    with pytest.raises(TypeError):
+        rules.TYPE_MODIFIERS["chaton"]["hunger"] = 2
+    with pytest.raises(TypeError):
+        rules.ITEM_EFFECTS["Jouet"] = {}
+    assert isinstance(rules.COLORS["dragon"], tuple)
+
+
+def test_ids_follow_the_tables():
+    for names, ids in ((rules.CREATURE_TYPES, rules.TYPE_IDS), (rules.CHARACTER_TRAITS, rules.TRAIT_IDS),
+                       (rules.ALL_COLORS, rules.COLOR_IDS), (rules.ITEMS, rules.ITEM_IDS),
+                       (rules.EVOLUTION_STAGES, rules.STAGE_IDS)):
+        assert [names[index] for index in ids.values()] == list(ids)
+        assert len(ids) == len(names)
+
+
+def test_shop_prices_match_the_catalog():
+    assert dict(rules.SHOP_PRICES) == {item["nom"]: item["prix"] for item in rules.SHOP_CATALOG}
+    assert set(rules.SHOP_PRICES) == set(rules.ITEMS)
+
+
+def test_modifiers_are_shared_and_case_insensitive():
+    assert rules.get_modifiers("DRAGON") is rules.TYPE_MODIFIERS["dragon"]
+    assert rules.get_modifiers("licorne") is rules.DEFAULT_MODIFIERS
+    assert Creature("Pixel", "chaton").modifiers is Creature("Rex", "chaton").modifiers
+
+
+def test_trait_effects_are_applied_at_creation():
+    creature = Creature("Pixel", "chaton", character_trait="sociable")
+    assert creature.happiness == 55
+    assert creature.social_level == 20
+    assert Creature("Rex", "chiot", character_trait="timide").social_level == 0
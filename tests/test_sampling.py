@@ -0,0 +1,57 @@
+"""
+Tests of the alias sampler (utils.sampling) and of the compiled event tables (game.events).
+"""
+
+import pytest
+
+from game.events import CompiledEvent, get_event_table
+from models.creature import Creature
+from utils.rng import RngStream
+from utils.sampling import AliasTable
+
+
+def _probabilities(table):
+    """Returns the exact probability of every index of an alias table."""
+    shares = [0.0] * table.size
+    for index in range(table.size):
+        shares[index] += table.probabilities[index] / table.size
+        shares[table.aliases[index]] += (1 - table.probabilities[index]) / table.size
+    return shares
+
+
+@pytest.mark.parametrize("weights", [[1], [1, 1, 1], [5, 1, 0, 3], [0.1, 10, 2.5, 2.5, 0, 7]])
+def test_table_gives_every_index_its_weight(weights):
+    table = AliasTable(weights)
+    total = sum(weights)
+    assert _probabilities(table) == pytest.approx([weight / total for weight in weights])
+
+
+def test_zero_weights_are_never_drawn():
+    table = AliasTable([0, 3, 0, 1])
+    draws = table.sample_many(10_000, RngStream(1, "alias"))
+    assert set(draws) == {1, 3}
+    assert draws.count(1) / len(draws) == pytest.approx(0.75, abs=0.02)
+
+
+def test_same_stream_same_draws():
+    table = AliasTable([2, 1, 1])
+    assert table.sample_many(100, RngStream(9, "alias")) == table.sample_many(100, RngStream(9, "alias"))
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0]])
+def test_table_needs_a_positive_weight(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_event_effects_stay_within_bounds():
+    creature = Creature("Pixel", "chaton")
+    creature.health = 95
+    CompiledEvent("{name} trouve un trésor", {"health": 10, "hunger": -80}).apply(creature)
+    assert (creature.health, creature.hunger) == (100, 0)
+    assert CompiledEvent("{name} trouve un trésor", {}).render("Pixel") == "Pixel trouve un trésor"
+
+
+def test_event_tables_are_compiled_once_per_type():
+    assert get_event_table("Dragon") is get_event_table("dragon")
+    assert len(get_event_table("dragon").events) > len(get_event_table("licorne").events)
@@ -0,0 +1,65 @@
+"""
+Tests of the binary save format (models.save_format).
+"""
+
+import json
+
+import pytest
+
+from models.creature import Creature
+from models.save_format import ESCAPE, MAGIC, decode, decode_save, encode, encoder_for, is_binary
+from utils.rng import RngStream
+
+
+def _creature():
+    creature = Creature("Pixel é", "chaton", "bleu", creature_id=12, rng=RngStream(9, "creature", 12))
+    for _ in range(5):
+        creature.pass_time(3)
+    creature.add_item("balle")
+    creature.friends.extend(["Rex", "Nuage"])
+    return creature
+
+
+def test_round_trip_with_json():
+    data = _creature().to_dict()
+    payload = encode(data)
+    assert is_binary(payload) and payload.startswith(MAGIC)
+    assert decode(payload) == data
+    assert decode_save(payload) == decode_save(json.dumps(data).encode("utf-8")) == data
+    assert encoder_for("pixel.bin") is encode and encoder_for("pixel.json") is None
+
+
+def test_ints_floats_and_escapes():
+    data = _creature().to_dict()
+    data.update(faim=50, energie=49.5, points_jeu=2 ** 40, type_creature="licorne", inventaire=["balle", "grimoire"],
+                id="pixel", est_malade=True)
+    decoded = decode(encode(data))
+    assert decoded == data
+    assert type(decoded["faim"]) is int and type(decoded["energie"]) is float
+    assert type(decoded["points_jeu"]) is int
+    assert decode(encode(dict(data, id=None)))["id"] is None
+
+    # Names missing from the tables are written out after the escape code
+    assert encode(data).count(bytes((ESCAPE,))) >= 2
+
+    with pytest.raises(ValueError):
+        encode(dict(data, points_jeu=2 ** 60))
+    with pytest.raises(ValueError):
+        encode(dict(data, nom="x" * 70_000))
+
+
+def test_corrupted_saves_are_rejected():
+    payload = encode(_creature().to_dict())
+    for corrupted in (payload[:len(payload) // 2], payload[:-1], payload + b"\0", b"XXXX" + payload[4:],
+                      payload[:4] + bytes((99,)) + payload[5:]):
+        with pytest.raises(ValueError):
+            decode(corrupted)
+
+
+def test_creature_saves_in_either_format(tmp_path):
+    creature = _creature()
+    for name in ("pixel.bin", "pixel.json"):
+        filename = str(tmp_path / name)
+        creature.save(filename)
+        assert Creature.load(filename).to_dict() == creature.to_dict()
+    assert (tmp_path / "pixel.bin").stat().st_size < (tmp_path / "pixel.json").stat().st_size
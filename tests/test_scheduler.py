@@ -0,0 +1,71 @@
+"""
+Tests of the threshold scheduler (game.scheduler).
+"""
+
+import pytest
+
+from game.game_manager import Game
+from game.scheduler import ThresholdScheduler, next_crossing
+from models.creature import Creature
+from models.rules import EVOLUTION_AGES
+from utils.clock import SECONDS_PER_HOUR, ManualClock
+
+
+def _scheduled_game(count):
+    game = Game(1, ManualClock())
+    for i in range(count):
+        game.create_creature(f"Pixel-{i}", "chaton")
+    return game, ThresholdScheduler(game)
+
+
+def test_next_crossing_is_the_first_threshold():
+    creature = Creature("Pixel", "chaton")
+    # Hunger 50 decays by 3 per hour down to the critical threshold 20
+    assert next_crossing(creature) == pytest.approx(10)
+    creature.hunger = creature.happiness = creature.energy = 100
+    creature.age = EVOLUTION_AGES["bébé"] - 0.25
+    assert next_crossing(creature) == pytest.approx(6)
+
+
+def test_creatures_are_only_woken_at_their_crossing():
+    game, scheduler = _scheduled_game(3)
+    assert len(scheduler) == 3
+    assert scheduler.next_due() == pytest.approx(10 * SECONDS_PER_HOUR)
+    assert scheduler.run_until(9 * SECONDS_PER_HOUR) == []
+    assert game.registry.get(2).last_action == 0
+
+    # An action reschedules its creature
+    game.clock.advance_hours(5)
+    game.do_action("feed", creature_id=1)
+    notifications = scheduler.run_until(11 * SECONDS_PER_HOUR)
+    assert [(item["creature_id"], item["kind"]) for item in notifications] == [(2, "critical"), (3, "critical")]
+    assert [item["time"] for item in notifications] == pytest.approx([10 * SECONDS_PER_HOUR] * 2)
+    assert [item["message"] for item in notifications] == ["Pixel-1 a très faim !", "Pixel-2 a très faim !"]
+    assert scheduler.next_due() > 11 * SECONDS_PER_HOUR
+
+
+def test_alert_is_emitted_at_the_predicted_crossing():
+    # The hunger of a robot reaches exactly 20 after 10 hours: the alert needs it strictly below
+    game = Game(3, ManualClock())
+    game.create_creature("Robo", "robot")
+    scheduler = ThresholdScheduler(game)
+    due = scheduler.next_due()
+    assert due == pytest.approx(10 * SECONDS_PER_HOUR)
+
+    assert scheduler.run_until(due) == [{"creature_id": 1, "time": due, "kind": "critical",
+                                         "message": "Robo a très faim !"}]
+    creature = game.creature
+    assert creature.hunger < 20 and creature._check_critical_state() == "Robo a très faim !"
+    assert creature.health == pytest.approx(100)
+
+    # Health then decays until it becomes critical in turn, without a second hunger alert
+    assert scheduler.next_due() > due + SECONDS_PER_HOUR
+
+
+def test_deaths_are_notified_once():
+    game, scheduler = _scheduled_game(3)
+    notifications = scheduler.run_until(24 * 30 * SECONDS_PER_HOUR)
+    deaths = [item["creature_id"] for item in notifications if item["kind"] == "death"]
+    assert sorted(deaths) == [1, 2, 3]
+    assert len(game.registry) == 0
+    assert scheduler.next_due() is None
@@ -0,0 +1,102 @@
+"""
+Tests of the NDJSON action server (game.server), over a local TCP socket.
+"""
+
+import asyncio
+import json
+
+from game.game_manager import Game
+from game.server import GameServer
+from utils.clock import ManualClock
+
+
+async def _exchange(server, requests):
+    """Sends requests on one connection (a request can be a function of the previous responses)."""
+    host, port = await server.start(port=0)
+    reader, writer = await asyncio.open_connection(host, port)
+    responses = []
+    try:
+        for request in requests:
+            if callable(request):
+                request = request(responses)
+            writer.write(request if isinstance(request, bytes) else json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+        await server.close()
+    return responses
+
+
+def test_session_lifecycle(tmp_path):
+    server = GameServer(Game(1, ManualClock()), save_dir=str(tmp_path))
+    responses = asyncio.run(_exchange(server, [
+        {"id": 1, "op": "create", "name": "Pixel", "type": "dragon"},
+        {"id": 2, "op": "action", "action": "feed", "params": {"food": "premium"}},
+        {"id": 3, "op": "state"},
+        {"id": 4, "op": "action", "action": "save", "params": {"filename": "pixel.json"}},
+        {"id": 5, "op": "stats"},
+    ]))
+    assert [response["id"] for response in responses] == [1, 2, 3, 4, 5]
+    assert all(response["ok"] for response in responses)
+    session = responses[0]["session"]
+    assert {response["session"] for response in responses} == {session}
+    assert responses[1]["status"] == "ok"
+    assert responses[2]["state"]["nom"] == "Pixel"
+    assert (tmp_path / "pixel.json").exists()
+    assert responses[4]["sessions"]["sessions"] == 1
+
+
+def test_sessions_do_not_share_creatures():
+    game = Game(1, ManualClock())
+    server = GameServer(game)
+    responses = asyncio.run(_exchange(server, [
+        {"op": "create", "name": "Pixel", "type": "dragon"},
+        {"op": "create", "name": "Rex", "type": "chiot", "session": "nouvelle"},
+        {"op": "state"},
+        lambda responses: {"op": "state", "session": responses[0]["session"]},
+        {"op": "create", "name": "Bob", "type": "robot"},
+    ]))
+    assert responses[0]["session"] != responses[1]["session"]
+    assert responses[2]["state"]["nom"] == "Rex"
+    assert responses[3]["state"]["nom"] == "Pixel"
+    # The connection now uses the first session, whose creature is replaced
+    assert sorted(record.creature.name for record in game.registry) == ["Bob", "Rex"]
+
+
+def test_loading_the_save_of_another_session(tmp_path):
+    game = Game(1, ManualClock())
+    server = GameServer(game, save_dir=str(tmp_path))
+    responses = asyncio.run(_exchange(server, [
+        {"op": "create", "name": "Pixel", "type": "dragon"},
+        {"op": "action", "action": "save", "params": {"filename": "a.json"}},
+        {"op": "load", "filename": "a.json", "session": "autre"},
+        lambda responses: {"op": "action", "action": "feed", "session": responses[0]["session"]},
+        lambda responses: {"op": "load", "filename": "a.json", "session": responses[0]["session"]},
+    ]))
+    assert all(response["ok"] for response in responses)
+    first, second = responses[0]["session"], responses[2]["session"]
+    assert first != second
+    # The copy of the other session gets a new id, and keeps the random stream of the save
+    assert responses[3]["status"] == "ok"
+    original, = game.registry.by_owner(first)
+    copy, = game.registry.by_owner(second)
+    assert copy != original
+    saved = json.loads((tmp_path / "a.json").read_text(encoding="utf-8"))
+    assert game.registry.get(copy).creature.to_dict()["etat_aleatoire"] == saved["etat_aleatoire"]
+    # Loading its own save again replaced the creature of the first session
+    assert original == saved["id"] and len(game.registry) == 2
+
+
+def test_errors_are_answered():
+    server = GameServer(Game(1, ManualClock()))
+    responses = asyncio.run(_exchange(server, [
+        b"{not json\n",
+        {"id": 7, "op": "dance"},
+        {"op": "action", "action": "play_mini_game"},
+        {"op": "load", "filename": "../secret.json"},
+    ]))
+    assert not any(response["ok"] for response in responses)
+    assert responses[0]["error"] == "JSON invalide."
+    assert responses[1]["id"] == 7
+    assert server.errors == 4
@@ -0,0 +1,86 @@
+"""
+Tests of the session manager (game.sessions).
+"""
+
+import os
+
+from game.game_manager import Game
+from game.sessions import SessionManager
+from utils.clock import ManualClock
+
+
+def _sessions(count, spill_dir, **budget):
+    """Creates a game with one session per creature."""
+    game = Game(7, ManualClock())
+    sessions = SessionManager(game, spill_dir, **budget)
+    for i in range(count):
+        game.create_creature(f"Pixel-{i}", "lapin", owner=f"session-{i}")
+        sessions.attach(f"session-{i}", game.active_id)
+    return sessions
+
+
+def test_rehydrated_creature_matches_resident_one(tmp_path):
+    resident = _sessions(1, str(tmp_path / "resident"))
+    spilled = _sessions(1, str(tmp_path))
+    assert spilled.evict("session-0")
+    assert spilled.game.registry.get(1) is None
+    assert os.path.exists(tmp_path / "session-0.bin")
+
+    for sessions in (resident, spilled):
+        sessions.game.clock.advance_hours(8)
+    resident.game.do_actions([{"action": "wait", "creature_id": 1}])
+    assert spilled.creature_id("session-0") == 1
+    assert spilled.game.registry.get(1).creature.to_dict() == resident.game.registry.get(1).creature.to_dict()
+    assert not os.path.exists(tmp_path / "session-0.bin")
+    assert spilled.stats()["misses"] == 1
+
+
+def test_rehydrated_creature_with_a_taken_id(tmp_path):
+    sessions = _sessions(1, str(tmp_path))
+    game = sessions.game
+    sessions.evict("session-0")
+    # Another player loads the spilled file meanwhile: its copy takes the id of the creature
+    assert game.load_creature(str(tmp_path / "session-0.bin"), owner="autre").value == 1
+
+    game.clock.advance_hours(8)
+    creature_id = sessions.creature_id("session-0")
+    assert creature_id == 2
+    game.do_actions([{"action": "wait", "creature_id": 1}])
+    # The rehydrated creature kept its random stream: it drew the same luck as the copy over the same hours
+    rehydrated = game.registry.get(creature_id).creature
+    copy = game.registry.get(1).creature
+    assert rehydrated.rng.draws() > 0
+    assert rehydrated.to_dict()["etat_aleatoire"] == copy.to_dict()["etat_aleatoire"]
+    assert rehydrated.is_sick == copy.is_sick
+
+
+def test_rehydration_keeps_the_active_creature(tmp_path):
+    sessions = _sessions(2, str(tmp_path))
+    sessions.evict("session-0")
+    sessions.game.select_creature(2)
+    sessions.creature_id("session-0")
+    assert sessions.game.active_id == 2
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    sessions = _sessions(3, str(tmp_path), max_resident=2)
+    assert sessions.stats()["resident"] == 2
+    assert sessions.game.registry.get(1) is None
+    sessions.creature_id("session-0")
+    assert sessions.game.registry.get(2) is None
+    assert sessions.stats()["evictions"] == 2
+
+
+def test_failed_save_keeps_the_session_resident(tmp_path):
+    sessions = _sessions(2, str(tmp_path / "missing"))
+    assert not sessions.evict("session-0")
+    assert sessions.game.registry.get(1) is not None
+    assert sessions.stats()["resident"] == 2
+    assert sessions.stats()["evictions"] == 0
+    assert sessions.creature_id("session-0") == 1
+
+
+def test_budget_skips_sessions_that_cannot_be_saved(tmp_path):
+    sessions = _sessions(3, str(tmp_path / "missing"), max_resident=2)
+    assert sessions.stats()["resident"] == 3
+    assert sessions.stats()["evictions"] == 0
@@ -0,0 +1,80 @@
+"""
+Tests of the snapshots and forks of the creatures and of the game (models.creature, game.game_manager).
+"""
+
+from game.game_manager import Game
+from models.creature import Creature
+from utils.clock import ManualClock
+from utils.rng import RngStream
+
+
+def _creature():
+    creature = Creature("Pixel", "chaton", creature_id=1, rng=RngStream(7, "creature", 1))
+    creature.add_item("balle")
+    creature.friends.append("Rex")
+    return creature
+
+
+def test_restore_puts_the_creature_back():
+    creature = _creature()
+    snapshot = creature.snapshot()
+    state = creature.to_dict()
+    draws = [creature.pass_time(3).message for _ in range(5)]
+    creature.add_item("os")
+    assert creature.to_dict() != state
+
+    creature.restore(snapshot)
+    assert creature.to_dict() == state
+    # The random stream is restored too: the same luck is drawn again, and the snapshot can be restored twice
+    assert [creature.pass_time(3).message for _ in range(5)] == draws
+    creature.restore(snapshot)
+    assert creature.to_dict() == state
+
+
+def test_lists_are_copied_on_write():
+    creature = _creature()
+    snapshot = creature.snapshot()
+    fork = creature.fork()
+    inventory = creature.inventory
+    assert fork.inventory is inventory
+
+    fork.add_item("os")
+    assert creature.inventory == ["balle"] and fork.inventory == ["balle", "os"]
+    creature.add_item("pomme")
+    assert creature.inventory is not inventory
+    assert inventory == ["balle"] and snapshot.state["inventory"] == ["balle"]
+    assert Creature.from_snapshot(snapshot).inventory == ["balle"]
+
+
+def test_fork_draws_the_same_luck():
+    creature = _creature()
+    fork = creature.fork()
+    for _ in range(20):
+        creature.pass_time(2)
+        fork.pass_time(2)
+    assert fork.to_dict() == creature.to_dict()
+    assert fork.rng is not creature.rng
+
+
+def test_game_restore_and_fork():
+    game = Game(3, ManualClock())
+    first = game.create_creature("Pixel", "chaton").value
+    snapshot = game.snapshot()
+    state = game.creature.to_dict()
+
+    branch = game.fork()
+    assert branch.clock() == game.clock()
+    branch.simulate(12, step_hours=1)
+    assert game.creature.to_dict() == state
+
+    game.create_creature("Rex", "chiot")
+    game.simulate(12, step_hours=1)
+    game.restore(snapshot)
+    assert [record.creature.creature_id for record in game.registry] == [first]
+    assert game.active_id == first
+    assert game.creature.to_dict() == state
+    assert game.clock() == snapshot.now
+
+    # The branch and the restored game play the same future
+    game.simulate(12, step_hours=1)
+    assert game.creature.to_dict() == branch.creature.to_dict()
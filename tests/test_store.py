@@ -0,0 +1,72 @@
+"""
+Tests of the SQLite creature store (utils.store).
+"""
+
+from models.creature import Creature
+from utils.rng import RngStream
+from utils.store import CreatureStore
+
+
+def _creature(creature_id, friends=(), items=()):
+    """Creates a creature with friends and items."""
+    creature = Creature(f"Pixel-{creature_id}", "chaton", creature_id=creature_id, rng=RngStream(1, creature_id))
+    creature.friends.extend(friends)
+    for item in items:
+        creature.add_item(item)
+    return creature
+
+
+def test_upsert_and_find_round_trip(tmp_path):
+    creatures = [_creature(1, ["Rex"], ["balle"]), _creature(2), _creature(3, items=["os", "balle"])]
+    store = CreatureStore(str(tmp_path / "creatures.db"))
+    try:
+        assert store.upsert((creature.to_dict(), "alice") for creature in creatures) == 3
+        found = list(store.find())
+        assert [data for data, _ in found] == [creature.to_dict() for creature in creatures]
+        assert {owner for _, owner in found} == {"alice"}
+    finally:
+        store.close()
+
+
+def test_found_lists_are_distinct(tmp_path):
+    store = CreatureStore(str(tmp_path / "creatures.db"))
+    try:
+        store.upsert([(_creature(1).to_dict(), None)])
+        data = store.load(1)
+        data["amis"].append("Rex")
+        assert data["inventaire"] == []
+        assert store.load(1)["amis"] == []
+    finally:
+        store.close()
+
+
+def test_upsert_updates_in_place(tmp_path):
+    creature = _creature(1, ["Rex", "Médor"], ["balle"])
+    store = CreatureStore(str(tmp_path / "creatures.db"), batch_size=1)
+    try:
+        store.upsert([(creature.to_dict(), "alice")])
+        creature.friends.pop()
+        creature.pass_time(5)
+        store.upsert([(creature.to_dict(), "bob")])
+        assert len(store) == 1
+        assert store.load(1) == creature.to_dict()
+        assert store.ids("owner", "bob") == [1]
+        assert store.count("owner", "alice") == 0
+    finally:
+        store.close()
+
+
+def test_queries_and_delete(tmp_path):
+    creatures = [_creature(creature_id) for creature_id in range(5)]
+    creatures[1].is_sick = True
+    creatures[3].is_sick = True
+    store = CreatureStore(str(tmp_path / "creatures.db"))
+    try:
+        store.upsert((creature.to_dict(), f"joueur-{creature.creature_id % 2}") for creature in creatures)
+        assert store.ids("sick") == [1, 3]
+        assert store.ids("owner", "joueur-0") == [0, 2, 4]
+        store.delete([2])
+        assert store.load(2) is None
+        assert store.count() == 4
+    finally:
+        store.close()
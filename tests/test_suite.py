@@ -0,0 +1,30 @@
+"""
+Tests of the benchmark suite (benchmarks.suite).
+"""
+
+import os
+import tempfile
+
+from benchmarks import suite
+
+
+def _results(**timings):
+    return {"results": {name: {"best_ns": best_ns} for name, best_ns in timings.items()}}
+
+
+def test_every_benchmark_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(suite, "MIN_ROUND_TIME", 0)
+    monkeypatch.setattr(suite, "BENCHMARKS", {name: factory for name, factory in suite.BENCHMARKS.items()
+                                              if "forecast" not in name and "simulate" not in name})
+    results = suite.run_suite(rounds=1)
+    assert set(results["results"]) == set(suite.BENCHMARKS)
+    assert all(result["best_ns"] > 0 for result in results["results"].values())
+    assert results["meta"]["seed"] == 0
+    # The files, stores and journals of the benchmarks are deleted after each of them
+    assert os.listdir(tmp_path) == []
+
+
+def test_compare_flags_regressions_above_the_threshold():
+    rows = suite.compare(_results(a=100, b=100, gone=5), _results(a=105, b=150, new=7), threshold=0.1)
+    assert rows == [("a", 100, 105, 1.05, False), ("b", 100, 150, 1.5, True)]
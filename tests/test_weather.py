@@ -0,0 +1,31 @@
+"""
+Tests of the weather calendar (game.weather) and of its use by Game.
+"""
+
+from game.game_manager import Game
+from game.weather import SECONDS_PER_DAY, WeatherCalendar
+from utils.clock import ManualClock
+
+
+def test_weather_of_a_day_does_not_depend_on_the_order_of_requests():
+    forward = WeatherCalendar(5)
+    backward = WeatherCalendar(5, cache_size=2)
+    days = range(20)
+    expected = [dict(forward.weather_for_day(day)) for day in days]
+    assert [dict(backward.weather_for_day(day)) for day in reversed(days)] == expected[::-1]
+    assert len(backward) == 2
+
+
+def test_creatures_change_weather_at_the_same_game_day():
+    game = Game(5, ManualClock())
+    game.create_creature("Pixel", "chaton")
+    game.clock.advance_hours(10)
+    game.create_creature("Rex", "chiot")
+    game.clock.now = SECONDS_PER_DAY + 60
+    game.do_actions([{"action": "wait", "creature_id": 1}, {"action": "wait", "creature_id": 2}])
+
+    weather = game.calendar.weather_for_day(1)
+    for creature_id in (1, 2):
+        record = game.registry.get(creature_id)
+        assert record.last_weather_update == 1
+        assert record.current_weather == weather
@@ -0,0 +1,32 @@
+"""
+Tests of the sharded world simulator (game.world).
+"""
+
+import pytest
+
+from game.world import WorldSimulator
+
+
+def _run(workers):
+    """Runs a small world for two days and returns its results and creatures."""
+    with WorldSimulator(seed=4, workers=workers) as world:
+        world.add_creatures(60, "chaton")
+        world.add_creatures(40, "dragon", character_trait="sportif")
+        results = world.run(24, hours=2)
+        return results, [creature.to_dict() for creature in world.creatures()]
+
+
+def test_local_world_is_reproducible():
+    assert _run(0) == _run(0)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_results_do_not_depend_on_the_number_of_workers(workers):
+    assert _run(workers) == _run(0)
+
+
+def test_ids_are_assigned_in_order():
+    with WorldSimulator(seed=1, workers=0) as world:
+        assert world.add_creatures(3, "lapin") == range(1, 4)
+        assert world.add_creatures(2, "robot") == range(4, 6)
+        assert [creature.creature_id for creature in world.creatures()] == [1, 2, 3, 4, 5]
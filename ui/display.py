@@ -2,6 +2,41 @@
 Module managing the display of creature information.
 """
 
+from utils.event_bus import DIED, EVOLVED
+
+
+def _on_evolved(creature, stage, message):
+    display_evolution(message)
+
+
+def _on_died(creature, owner):
+    display_death(creature.name, creature.age)
+
+
+def subscribe_terminal(bus):
+    """
+    Shows the evolution and death screens when the game publishes these events.
+    
+    Without this subscription (headless runs, server), nothing is printed.
+    
+    Args:
+        bus (EventBus): Event bus of the game
+    """
+    bus.subscribe(EVOLVED, _on_evolved)
+    bus.subscribe(DIED, _on_died)
+
+
+def unsubscribe_terminal(bus):
+    """
+    Stops showing the evolution and death screens.
+    
+    Args:
+        bus (EventBus): Event bus of the game
+    """
+    bus.unsubscribe(EVOLVED, _on_evolved)
+    bus.unsubscribe(DIED, _on_died)
+
+
 def display_weather(weather):
     """
     Displays the current weather.
@@ -0,0 +1,112 @@
+"""
+Module providing the clocks driving the passage of game time.
+
+A clock is a callable returning the current game time in seconds. The
+game only ever reads its clock, so the same game can run in real time,
+faster than real time, or on a simulated time advanced explicitly by the
+caller (tests, benchmarks, headless runs), deterministically.
+"""
+
+import time
+
+SECONDS_PER_HOUR = 3600
+HOURS_PER_DAY = 24
+
+
+def hours_to_days(hours):
+    """
+    Converts a duration in game hours to days, the unit of the creatures' age.
+
+    Args:
+        hours (float): Duration in hours
+
+    Returns:
+        float: Duration in days
+    """
+    return hours / HOURS_PER_DAY
+
+
+class RealClock:
+    """Clock following the wall clock: one real second is one game second."""
+
+    def __call__(self):
+        return time.time()
+
+
+class ScaledClock:
+    """Clock running faster (or slower) than real time."""
+
+    def __init__(self, scale=SECONDS_PER_HOUR, start=None):
+        """
+        Starts the clock.
+
+        Args:
+            scale (float): Game seconds per real second (3600: one real second is one game hour)
+            start (float): Game time at creation (current wall time by default)
+        """
+        self.scale = scale
+        self.start = time.time() if start is None else start
+        self._origin = time.monotonic()
+
+    def __call__(self):
+        return self.start + (time.monotonic() - self._origin) * self.scale
+
+
+class ManualClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, start=0.0):
+        """
+        Initializes the clock.
+
+        Args:
+            start (float): Initial game time in seconds
+        """
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """
+        Moves the clock forward.
+
+        Args:
+            seconds (float): Number of game seconds to add
+        """
+        self.now += seconds
+
+    def advance_hours(self, hours):
+        """
+        Moves the clock forward by whole game hours.
+
+        Args:
+            hours (float): Number of game hours to add
+        """
+        self.now += hours * SECONDS_PER_HOUR
+
+
+class FixedStepClock(ManualClock):
+    """Manual clock advancing by a constant step, for fixed-step simulations."""
+
+    def __init__(self, step_hours=1.0, start=0.0):
+        """
+        Initializes the clock.
+
+        Args:
+            step_hours (float): Game hours per step
+            start (float): Initial game time in seconds
+        """
+        super().__init__(start)
+        self.step_hours = step_hours
+        self.steps = 0
+
+    def tick(self, steps=1):
+        """
+        Moves the clock forward by a number of steps.
+
+        Args:
+            steps (int): Number of steps
+        """
+        self.steps += steps
+        self.advance_hours(self.step_hours * steps)
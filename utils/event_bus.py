@@ -0,0 +1,130 @@
+"""
+Module providing the event bus between the simulation and its front ends.
+
+The model and the game publish what happens to the creatures; the
+terminal UI, a server or a test subscribe to what they need. Events and
+the keyword arguments given to their subscribers:
+
+    evolved          creature, stage, message
+    died             creature, owner
+    fell_sick        creature
+    critical         creature, message
+    weather_changed  creature, weather, day
+    item_gained      creature, item
+
+Synchronous subscribers are called by the publisher, in the order of
+subscription. Coroutine functions, and callbacks subscribed with a loop,
+are run on their asyncio event loop (thread-safely, the simulation may
+run on another thread). Publishing an event nobody listens to is a
+dictionary lookup.
+"""
+
+import asyncio
+
+EVOLVED = "evolved"
+DIED = "died"
+FELL_SICK = "fell_sick"
+CRITICAL = "critical"
+WEATHER_CHANGED = "weather_changed"
+ITEM_GAINED = "item_gained"
+
+EVENTS = (EVOLVED, DIED, FELL_SICK, CRITICAL, WEATHER_CHANGED, ITEM_GAINED)
+
+
+class EventBus:
+    """Publish/subscribe dispatcher of the game events."""
+
+    def __init__(self):
+        self._subscribers = {}  # event -> list of (callback, dispatcher)
+        self._dispatchers = {}  # event -> tuple of dispatchers, rebuilt on every change
+
+    def subscribe(self, event, callback, loop=None):
+        """
+        Calls a function every time an event is published.
+
+        Args:
+            event (str): Name of the event (one of EVENTS)
+            callback (callable): Function or coroutine function called with the
+                                 arguments of the event as keywords
+            loop (asyncio.AbstractEventLoop): Loop running the callback (the running
+                                              loop by default for a coroutine function)
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event}")
+
+        if asyncio.iscoroutinefunction(callback):
+            loop = loop if loop is not None else asyncio.get_running_loop()
+
+            def dispatcher(payload):
+                asyncio.run_coroutine_threadsafe(callback(**payload), loop)
+        elif loop is not None:
+            def dispatcher(payload):
+                loop.call_soon_threadsafe(lambda: callback(**payload))
+        else:
+            def dispatcher(payload):
+                callback(**payload)
+
+        self._subscribers.setdefault(event, []).append((callback, dispatcher))
+        self._rebuild(event)
+
+    def unsubscribe(self, event, callback):
+        """
+        Stops calling a function subscribed to an event.
+
+        Args:
+            event (str): Name of the event
+            callback (callable): The subscribed function
+        """
+        subscribers = self._subscribers.get(event, [])
+        self._subscribers[event] = [entry for entry in subscribers if entry[0] is not callback]
+        self._rebuild(event)
+
+    def clear(self):
+        """
+        Removes every subscriber.
+        """
+        self._subscribers.clear()
+        self._dispatchers.clear()
+
+    def has_subscribers(self, event):
+        """
+        Tells whether an event is listened to, to skip preparing it otherwise.
+
+        Args:
+            event (str): Name of the event
+
+        Returns:
+            bool: True if at least one function is subscribed
+        """
+        return event in self._dispatchers
+
+    def publish(self, event, **payload):
+        """
+        Sends an event to its subscribers.
+
+        Args:
+            event (str): Name of the event
+            **payload: Arguments of the event
+        """
+        dispatchers = self._dispatchers.get(event)
+        if dispatchers:
+            for dispatcher in dispatchers:
+                dispatcher(payload)
+
+    def _rebuild(self, event):
+        """
+        Rebuilds the dispatchers of an event (publishing iterates over an immutable tuple).
+
+        Args:
+            event (str): Name of the event
+        """
+        subscribers = self._subscribers.get(event)
+        if subscribers:
+            self._dispatchers[event] = tuple(dispatcher for _, dispatcher in subscribers)
+        else:
+            self._subscribers.pop(event, None)
+            self._dispatchers.pop(event, None)
+
+
+# Bus of the game, shared by the model, the game and the front ends
+bus = EventBus()
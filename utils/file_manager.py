@@ -1,48 +1,161 @@
 """
 Module for managing data files (save and load).
+
+The files are JSON by default; save_data and load_data take an encoder
+and a decoder for other formats (see models.save_format).
+
+Saves are atomic: the data is written to a temporary file next to the
+target, flushed to the disk, then renamed over the target. A crash
+during a save leaves the previous file intact (and at worst a stray
+temporary file), never a truncated one.
 """
 
 import json
 import os
+import tempfile
+
+
+def _encode_json(data):
+    """
+    Encodes data as indented JSON.
+
+    Args:
+        data (dict): Data to encode
+
+    Returns:
+        bytes: The JSON document, in UTF-8
+    """
+    return json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
+
+def _write_temporary(payload, filename):
+    """
+    Writes bytes to a temporary file in the directory of the target and flushes it to the disk.
+
+    Args:
+        payload (bytes): Content of the file
+        filename (str): Name of the save file the temporary file will replace
+
+    Returns:
+        str: Path of the temporary file
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    # The leading dot keeps the temporary files out of the patterns matching the saves
+    descriptor, path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _replace(payload, filename):
+    """
+    Writes bytes to a file atomically: to a temporary file, then renamed over the target.
+
+    Args:
+        payload (bytes): Content of the file
+        filename (str): Name of the save file
+    """
+    path = _write_temporary(payload, filename)
+    try:
+        os.replace(path, filename)
+    except BaseException:
+        os.remove(path)
+        raise
 
-def save_data(data, filename):
+
+def _sync_directory(directory):
     """
-    Saves data to a JSON file.
-    
+    Flushes the entries of a directory (the renames done in it) to the disk.
+
+    Args:
+        directory (str): Path of the directory
+    """
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows, where the rename is durable once done
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def save_data(data, filename, encode=None):
+    """
+    Saves data to a file, atomically.
+
     Args:
         data (dict): Data to save
         filename (str): Name of the save file
-        
+        encode (callable): Converts the data to bytes (indented JSON by default)
+
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        _replace((encode or _encode_json)(data), filename)
+        _sync_directory(os.path.dirname(os.path.abspath(filename)))
         return True
     except Exception as e:
         print(f"Erreur lors de la sauvegarde: {e}")
         return False
 
 
-def load_data(filename):
+def save_many(files, encode=None):
     """
-    Loads data from a JSON file.
-    
+    Saves several files, each one atomically, with a single flush per directory.
+
+    Args:
+        files (iterable): Pairs (data, filename)
+        encode (callable): Converts the data to bytes (indented JSON by default)
+
+    Returns:
+        list: Names of the files saved
+    """
+    encode = encode or _encode_json
+    saved = []
+    directories = set()
+    for data, filename in files:
+        try:
+            _replace(encode(data), filename)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde de {filename}: {e}")
+            continue
+        saved.append(filename)
+        directories.add(os.path.dirname(os.path.abspath(filename)))
+    for directory in directories:
+        _sync_directory(directory)
+    return saved
+
+
+def load_data(filename, decode=None):
+    """
+    Loads data from a file.
+
     Args:
         filename (str): Name of the file to load
-        
+        decode (callable): Converts the bytes of the file to data (JSON by default)
+
     Returns:
         dict or None: Loaded data or None if error
     """
     if not os.path.exists(filename):
         print(f"Le fichier {filename} n'existe pas.")
         return None
-    
+
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        return data
+        with open(filename, 'rb') as file:
+            payload = file.read()
+        return (decode or json.loads)(payload)
     except Exception as e:
         print(f"Erreur lors du chargement: {e}")
-        return None
\ No newline at end of file
+        return None
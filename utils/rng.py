@@ -0,0 +1,272 @@
+"""
+Module providing reproducible, splittable random number streams.
+
+A stream is identified by a 64-bit key derived from a root seed and a path
+(for example the creature id and a subsystem name). Draw number n of a
+stream is a pure function of its key and n (SplitMix64 in counter mode),
+so the values drawn for a creature do not depend on which process
+simulates it, nor on what other creatures draw. A stream only stores two
+integers, which makes it cheap to keep one per creature, to copy and to
+save.
+
+RngStream exposes the subset of the random module API used by the game
+(random, uniform, randint, randrange, choice, shuffle, expovariate), so
+both can be passed wherever an "rng" argument is expected.
+"""
+
+import hashlib
+import math
+import os
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+TO_UNIT = 1.0 / (1 << 53)
+
+
+def mix64(value):
+    """
+    SplitMix64 finalizer: scrambles a 64-bit integer.
+
+    Args:
+        value (int): Integer between 0 and 2**64 - 1
+
+    Returns:
+        int: Scrambled 64-bit integer
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def derive_key(root_seed, *path):
+    """
+    Derives a stream key from a root seed and a path, identically in every process.
+
+    Args:
+        root_seed: Root seed (int or str), None for a non reproducible key
+        *path: Components identifying the stream (creature id, subsystem...)
+
+    Returns:
+        int: 64-bit key
+    """
+    if root_seed is None:
+        root_seed = int.from_bytes(os.urandom(8), "little")
+    text = repr((root_seed,) + tuple(path)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), "little")
+
+
+class RngStream:
+    """Counter-based random stream with the interface of the random module."""
+
+    __slots__ = ("key", "counter", "_children")
+
+    def __init__(self, root_seed=None, *path, key=None):
+        """
+        Creates a stream.
+
+        Args:
+            root_seed: Root seed of the simulation (None for a non reproducible stream)
+            *path: Components identifying the stream, e.g. a creature id
+            key (int): Explicit key, overrides root_seed and path
+        """
+        self.key = derive_key(root_seed, *path) if key is None else key
+        self.counter = 0
+        self._children = None
+
+    def __repr__(self):
+        return f"RngStream(key={self.key:#018x}, counter={self.counter})"
+
+    def __reduce__(self):
+        # Keeps the position of the stream when pickled (multiprocessing, snapshots)
+        return (_restore_stream, (self.getstate(),))
+
+    def split(self, name):
+        """
+        Creates an independent stream derived from this one.
+
+        Args:
+            name: Name of the new stream (subsystem, worker, branch...)
+
+        Returns:
+            RngStream: New stream, starting at its first draw
+        """
+        return RngStream(key=derive_key(self.key, name))
+
+    def child(self, name):
+        """
+        Returns the named sub-stream of this stream, created on first use.
+
+        Unlike split, the same object is returned on every call, so its
+        position is kept between calls.
+
+        Args:
+            name (str): Name of the subsystem
+
+        Returns:
+            RngStream: The sub-stream
+        """
+        if self._children is None:
+            self._children = {}
+        stream = self._children.get(name)
+        if stream is None:
+            stream = self._children[name] = self.split(name)
+        return stream
+
+    def copy(self):
+        """
+        Returns an independent stream at the same position, sub-streams included.
+
+        Both streams then draw the same values, which lets two branches of a
+        simulation be compared under the same luck.
+
+        Returns:
+            RngStream: The copy
+        """
+        stream = RngStream.__new__(RngStream)
+        stream.key = self.key
+        stream.counter = self.counter
+        stream._children = {name: child.copy() for name, child in self._children.items()} if self._children else None
+        return stream
+
+    def draws(self):
+        """
+        Returns the number of values drawn from the stream and its sub-streams.
+
+        Returns:
+            int: Sum of the positions of the stream and of its sub-streams
+        """
+        draws = self.counter
+        if self._children:
+            for stream in self._children.values():
+                draws += stream.draws()
+        return draws
+
+    def getstate(self):
+        """
+        Returns the position of the stream and of its sub-streams.
+
+        Returns:
+            dict: JSON serializable state
+        """
+        state = {"key": self.key, "counter": self.counter}
+        if self._children:
+            state["children"] = {name: stream.getstate() for name, stream in self._children.items()}
+        return state
+
+    def setstate(self, state):
+        """
+        Restores a state returned by getstate.
+
+        Args:
+            state (dict): State to restore
+        """
+        self.key = state["key"]
+        self.counter = state["counter"]
+        self._children = None
+        for name, child_state in state.get("children", {}).items():
+            self.child(name).setstate(child_state)
+
+    def random(self):
+        """
+        Returns the next float in [0, 1).
+
+        Returns:
+            float: Uniform random number
+        """
+        # mix64 inlined: this is the hottest function of the simulation
+        self.counter = counter = self.counter + 1
+        value = (self.key + counter * GOLDEN_GAMMA) & MASK64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+        return ((value ^ (value >> 31)) >> 11) * TO_UNIT
+
+    def uniform(self, a, b):
+        """
+        Returns a float between a and b.
+
+        Args:
+            a (float): Lower bound
+            b (float): Upper bound
+
+        Returns:
+            float: Uniform random number
+        """
+        return a + (b - a) * self.random()
+
+    def randrange(self, start, stop=None):
+        """
+        Returns an integer in range(start, stop).
+
+        Args:
+            start (int): Lower bound (or upper bound if stop is None)
+            stop (int): Upper bound (excluded)
+
+        Returns:
+            int: Random integer
+        """
+        if stop is None:
+            start, stop = 0, start
+        return start + min(int(self.random() * (stop - start)), stop - start - 1)
+
+    def randint(self, a, b):
+        """
+        Returns an integer between a and b (both included).
+
+        Args:
+            a (int): Lower bound
+            b (int): Upper bound
+
+        Returns:
+            int: Random integer
+        """
+        return self.randrange(a, b + 1)
+
+    def choice(self, sequence):
+        """
+        Returns a random element of a non-empty sequence.
+
+        Args:
+            sequence: Sequence to choose from
+
+        Returns:
+            The chosen element
+        """
+        return sequence[self.randrange(len(sequence))]
+
+    def shuffle(self, sequence):
+        """
+        Shuffles a list in place.
+
+        Args:
+            sequence (list): List to shuffle
+        """
+        for i in range(len(sequence) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            sequence[i], sequence[j] = sequence[j], sequence[i]
+
+    def expovariate(self, lambd):
+        """
+        Returns an exponentially distributed float.
+
+        Args:
+            lambd (float): Rate of the distribution
+
+        Returns:
+            float: Random number
+        """
+        return -math.log(1.0 - self.random()) / lambd
+
+
+def _restore_stream(state):
+    """
+    Rebuilds a pickled stream.
+
+    Args:
+        state (dict): State returned by RngStream.getstate
+
+    Returns:
+        RngStream: The rebuilt stream
+    """
+    stream = RngStream(key=state["key"])
+    stream.setstate(state)
+    return stream
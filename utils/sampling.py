@@ -0,0 +1,69 @@
+"""
+Module providing weighted random sampling in constant time (alias method).
+"""
+
+import random
+
+
+class AliasTable:
+    """Table drawing an index with probability proportional to its weight in O(1)."""
+
+    __slots__ = ("probabilities", "aliases", "size")
+
+    def __init__(self, weights):
+        """
+        Builds the alias table with Vose's method.
+
+        Args:
+            weights (list): Non-negative weights, at least one of them positive
+        """
+        self.size = len(weights)
+        total = float(sum(weights))
+        if self.size == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+
+        scaled = [weight * self.size / total for weight in weights]
+        self.probabilities = [1.0] * self.size
+        self.aliases = list(range(self.size))
+
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probabilities[low] = scaled[low]
+            self.aliases[low] = high
+            scaled[high] = scaled[high] + scaled[low] - 1
+            if scaled[high] < 1:
+                small.append(high)
+            else:
+                large.append(high)
+
+    def sample(self, rng=random):
+        """
+        Draws one index.
+
+        Args:
+            rng: Source of randomness providing random() (the random module by default)
+
+        Returns:
+            int: The drawn index
+        """
+        position = rng.random() * self.size
+        index = min(int(position), self.size - 1)
+        if position - index < self.probabilities[index]:
+            return index
+        return self.aliases[index]
+
+    def sample_many(self, count, rng=random):
+        """
+        Draws several independent indices.
+
+        Args:
+            count (int): Number of indices to draw
+            rng: Source of randomness providing random()
+
+        Returns:
+            list: The drawn indices
+        """
+        return [self.sample(rng) for _ in range(count)]
@@ -0,0 +1,350 @@
+"""
+SQLite store of many creatures, an alternative to one save file per creature.
+
+The store keeps the creatures in the save format (the dicts of
+Creature.to_dict) in a single SQLite database in WAL mode: one row per
+creature in the creatures table, and their friends and inventory in
+their own tables, one row per name or item in list order. Owner, type,
+evolution stage and sickness are indexed, so the prepared queries of
+QUERIES ("all sick creatures", "creatures of an owner"...) read only the
+rows they return.
+
+Saves are upserts: a creature already in the store is updated in place,
+and a batch of creatures is written in a single transaction. The stat
+columns have no declared type, so SQLite keeps their values as written
+and ints and floats come back as they were saved.
+
+Usage:
+    store = CreatureStore("creatures.db")
+    store.upsert((creature.to_dict(), owner) for creature, owner in creatures)
+    sick = list(store.find("sick"))
+    store.close()
+"""
+
+import json
+import sqlite3
+from types import MappingProxyType
+
+# Version of the schema, stored in the database (PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# File names ending with this extension are stores (see Creature.save_many and Creature.load_many)
+STORE_EXTENSION = ".db"
+
+# Creatures written per transaction by upsert
+DEFAULT_BATCH_SIZE = 10_000
+
+# Columns of the creatures table and the keys of the save format they hold (id and owner aside)
+_COLUMNS = (("name", "nom"), ("type", "type_creature"), ("color", "couleur"), ("trait", "trait_caractere"),
+            ("hunger", "faim"), ("energy", "energie"), ("happiness", "bonheur"), ("health", "sante"),
+            ("age", "age"), ("is_sick", "est_malade"), ("stage", "stade_evolution"),
+            ("social_level", "niveau_social"), ("game_points", "points_jeu"), ("random_state", "etat_aleatoire"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS creatures (
+    id INTEGER PRIMARY KEY,
+    owner,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    color TEXT NOT NULL,
+    trait TEXT NOT NULL,
+    hunger,
+    energy,
+    happiness,
+    health,
+    age,
+    is_sick INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    social_level,
+    game_points,
+    random_state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS creatures_owner ON creatures (owner);
+CREATE INDEX IF NOT EXISTS creatures_type ON creatures (type);
+CREATE INDEX IF NOT EXISTS creatures_stage ON creatures (stage);
+CREATE INDEX IF NOT EXISTS creatures_sick ON creatures (is_sick) WHERE is_sick = 1;
+CREATE TABLE IF NOT EXISTS friends (
+    creature_id INTEGER NOT NULL REFERENCES creatures (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (creature_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inventory (
+    creature_id INTEGER NOT NULL REFERENCES creatures (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (creature_id, position)
+) WITHOUT ROWID;
+"""
+
+# Prepared queries: name -> condition on the creatures (c) and its parameters
+QUERIES = MappingProxyType({
+    "all": "1",
+    "id": "c.id = ?",
+    "owner": "c.owner = ?",
+    "type": "c.type = ?",
+    "stage": "c.stage = ?",
+    "sick": "c.is_sick = 1"
+})
+
+_UPSERT = (f"INSERT INTO creatures (id, owner, {', '.join(column for column, _ in _COLUMNS)}) "
+           f"VALUES ({', '.join('?' * (len(_COLUMNS) + 2))}) ON CONFLICT (id) DO UPDATE SET owner = excluded.owner, "
+           + ", ".join(f"{column} = excluded.{column}" for column, _ in _COLUMNS))
+
+_encode_state = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class CreatureStore:
+    """SQLite database of creatures in the save format."""
+
+    def __init__(self, filename, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Opens the store, creating the database and its schema if needed.
+
+        Args:
+            filename (str): Path of the database
+            batch_size (int): Creatures written per transaction by upsert
+
+        Raises:
+            ValueError: If the database was created by a newer version of the store
+        """
+        self.filename = filename
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        version, = self.connection.execute("PRAGMA user_version").fetchone()
+        if version > SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError(f"Store schema version {version} is newer than {SCHEMA_VERSION}")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # Statements of the prepared queries, compiled once and kept in the statement cache of sqlite3
+        columns = ", ".join(f"c.{column}" for column, _ in _COLUMNS)
+        self._queries = {
+            name: (f"SELECT c.id, c.owner, {columns} FROM creatures c WHERE {condition} ORDER BY c.id",
+                   f"SELECT f.creature_id, f.name FROM friends f JOIN creatures c ON c.id = f.creature_id "
+                   f"WHERE {condition} ORDER BY f.creature_id, f.position",
+                   f"SELECT i.creature_id, i.item FROM inventory i JOIN creatures c ON c.id = i.creature_id "
+                   f"WHERE {condition} ORDER BY i.creature_id, i.position",
+                   f"SELECT c.id FROM creatures c WHERE {condition} ORDER BY c.id",
+                   f"SELECT count(*) FROM creatures c WHERE {condition}")
+            for name, condition in QUERIES.items()
+        }
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM creatures").fetchone()[0]
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+    def upsert(self, creatures):
+        """
+        Saves creatures, inserting the new ones and updating the others, one transaction per batch.
+
+        Args:
+            creatures (iterable): Pairs (state in the save format, owner)
+
+        Returns:
+            int: Number of creatures saved
+
+        Raises:
+            ValueError: If a creature has no int id
+        """
+        count = 0
+        batch = []
+        for entry in creatures:
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                count += self._write(batch)
+                batch = []
+        if batch:
+            count += self._write(batch)
+        return count
+
+    def _write(self, batch):
+        """
+        Writes a batch of creatures in a single transaction.
+
+        Args:
+            batch (list): Pairs (state in the save format, owner)
+
+        Returns:
+            int: Number of creatures written
+        """
+        rows = []
+        ids = []
+        friends = []
+        inventory = []
+        for data, owner in batch:
+            creature_id = data["id"]
+            if type(creature_id) is not int:
+                raise ValueError(f"Only creatures with an int id can be stored: {creature_id!r}")
+            ids.append(creature_id)
+            rows.append((creature_id, owner, data["nom"], data["type_creature"], data["couleur"],
+                         data["trait_caractere"], data["faim"], data["energie"], data["bonheur"], data["sante"],
+                         data["age"], data["est_malade"], data["stade_evolution"], data["niveau_social"],
+                         data["points_jeu"], _encode_state(data["etat_aleatoire"])))
+            friends.extend((creature_id, position, name) for position, name in enumerate(data["amis"]))
+            inventory.extend((creature_id, position, item) for position, item in enumerate(data["inventaire"]))
+
+        # The previous lists are deleted by runs of consecutive ids: a single statement for a dense batch
+        runs = _runs(ids)
+        with self.connection:
+            self.connection.executemany(_UPSERT, rows)
+            self.connection.executemany("DELETE FROM friends WHERE creature_id BETWEEN ? AND ?", runs)
+            self.connection.executemany("DELETE FROM inventory WHERE creature_id BETWEEN ? AND ?", runs)
+            self.connection.executemany("INSERT INTO friends VALUES (?, ?, ?)", friends)
+            self.connection.executemany("INSERT INTO inventory VALUES (?, ?, ?)", inventory)
+        return len(rows)
+
+    def delete(self, creature_ids):
+        """
+        Removes creatures from the store (with their friends and inventory).
+
+        Args:
+            creature_ids (iterable): Ids of the creatures
+        """
+        with self.connection:
+            self.connection.executemany("DELETE FROM creatures WHERE id = ?", ((creature_id,)
+                                                                               for creature_id in creature_ids))
+
+    def find(self, query="all", *params):
+        """
+        Reads the creatures returned by a prepared query, in id order.
+
+        Args:
+            query (str): Name of the query in QUERIES
+            *params: Parameters of the query (the owner, type, stage or id)
+
+        Yields:
+            tuple: The state of a creature in the save format and its owner
+        """
+        creatures, friends, inventory, _, _ = self._queries[query]
+        friend_lists = _lists(self.connection.execute(friends, params))
+        item_lists = _lists(self.connection.execute(inventory, params))
+        next_friends = next(friend_lists, None)
+        next_items = next(item_lists, None)
+        for (creature_id, owner, name, creature_type, color, trait, hunger, energy, happiness, health, age, is_sick,
+             stage, social_level, game_points, random_state) in self.connection.execute(creatures, params):
+            # Both lists are sorted by creature id, like the creatures
+            friends = []
+            items = []
+            if next_friends is not None and next_friends[0] == creature_id:
+                friends = next_friends[1]
+                next_friends = next(friend_lists, None)
+            if next_items is not None and next_items[0] == creature_id:
+                items = next_items[1]
+                next_items = next(item_lists, None)
+            data = {
+                "nom": name,
+                "type_creature": creature_type,
+                "couleur": color,
+                "trait_caractere": trait,
+                "faim": hunger,
+                "energie": energy,
+                "bonheur": happiness,
+                "sante": health,
+                "age": age,
+                "est_malade": bool(is_sick),
+                "stade_evolution": stage,
+                "niveau_social": social_level,
+                "amis": friends,
+                "points_jeu": game_points,
+                "inventaire": items,
+                "id": creature_id,
+                "etat_aleatoire": json.loads(random_state)
+            }
+            yield data, owner
+
+    def load(self, creature_id):
+        """
+        Reads one creature.
+
+        Args:
+            creature_id (int): Id of the creature
+
+        Returns:
+            dict or None: Its state in the save format, None if it is not in the store
+        """
+        for data, _ in self.find("id", creature_id):
+            return data
+        return None
+
+    def ids(self, query="all", *params):
+        """
+        Returns the ids of the creatures returned by a prepared query.
+
+        Args:
+            query (str): Name of the query in QUERIES
+            *params: Parameters of the query
+
+        Returns:
+            list: The ids, in order
+        """
+        return [row[0] for row in self.connection.execute(self._queries[query][3], params)]
+
+    def count(self, query="all", *params):
+        """
+        Counts the creatures returned by a prepared query.
+
+        Args:
+            query (str): Name of the query in QUERIES
+            *params: Parameters of the query
+
+        Returns:
+            int: Number of creatures
+        """
+        return self.connection.execute(self._queries[query][4], params).fetchone()[0]
+
+
+def _lists(rows):
+    """
+    Groups rows (creature id, value) sorted by creature id into lists.
+
+    Args:
+        rows (iterable): The rows
+
+    Yields:
+        tuple: A creature id and its values, in order
+    """
+    creature_id = None
+    values = None
+    for row_id, value in rows:
+        if row_id != creature_id:
+            if values is not None:
+                yield creature_id, values
+            creature_id = row_id
+            values = []
+        values.append(value)
+    if values is not None:
+        yield creature_id, values
+
+
+def _runs(ids):
+    """
+    Groups ids into runs of consecutive ids.
+
+    Args:
+        ids (list): The ids
+
+    Returns:
+        list: Pairs (first id, last id) of the runs
+    """
+    runs = []
+    first = last = None
+    for creature_id in sorted(ids):
+        if last is not None and creature_id <= last + 1:
+            last = creature_id
+            continue
+        if first is not None:
+            runs.append((first, last))
+        first = last = creature_id
+    if first is not None:
+        runs.append((first, last))
+    return runs